@@ -16,6 +16,8 @@ class AgentResult:
 
 class BaseAgent(ABC):
     name: str = "BaseAgent"
+    # Seconds this agent may run; None → settings.AGENT_TIME_BUDGET_SECONDS
+    time_budget_seconds: Optional[float] = None
 
     @abstractmethod
     async def run(self, context: dict) -> AgentResult:
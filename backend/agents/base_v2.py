@@ -1,45 +1,221 @@
+import asyncio
 import json
 import logging
-from typing import Dict, Any, List, Callable, Optional
-from pydantic import BaseModel, Field
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, List, Callable, Optional, Awaitable, Tuple, Type, Union
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, create_model
 from backend.services.interfaces import LLMProvider
-from backend.db.models import AgentRunStep
+from backend.core.step_recorder import StepRecorder
+from backend.agents.history import ConversationHistory
+from backend.core import deadline
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_TOOL_TIMEOUT_SECONDS = 30.0
+
+# JSON-schema "type" -> Python type, for tools registered with a plain schema dict
+JSON_SCHEMA_TYPES: Dict[str, Any] = {
+    "string": str,
+    "integer": int,
+    "number": float,
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+}
+
+
+class ToolCall(BaseModel):
+    tool_name: str
+    tool_input: Dict[str, Any] = Field(default_factory=dict)
+
+
 class AgentAction(BaseModel):
     action_type: str = Field(description="Must be 'tool_call' or 'final_answer'")
     thought: str = Field(description="Internal reasoning for this step")
     tool_name: Optional[str] = None
     tool_input: Optional[Dict[str, Any]] = None
+    # Independent calls the agent wants in the same step; run concurrently
+    tool_calls: Optional[List[ToolCall]] = None
     final_output: Optional[Dict[str, Any]] = None
 
+    def calls(self) -> List[ToolCall]:
+        """tool_calls, or the single tool_name / tool_input call."""
+        if self.tool_calls:
+            return self.tool_calls
+        if self.tool_name:
+            return [ToolCall(tool_name=self.tool_name, tool_input=self.tool_input or {})]
+        return []
+
+
+@dataclass
+class ToolSpec:
+    func: Callable
+    timeout: float = DEFAULT_TOOL_TIMEOUT_SECONDS
+    # Pure tools (reads with no side effects) are memoized per run by (name, kwargs)
+    pure: bool = False
+    ttl: Optional[float] = None  # seconds a memoized result stays valid; None = whole run
+    # Compiled argument validator; None accepts anything
+    args_model: Optional[Type[BaseModel]] = None
+    # Only pass arguments the LLM actually sent (schema-dict optionals default to None)
+    exclude_unset: bool = False
+
+    def validate(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        if self.args_model is None:
+            return kwargs
+        return self.args_model.model_validate(kwargs).model_dump(exclude_unset=self.exclude_unset)
+
+
+def compile_schema(name: str, schema: Union[Type[BaseModel], Dict[str, Any]]) -> Type[BaseModel]:
+    """Turns a Pydantic model or a JSON-schema object dict into an argument model, once per tool."""
+    if isinstance(schema, type) and issubclass(schema, BaseModel):
+        return schema
+    required = set(schema.get("required", []))
+    fields: Dict[str, Any] = {}
+    for field_name, prop in schema.get("properties", {}).items():
+        field_type = JSON_SCHEMA_TYPES.get(prop.get("type"), Any)
+        description = prop.get("description")
+        if field_name in required:
+            fields[field_name] = (field_type, Field(..., description=description))
+        else:
+            fields[field_name] = (Optional[field_type], Field(None, description=description))
+    return create_model(f"{name}_args", __config__=ConfigDict(extra="forbid"), **fields)
+
+
+def _format_validation_error(name: str, error: ValidationError) -> str:
+    problems = "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'arguments'}: {e['msg']}" for e in error.errors()
+    )
+    return f"Invalid arguments for tool '{name}': {problems}. Fix the arguments and retry."
+
+
+class ToolCache:
+    """Per-run memo of pure tool results. Identical concurrent calls share one execution."""
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], Tuple[asyncio.Future, float]] = {}
+        self.hits = 0
+
+    @staticmethod
+    def key(name: str, kwargs: Dict[str, Any]) -> Tuple[str, str]:
+        return name, json.dumps(kwargs, sort_keys=True, separators=(",", ":"), default=str)
+
+    async def get_or_run(
+        self, name: str, kwargs: Dict[str, Any], ttl: Optional[float], run: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """Returns (result, served_from_cache). Failures are never cached."""
+        key = self.key(name, kwargs)
+        entry = self._entries.get(key)
+        if entry and (ttl is None or time.monotonic() - entry[1] < ttl):
+            self.hits += 1
+            return await asyncio.shield(entry[0]), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._entries[key] = (future, time.monotonic())
+        try:
+            result = await run()
+        except BaseException as exc:
+            self._entries.pop(key, None)
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exc)
+                future.exception()  # waiters re-raise it; don't warn when there are none
+            raise
+        future.set_result(result)
+        return result, False
+
+
 class ToolRegistry:
     def __init__(self):
-        self._tools: Dict[str, Callable] = {}
+        self._tools: Dict[str, ToolSpec] = {}
         self._schemas: List[Dict[str, Any]] = []
 
-    def register(self, name: str, description: str, func: Callable):
-        self._tools[name] = func
-        self._schemas.append({"name": name, "description": description})
+    def register(
+        self,
+        name: str,
+        description: str,
+        func: Callable,
+        timeout: float = DEFAULT_TOOL_TIMEOUT_SECONDS,
+        pure: bool = False,
+        ttl: Optional[float] = None,
+        schema: Optional[Union[Type[BaseModel], Dict[str, Any]]] = None,
+    ):
+        """
+        schema (a Pydantic model, or a JSON-schema object dict) is shown to the LLM as the
+        tool's parameters and compiled once into a validator; invalid arguments are rejected
+        locally with the exact field errors, before the tool runs.
+        """
+        args_model = compile_schema(name, schema) if schema is not None else None
+        self._tools[name] = ToolSpec(
+            func=func,
+            timeout=timeout,
+            pure=pure,
+            ttl=ttl,
+            args_model=args_model,
+            exclude_unset=isinstance(schema, dict),
+        )
+        entry: Dict[str, Any] = {"name": name, "description": description}
+        if args_model is not None:
+            entry["parameters"] = schema if isinstance(schema, dict) else args_model.model_json_schema()
+        self._schemas.append(entry)
+
+    async def execute(self, name: str, kwargs: Dict[str, Any], cache: Optional[ToolCache] = None) -> str:
+        result, _ = await self.execute_memoized(name, kwargs, cache)
+        return result
 
-    async def execute(self, name: str, kwargs: Dict[str, Any]) -> str:
-        if name not in self._tools:
-            return f"Error: Tool '{name}' not found."
+    async def execute_memoized(
+        self, name: str, kwargs: Dict[str, Any], cache: Optional[ToolCache] = None
+    ) -> Tuple[str, bool]:
+        """Like execute(), also reporting whether the result came from the run's cache."""
+        spec = self._tools.get(name)
+        if spec is None:
+            return f"Error: Tool '{name}' not found.", False
         try:
-            import asyncio
-            result = self._tools[name](**kwargs)
-            if asyncio.iscoroutine(result):
-                return await result
-            return str(result)
+            kwargs = spec.validate(kwargs)
+        except ValidationError as e:
+            logger.info(f"[ToolRegistry] Rejected call to {name}: {e.error_count()} invalid argument(s)")
+            return _format_validation_error(name, e), False
+        try:
+            if cache is not None and spec.pure:
+                return await cache.get_or_run(name, kwargs, spec.ttl, lambda: self._invoke(name, spec, kwargs))
+            return await self._invoke(name, spec, kwargs), False
+        except TimeoutError:
+            return f"Tool Execution Error: '{name}' timed out", False
         except Exception as e:
-            return f"Tool Execution Error: {str(e)}"
+            return f"Tool Execution Error: {str(e)}", False
+
+    @staticmethod
+    async def _invoke(name: str, spec: ToolSpec, kwargs: Dict[str, Any]) -> str:
+        # The tool's own cap, further bounded by the run's remaining time budget
+        async with asyncio.timeout(deadline.timeout_for(spec.timeout)):
+            if asyncio.iscoroutinefunction(spec.func):
+                result = await spec.func(**kwargs)
+            else:
+                # Plain callables run on a worker thread, so they don't block the loop (or the
+                # other calls of the step) and the timeout applies; a timed-out thread is
+                # abandoned, not killed
+                result = await asyncio.to_thread(spec.func, **kwargs)
+                if asyncio.iscoroutine(result):  # e.g. a lambda / partial around an async tool
+                    result = await result
+        # One type whether or not the result is served from the ToolCache
+        return str(result)
+
 
 class BoundedReActAgent:
-    def __init__(self, llm_provider: LLMProvider, tool_registry: ToolRegistry, max_steps: int = 5):
+    def __init__(
+        self,
+        llm_provider: LLMProvider,
+        tool_registry: ToolRegistry,
+        max_steps: int = 5,
+        max_parallel_tools: int = 4,
+        history_max_tokens: int = 6000,
+    ):
         self.llm = llm_provider
         self.tools = tool_registry
         self.max_steps = max_steps
+        self.max_parallel_tools = max_parallel_tools
+        self.history_max_tokens = history_max_tokens
         self.system_prompt = self._build_system_prompt()
 
     def _build_system_prompt(self) -> str:
@@ -49,25 +225,48 @@ class BoundedReActAgent:
         {{
             "action_type": "tool_call" | "final_answer",
             "thought": "Your reasoning",
-            "tool_name": "name of tool",
-            "tool_input": {{...}},
+            "tool_calls": [{{"tool_name": "name of tool", "tool_input": {{...}}}}],
             "final_output": {{...}}
         }}
+        Put every independent tool call you need now in tool_calls; they run in parallel.
+        tool_input must match the tool's "parameters" JSON schema when one is given.
         Available Tools: {json.dumps(self._schemas if hasattr(self, "_schemas") else self.tools._schemas)}
         """
 
-    async def run(self, task_context: Dict[str, Any], agent_run_id: str, db_session: Any) -> Dict[str, Any]:
-        """Executes the bounded ReAct loop with precise DB persistence."""
-        
-        # Sliding context window
-        conversation_history = f"Task: {json.dumps(task_context)}\n"
+    async def run(
+        self,
+        task_context: Dict[str, Any],
+        agent_run_id: str,
+        session_factory: Callable[[], Any],
+        db_session: Any = None,
+    ) -> Dict[str, Any]:
+        """
+        Executes the bounded ReAct loop. Steps are persisted by a StepRecorder off the hot
+        path, so no LLM or tool call waits on the database, and no connection is held
+        between steps. session_factory is the agent's (set by Orchestrator.run_agent), so
+        steps are written wherever the run is. Orchestrator.run_agent commits the AgentRun
+        before the agent starts; pass db_session only if the run was added to it and is not
+        committed yet.
+        """
+        # The recorder writes on its own session: the AgentRun row must be visible to it
+        if db_session is not None:
+            await db_session.commit()
+
+        async with StepRecorder(session_factory) as recorder:
+            return await self._loop(task_context, agent_run_id, recorder)
+
+    async def _loop(self, task_context: Dict[str, Any], agent_run_id: str, recorder: StepRecorder) -> Dict[str, Any]:
+        # Structured turns with a stable prefix; older observations get compacted
+        history = ConversationHistory(task_context, max_tokens=self.history_max_tokens)
+        # Pure tool results are reused for the rest of this run
+        cache = ToolCache()
         
         for step in range(self.max_steps):
             logger.info(f"--- 🤖 Agent Step {step+1}/{self.max_steps} ---")
             
             # 1. Reason
             response = await self.llm.generate(
-                prompt=conversation_history, 
+                prompt=history.render(),
                 system_prompt=self.system_prompt,
                 require_json=True
             )
@@ -78,49 +277,62 @@ class BoundedReActAgent:
                 logger.debug(f"[Thought] {action.thought}")
             except Exception as e:
                 logger.error(f"[Schema Error] Invalid JSON: {e}")
-                conversation_history += f"\nSystem Error: Invalid JSON schema returned: {e}\n"
+                history.add_error(step + 1, f"Invalid JSON schema returned: {e}")
                 continue
             
-            # 3. Persist Reasoning to DB
-            db_step = AgentRunStep(
-                agent_run_id=agent_run_id,
-                step_number=step + 1,
-                thought=action.thought,
-                tool_called=action.tool_name,
-                tool_input=action.tool_input,
-                prompt_tokens=response.prompt_tokens,
-                completion_tokens=response.completion_tokens
-            )
-            db_session.add(db_step)
-            await db_session.flush()
+            calls = action.calls() if action.action_type == "tool_call" else []
+
+            # 3. Record Reasoning — one row per tool call; tokens are counted on the first
+            step_ids = [
+                await recorder.add(
+                    agent_run_id=agent_run_id,
+                    step_number=step + 1,
+                    thought=action.thought,
+                    tool_called=call.tool_name if call else None,
+                    tool_input=call.tool_input if call else None,
+                    prompt_tokens=response.prompt_tokens if i == 0 else 0,
+                    completion_tokens=response.completion_tokens if i == 0 else 0,
+                    status="COMPLETED" if action.action_type == "final_answer" else "PENDING",
+                )
+                for i, call in enumerate(calls or [None])
+            ]
 
             # 4. Act & Observe
             if action.action_type == "final_answer":
                 logger.info("✅ Final Answer reached.")
-                db_step.status = "COMPLETED"
-                await db_session.commit()
                 return action.final_output
 
-            if action.action_type == "tool_call":
-                logger.info(f"🛠️  Calling Tool: {action.tool_name}")
-                logger.debug(f"Input: {json.dumps(action.tool_input)}")
-                
-                tool_result = await self.tools.execute(action.tool_name, action.tool_input or {})
-                
-                # Summarization / Truncation guardrail
-                result_str = str(tool_result)
-                summary_str = result_str if len(result_str) < 500 else result_str[:497] + "..."
-                logger.info(f"📝 Tool Result: {summary_str}")
-
-                if len(result_str) > 5000:
-                    result_str = result_str[:4900] + "\n...[TRUNCATED TO SAVE TOKENS]"
-                    
-                db_step.tool_output = result_str
-                db_step.status = "COMPLETED"
-                await db_session.flush()
-
-                conversation_history += f"\nAction: {action.tool_name}\nResult: {result_str}\n"
+            if calls:
+                logger.info(f"🛠️  Calling {len(calls)} tool(s): {[call.tool_name for call in calls]}")
+                results = await self._execute_calls(calls, cache)
+
+                for call, step_id, (result_str, cache_hit) in zip(calls, step_ids, results):
+                    await recorder.update(step_id, tool_output=result_str, status="COMPLETED", cache_hits=int(cache_hit))
+                    history.add_observation(step + 1, call.tool_name, call.tool_input, result_str)
 
         # Max steps reached without final_answer
-        await db_session.commit()
         raise RuntimeError(f"Agent exceeded maximum bounded steps ({self.max_steps})")
+
+    async def _execute_calls(self, calls: List[ToolCall], cache: Optional[ToolCache] = None) -> List[Tuple[str, bool]]:
+        """
+        Runs one step's tool calls concurrently (at most max_parallel_tools at once).
+        Returns (result, served_from_cache) per call, in call order.
+        """
+        semaphore = asyncio.Semaphore(self.max_parallel_tools)
+
+        async def run_one(call: ToolCall) -> Tuple[str, bool]:
+            async with semaphore:
+                logger.debug(f"Input: {json.dumps(call.tool_input)}")
+                tool_result, cache_hit = await self.tools.execute_memoized(call.tool_name, call.tool_input, cache)
+
+            # Summarization / Truncation guardrail
+            result_str = str(tool_result)
+            summary_str = result_str if len(result_str) < 500 else result_str[:497] + "..."
+            cached = " (cached)" if cache_hit else ""
+            logger.info(f"📝 Tool Result ({call.tool_name}){cached}: {summary_str}")
+
+            if len(result_str) > 5000:
+                result_str = result_str[:4900] + "\n...[TRUNCATED TO SAVE TOKENS]"
+            return result_str, cache_hit
+
+        return await asyncio.gather(*(run_one(call) for call in calls))
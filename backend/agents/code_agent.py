@@ -1,4 +1,7 @@
+import asyncio
 import json
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
 from backend.agents.base_agent import BaseAgent, AgentResult
 from backend.services.github_service import GitHubService
 from backend.services.llm_provider import GeminiProvider
@@ -7,15 +10,82 @@ from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+SYSTEM_PROMPT = """
+        You are an expert AI software engineer.
+        Based on the task description and guidelines, write the required code.
+        You MUST respond with a JSON object where keys are the file paths to create/modify, and values are the precise full file contents.
+        Return ONLY valid JSON.
+        Example:
+        {
+        "src/main.py": "print('hello')",
+        "src/utils.py": "def add(a, b): return a + b"
+        }
+        """
+
+
+@dataclass
+class CodeDraft:
+    """Generated files, not yet committed anywhere."""
+    files: Dict[str, Any]
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    thought: str = "Generating code straight from context without looping."
+
+
 class CodeAgent(BaseAgent):
     name = "CodeAgent"
+    time_budget_seconds = 600
+    # Set by the execution API when generation was started speculatively during Phase 1
+    draft_job: Optional["asyncio.Task[CodeDraft]"] = None
+
+    @staticmethod
+    async def generate(context: dict) -> CodeDraft:
+        """
+        LLM step only — no DB or GitHub side effects, so it can run before the issue exists.
+        The issue number is only needed later, for the PR title and body.
+        """
+        internal_context = {
+            "task_title": context.get("title", ""),
+            "task_description": context.get("description", ""),
+            "guidelines": context.get("project_guidelines", "Follow standard best practices."),
+            "architecture": context.get("services_architecture", "No architecture provided.")
+        }
+        prompt = f"Task Context: {json.dumps(internal_context)}"
+
+        response = await GeminiProvider().generate(
+            prompt=prompt,
+            system_prompt=SYSTEM_PROMPT,
+            require_json=True
+        )
+
+        files = response.parsed_json if hasattr(response, 'parsed_json') and response.parsed_json else {}
+        if not files or not isinstance(files, dict):
+            raise ValueError(f"Expected a json dictionary of files, got: {files}")
+        return CodeDraft(files=files, prompt_tokens=response.prompt_tokens, completion_tokens=response.completion_tokens)
+
+    async def _take_draft(self) -> Optional[CodeDraft]:
+        """Awaits the speculative draft; None means generate now (no draft, or it failed)."""
+        if self.draft_job is None:
+            return None
+        try:
+            draft = await self.draft_job
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise
+            logger.warning(f"[{self.name}] Speculative draft was cancelled, regenerating")
+            return None
+        except Exception as e:
+            logger.warning(f"[{self.name}] Speculative draft failed, regenerating: {e}")
+            return None
+        draft.thought = "Reusing the code draft generated speculatively during Phase 1."
+        return draft
 
     async def run(self, context: dict) -> AgentResult:
         run_id = getattr(self, "run_id", None)
-        db_session = getattr(self, "db_session", None)
+        session_factory = getattr(self, "session_factory", None)
 
-        if not run_id or not db_session:
-            return AgentResult(success=False, error="run_id and db_session required for CodeAgent")
+        if not run_id or not session_factory:
+            return AgentResult(success=False, error="run_id and session_factory required for CodeAgent")
 
         self.github = GitHubService(repo=context.get("github_repo"))
         base_branch = context.get('base_branch')
@@ -24,58 +94,30 @@ class CodeAgent(BaseAgent):
         description = context.get("description", "")
         issue_id = context.get("github_issue_id", "N/A")
 
-        llm = GeminiProvider()
-
         logger.info(f"[{self.name}] Generating code without looping for task: {title}")
         
         try:
-            # Inject context
-            internal_context = {
-                "task_title": title,
-                "task_description": description,
-                "guidelines": context.get("project_guidelines", "Follow standard best practices."),
-                "architecture": context.get("services_architecture", "No architecture provided.")
-            }
-
-            system_prompt = """
-                    You are an expert AI software engineer.
-                    Based on the task description and guidelines, write the required code.
-                    You MUST respond with a JSON object where keys are the file paths to create/modify, and values are the precise full file contents.
-                    Return ONLY valid JSON.
-                    Example:
-                    {
-                    "src/main.py": "print('hello')",
-                    "src/utils.py": "def add(a, b): return a + b"
-                    }
-                    """
-            
-            prompt = f"Task Context: {json.dumps(internal_context)}"
-
-            # 1. Reason and generate code
-            response = await llm.generate(
-                prompt=prompt, 
-                system_prompt=system_prompt,
-                require_json=True
-            )
-            
-            files = response.parsed_json if hasattr(response, 'parsed_json') and response.parsed_json else {}
-            if not files or not isinstance(files, dict):
-                 raise ValueError(f"Expected a json dictionary of files, got: {files}")
+            # 1. Reason and generate code (or reuse the draft generated alongside Phase 1)
+            draft = await self._take_draft()
+            if draft is None:
+                draft = await self.generate(context)
+            files = draft.files
 
-            # Persist Reasoning to DB for transparency
+            # Persist Reasoning to DB for transparency (on a brief session: GitHub calls follow)
             db_step = AgentRunStep(
                 agent_run_id=run_id,
                 step_number=1,
-                thought="Generating code straight from context without looping.",
+                thought=draft.thought,
                 tool_called="apply_code_and_pr",
                 tool_input={"files": list(files.keys())},
                 tool_output="Files generated successfully",
-                prompt_tokens=response.prompt_tokens,
-                completion_tokens=response.completion_tokens,
+                prompt_tokens=draft.prompt_tokens,
+                completion_tokens=draft.completion_tokens,
                 status="COMPLETED"
             )
-            db_session.add(db_step)
-            await db_session.commit()
+            async with session_factory() as db:
+                db.add(db_step)
+                await db.commit()
 
             # 2. Apply code & PR
             logger.info(f"[{self.name}] Creating branch and PR...")
@@ -0,0 +1,105 @@
+"""
+ConversationHistory — the prompt a BoundedReActAgent re-sends every step.
+
+Kept as structured turns rather than one growing string:
+  - The task header is rendered once and never changes, and compacted summaries are
+    only ever appended after it, so consecutive prompts share a long stable prefix
+    (provider-side prompt caching keeps working between compactions).
+  - A tool output identical to an earlier one is replaced by a back-reference.
+  - Once the estimated size passes max_tokens, the oldest verbatim turns are folded
+    into one-line summaries; the most recent keep_recent turns always stay verbatim.
+"""
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+# Rough chars-per-token for budget checks; no tokenizer round trip on the hot path
+CHARS_PER_TOKEN = 4
+
+
+@dataclass(eq=False)
+class Turn:
+    step: int
+    kind: str  # "observation" | "error"
+    content: str
+    tool_name: Optional[str] = None
+    tool_input: Optional[Dict[str, Any]] = None
+    digest: Optional[str] = None
+    # Earlier verbatim turn with the same output; rendered as a back-reference
+    duplicate_of: Optional["Turn"] = None
+
+    def render(self) -> str:
+        if self.kind == "error":
+            return f"\nSystem Error: {self.content}\n"
+        result = self.content
+        if self.duplicate_of is not None:
+            result = f"[identical to the result of {self.duplicate_of.tool_name} at step {self.duplicate_of.step}]"
+        return f"\nAction: {self.tool_name} {_canonical(self.tool_input)}\nResult: {result}\n"
+
+    def summarize(self) -> str:
+        if self.kind == "error":
+            return f"- step {self.step}: error: {_first_line(self.content)}"
+        return (
+            f"- step {self.step}: {self.tool_name} {_canonical(self.tool_input)} -> "
+            f"{len(self.content)} chars: {_first_line(self.content)}"
+        )
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value or {}, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _first_line(text: str, limit: int = 120) -> str:
+    line = text.strip().splitlines()[0] if text.strip() else ""
+    return line if len(line) <= limit else line[:limit - 3] + "..."
+
+
+class ConversationHistory:
+    def __init__(self, task_context: Dict[str, Any], max_tokens: int = 6000, keep_recent: int = 4):
+        self.header = f"Task: {json.dumps(task_context, sort_keys=True, default=str)}\n"
+        self.max_tokens = max_tokens
+        self.keep_recent = keep_recent
+        self.summaries: List[str] = []
+        self.turns: List[Turn] = []
+        self._verbatim: Dict[str, Turn] = {}  # output digest -> turn that carries it in full
+
+    def add_observation(self, step: int, tool_name: str, tool_input: Optional[Dict[str, Any]], output: str) -> None:
+        digest = hashlib.sha256(output.encode("utf-8")).hexdigest()
+        turn = Turn(step, "observation", output, tool_name, tool_input, digest)
+        if len(output) > 80:  # short outputs cost less than the reference
+            turn.duplicate_of = self._verbatim.get(digest)
+            self._verbatim.setdefault(digest, turn)
+        self.turns.append(turn)
+        self._compact()
+
+    def add_error(self, step: int, message: str) -> None:
+        self.turns.append(Turn(step, "error", message))
+        self._compact()
+
+    def estimated_tokens(self) -> int:
+        return len(self.render()) // CHARS_PER_TOKEN
+
+    def render(self) -> str:
+        parts = [self.header]
+        if self.summaries:
+            parts.append("Earlier steps (summarized):\n" + "\n".join(self.summaries) + "\n")
+        parts.extend(turn.render() for turn in self.turns)
+        return "".join(parts)
+
+    def _compact(self) -> None:
+        """Folds the oldest verbatim turns into summaries until under budget."""
+        while len(self.turns) > self.keep_recent and self.estimated_tokens() > self.max_tokens:
+            oldest = self.turns.pop(0)
+            self.summaries.append(oldest.summarize())
+            # Later duplicates can't point at a summary: the first one takes over the full output
+            heir = None
+            for turn in self.turns:
+                if turn.duplicate_of is oldest:
+                    turn.duplicate_of = heir
+                    heir = heir or turn
+            if self._verbatim.get(oldest.digest) is oldest:
+                if heir:
+                    self._verbatim[oldest.digest] = heir
+                else:
+                    del self._verbatim[oldest.digest]
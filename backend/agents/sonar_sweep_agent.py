@@ -24,6 +24,7 @@ Your job is to perform a 'Clean Sweep' of multiple SonarCloud violations in a si
 
 class SonarSweepAgent(BaseAgent):
     name = "SonarSweepAgent"
+    time_budget_seconds = 600
 
     def __init__(self):
         self.llm = GeminiService()
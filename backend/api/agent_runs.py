@@ -1,50 +1,119 @@
 """
 Agent Runs API — GET /api/agent-runs
-Polled by frontend dashboard every 3-5 seconds.
+Polled by frontend dashboard every 3-5 seconds; keyset-paginated so a poll only reads the newest page.
+
+JSON filters run in Postgres as JSONB containment (served by the GIN indexes), written
+as "path.to.key:value", e.g. ?output=pr_review_status:APPROVED&output=github_pr_id:42.
+Values that parse as JSON (numbers, booleans, null) match as such, anything else as a string.
+output / input_context filters take top-level keys only: a large top-level value is stored
+as a {"$blob": ...} ref (blob_store), so a nested path could silently match nothing.
+Step tool_input is stored inline and takes nested paths.
 """
+import json
 from uuid import UUID
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from backend.db.database import get_db
+from backend.config import get_settings
+from backend.db.database import get_read_db
 from backend.db.models import AgentRun, AgentRunStep
-from backend.schemas.agent_run import AgentRunResponse, AgentRunStepResponse
+from backend.schemas.agent_run import AgentRunResponse, AgentRunSummary, AgentRunStepResponse
+from backend.schemas.pagination import Page
+from backend.core.blob_store import hydrate_runs
+from backend.core.pagination import load_fields, paginate
+
+settings = get_settings()
 
 router = APIRouter(prefix="/api/agent-runs", tags=["Agent Runs"])
 
 
-@router.get("", response_model=list[AgentRunResponse])
+def _containment(filters: List[str], param: str, nested: bool = True) -> Dict[str, Any]:
+    """Folds "path.to.key:value" filters into one JSONB containment document."""
+    document: Dict[str, Any] = {}
+    for item in filters:
+        path, sep, raw = item.partition(":")
+        keys = path.split(".")
+        if not sep or not all(keys):
+            raise HTTPException(status_code=400, detail=f"Invalid {param} filter {item!r}, expected key:value")
+        if len(keys) > 1 and not nested:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid {param} filter {item!r}: only top-level keys can be filtered",
+            )
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            value = raw
+        node = document
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+            if not isinstance(node, dict):
+                raise HTTPException(status_code=400, detail=f"Conflicting {param} filters on {path!r}")
+        node[keys[-1]] = value
+    return document
+
+
+@router.get("", response_model=Page[AgentRunSummary])
 async def list_agent_runs(
     task_id: Optional[UUID] = Query(None, description="Filter by task ID"),
-    db: AsyncSession = Depends(get_db),
+    agent_name: Optional[str] = Query(None, description="Filter by agent, e.g. CodeAgent"),
+    status: Optional[str] = Query(None, description="Filter by run status"),
+    output: List[str] = Query([], description="Output containment filter, e.g. pr_review_status:APPROVED"),
+    input_context: List[str] = Query([], description="Input context containment filter, e.g. github_repo:org/repo"),
+    tool: Optional[str] = Query(None, description="Only runs with a step that called this tool"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
-    Returns all agent runs, optionally filtered by task_id.
-    Frontend polls this endpoint every 3-5 seconds for live dashboard updates.
+    Returns one page of agent run summaries, newest first, optionally filtered by task_id,
+    agent, status, output / input_context contents or a tool used. Frontend polls this endpoint every 3-5 seconds for live dashboard updates;
+    input_context / output are only served by GET /api/agent-runs/{run_id}.
+    output / input_context filters match top-level keys only (large values are stored
+    out of line); a nested path is rejected with a 400.
     """
-    query = select(AgentRun).order_by(AgentRun.started_at.desc())
+    query = select(AgentRun).options(load_fields(AgentRun, AgentRunSummary))
     if task_id:
         query = query.where(AgentRun.task_id == task_id)
-    result = await db.execute(query)
-    runs = result.scalars().all()
-    return [AgentRunResponse.model_validate(r) for r in runs]
+    if agent_name:
+        query = query.where(AgentRun.agent_name == agent_name)
+    if status:
+        query = query.where(AgentRun.status == status)
+    if output:
+        query = query.where(AgentRun.output.contains(_containment(output, "output", nested=False)))
+    if input_context:
+        query = query.where(AgentRun.input_context.contains(_containment(input_context, "input_context", nested=False)))
+    if tool:
+        query = query.where(
+            select(AgentRunStep.id)
+            .where(AgentRunStep.agent_run_id == AgentRun.id, AgentRunStep.tool_called == tool)
+            .exists()
+        )
+    runs, next_cursor = await paginate(db, query, AgentRun.started_at, AgentRun.id, cursor, limit)
+    return Page(items=[AgentRunSummary.model_validate(r) for r in runs], next_cursor=next_cursor)
 
 
 @router.get("/{run_id}", response_model=AgentRunResponse)
-async def get_agent_run(run_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_agent_run(run_id: UUID, db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(select(AgentRun).where(AgentRun.id == run_id))
     run = result.scalar_one_or_none()
     if not run:
         raise HTTPException(status_code=404, detail=f"AgentRun {run_id} not found")
-    return AgentRunResponse.model_validate(run)
+    [response] = await hydrate_runs(db, [AgentRunResponse.model_validate(run)])
+    return response
 
 
 @router.get("/{run_id}/steps", response_model=list[AgentRunStepResponse])
-async def list_agent_run_steps(run_id: UUID, db: AsyncSession = Depends(get_db)):
+async def list_agent_run_steps(
+    run_id: UUID,
+    tool: Optional[str] = Query(None, description="Only steps that called this tool"),
+    tool_input: List[str] = Query([], description="Tool input containment filter, e.g. path:src/app.py"),
+    db: AsyncSession = Depends(get_read_db),
+):
     """
-    Returns all reasoning steps (ReAct loop iterations) for a specific agent run.
+    Returns the reasoning steps (ReAct loop iterations) for a specific agent run.
     Used by the frontend AI Reasoning Panel to show the agent's decision trace.
     """
     # Verify the run exists first
@@ -53,11 +122,12 @@ async def list_agent_run_steps(run_id: UUID, db: AsyncSession = Depends(get_db))
     if not run:
         raise HTTPException(status_code=404, detail=f"AgentRun {run_id} not found")
 
-    result = await db.execute(
-        select(AgentRunStep)
-        .where(AgentRunStep.agent_run_id == run_id)
-        .order_by(AgentRunStep.step_number.asc())
-    )
+    query = select(AgentRunStep).where(AgentRunStep.agent_run_id == run_id)
+    if tool:
+        query = query.where(AgentRunStep.tool_called == tool)
+    if tool_input:
+        query = query.where(AgentRunStep.tool_input.contains(_containment(tool_input, "tool_input")))
+    result = await db.execute(query.order_by(AgentRunStep.step_number.asc()))
     steps = result.scalars().all()
     return [AgentRunStepResponse.model_validate(s) for s in steps]
 
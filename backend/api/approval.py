@@ -2,22 +2,29 @@
 Approval API
   PATCH /api/tasks/{task_id}/approve   — approve + optionally edit a task
   PATCH /api/tasks/{task_id}/reject    — reject a task
-  GET   /api/tasks                     — list all tasks
+  GET   /api/tasks                     — list task summaries (keyset-paginated)
   GET   /api/tasks/{task_id}           — get single task
   PATCH /api/tasks/{task_id}           — edit task fields
 """
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, update
 from typing import Optional
-
-from backend.db.database import get_db
-from backend.db.models import Task
-from backend.schemas.task import TaskResponse, TaskUpdate
+from datetime import datetime, timezone
+
+from backend.config import get_settings
+from backend.db.database import get_db, get_read_db
+from backend.db.models import Task, AgentRun
+from backend.schemas.task import TaskResponse, TaskSummary, TaskUpdate
+from backend.schemas.pagination import Page
+from backend.core.pagination import load_fields, paginate
 from backend.core.logging import get_logger
+from backend.core import dashboard_stats
+from backend.core.run_registry import publish_abort, CANCELED_BY_USER
 
 logger = get_logger(__name__)
+settings = get_settings()
 router = APIRouter(prefix="/api/tasks", tags=["Tasks"])
 
 
@@ -29,20 +36,24 @@ async def _get_task_or_404(task_id: UUID, db: AsyncSession) -> Task:
     return task
 
 
-@router.get("", response_model=list[TaskResponse])
-async def list_tasks(project_id: Optional[UUID] = None, db: AsyncSession = Depends(get_db)):
-    """Return all tasks ordered by created_at desc. Optionally filter by project."""
-    query = select(Task).order_by(Task.created_at.desc())
+@router.get("", response_model=Page[TaskSummary])
+async def list_tasks(
+    project_id: Optional[UUID] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Return one page of task summaries, newest first. Optionally filter by project."""
+    query = select(Task).options(load_fields(Task, TaskSummary))
     if project_id:
         query = query.where(Task.project_id == project_id)
-    
-    result = await db.execute(query)
-    tasks = result.scalars().all()
-    return [TaskResponse.model_validate(t) for t in tasks]
+
+    tasks, next_cursor = await paginate(db, query, Task.created_at, Task.id, cursor, limit)
+    return Page(items=[TaskSummary.model_validate(t) for t in tasks], next_cursor=next_cursor)
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
-async def get_task(task_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_task(task_id: UUID, db: AsyncSession = Depends(get_read_db)):
     task = await _get_task_or_404(task_id, db)
     return TaskResponse.model_validate(task)
 
@@ -93,12 +104,45 @@ async def reject_task(task_id: UUID, db: AsyncSession = Depends(get_db)):
 
 @router.post("/{task_id}/abort", response_model=TaskResponse)
 async def abort_task(task_id: UUID, db: AsyncSession = Depends(get_db)):
-    """Stop a task that is currently IN_PROGRESS."""
+    """
+    Stop a task that is currently IN_PROGRESS.
+    Cancels its running agents on whichever replica hosts them and marks open runs CANCELLED.
+    """
     task = await _get_task_or_404(task_id, db)
     
     # We allow aborting if it's WORKING or stuck in APPROVED
     task.status = "FAILED"
-    task.error_message = "Canceled by user"
+    task.error_message = CANCELED_BY_USER
+
+    # Runs owned by a dead worker would otherwise stay RUNNING forever. Marked before the
+    # live runs are cancelled, so this is the one place a cancellation is counted.
+    open_runs = (
+        select(AgentRun.id, AgentRun.started_at, AgentRun.status)
+        .where(AgentRun.task_id == task_id, AgentRun.status.in_(["PENDING", "RUNNING"]))
+        .with_for_update()
+        .cte("open_runs")
+    )
+    cancelled = (await db.execute(
+        update(AgentRun)
+        .where(AgentRun.id == open_runs.c.id, AgentRun.started_at == open_runs.c.started_at)
+        .values(
+            status="CANCELLED",
+            error_message=CANCELED_BY_USER,
+            completed_at=datetime.now(timezone.utc).replace(tzinfo=None),
+        )
+        .returning(AgentRun.id, AgentRun.agent_name, AgentRun.started_at, open_runs.c.status)
+    )).all()
+    if cancelled:
+        tokens = await dashboard_stats.run_tokens(
+            db, [run.id for run in cancelled], min(run.started_at for run in cancelled).date(),
+        )
+        for run in cancelled:
+            dashboard_stats.run_transition(
+                db, task.project_id, run.agent_name, run.started_at.date(), run.status, "CANCELLED",
+                *tokens.get(run.id, (0, 0)),
+            )
+
+    await publish_abort(db, task_id)
     
     logger.info(f"[Approval API] Task {task_id} manually aborted")
     await db.commit()
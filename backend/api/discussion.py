@@ -2,20 +2,52 @@
 Discussion API — POST /api/discussion/extract
 Accepts transcript text, runs DiscussionAgent, saves tasks to DB.
 """
+from datetime import datetime
+from typing import Any, Dict, List
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import insert
 
-from backend.db.database import get_db
-from backend.db.models import Task, AgentRun
+from backend.db.database import AsyncSessionLocal, get_db
+from backend.db.models import ExtractionRun, Task
 from backend.schemas.task import ExtractRequest, ExtractResponse, TaskResponse
 from backend.agents.discussion_agent import DiscussionAgent
 from backend.core.orchestrator import Orchestrator
 from backend.core.logging import get_logger
+from backend.core import dashboard_stats
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api/discussion", tags=["Discussion"])
 
+_tasks = Task.__table__
+
+
+def _task_rows(extracted: List[Dict[str, Any]], request: ExtractRequest) -> List[Dict[str, Any]]:
+    """Core insert parameters; column defaults (id, timestamps, flags) fill the rest."""
+    return [
+        {
+            "title": task_data.get("title", "Untitled"),
+            "description": task_data.get("description"),
+            "acceptance_criteria": task_data.get("acceptance_criteria"),
+            "deadline": task_data.get("deadline"),
+            "priority": task_data.get("priority", "MEDIUM"),
+            "status": "PENDING",
+            "approved": False,
+            "project_id": request.project_id,
+            "github_repo": request.github_repo,
+        }
+        for task_data in extracted
+    ]
+
+
+async def _finish_extraction(db: AsyncSession, extraction: ExtractionRun, error: str) -> None:
+    """Records a failed extraction (with its agent run) before the request errors out."""
+    extraction.status = "FAILED"
+    extraction.error_message = error
+    extraction.completed_at = datetime.utcnow()
+    await db.commit()
+
 
 @router.post("/extract", response_model=ExtractResponse)
 async def extract_tasks(request: ExtractRequest, db: AsyncSession = Depends(get_db)):
@@ -23,56 +55,45 @@ async def extract_tasks(request: ExtractRequest, db: AsyncSession = Depends(get_
     Step 1: Upload transcript → DiscussionAgent extracts tasks → Save to DB.
     Returns the list of extracted tasks (status=PENDING, approved=False).
     """
-    orchestrator = Orchestrator(db)
-
-    # Create a placeholder task to log the extraction agent run
-    # (We use a temporary task record for the agent run, then create real tasks after)
-    placeholder = Task(
-        title="[Extraction Run]",
-        status="PENDING",
-        project_id=request.project_id,
-    )
-    db.add(placeholder)
+    orchestrator = Orchestrator(db, session_factory=AsyncSessionLocal)
+
+    # The extraction run owns the DiscussionAgent's AgentRun; tasks only exist afterwards
+    extraction = ExtractionRun(project_id=request.project_id, transcript_chars=len(request.transcript))
+    db.add(extraction)
     await db.flush()
 
     try:
         result = await orchestrator.run_agent(
             agent_cls=DiscussionAgent,
-            task=placeholder,
+            task=extraction,
             context={"transcript": request.transcript, "project_id": str(request.project_id) if request.project_id else None},
         )
     except Exception as e:
+        await _finish_extraction(db, extraction, str(e))
         raise HTTPException(status_code=500, detail=f"DiscussionAgent failed: {str(e)}")
 
     if not result.success:
+        await _finish_extraction(db, extraction, result.error)
         raise HTTPException(status_code=422, detail=result.error)
 
     extracted = result.output.get("extracted_tasks", [])
 
-    # Delete the placeholder extraction task
-    await db.delete(placeholder)
-
-    # Save real tasks
+    # One multi-row INSERT ... RETURNING instead of an ORM add + flush per task
     saved_tasks = []
-    for task_data in extracted:
-        task = Task(
-            title=task_data.get("title", "Untitled"),
-            description=task_data.get("description"),
-            acceptance_criteria=task_data.get("acceptance_criteria"),
-            deadline=task_data.get("deadline"),
-            priority=task_data.get("priority", "MEDIUM"),
-            status="PENDING",
-            approved=False,
-            project_id=request.project_id,
-            github_repo=request.github_repo,
-        )
-        db.add(task)
-        saved_tasks.append(task)
+    if extracted:
+        stmt = insert(_tasks).returning(*_tasks.c, sort_by_parameter_order=True)
+        rows = await db.execute(stmt, _task_rows(extracted, request))
+        saved_tasks = rows.all()
+        # Core inserts bypass the ORM listener that maintains the dashboard counts
+        dashboard_stats.add_tasks(db, request.project_id, "PENDING", len(saved_tasks))
 
-    await db.flush()
+    extraction.status = "COMPLETED"
+    extraction.task_count = len(saved_tasks)
+    extraction.completed_at = datetime.utcnow()
 
-    logger.info(f"[Discussion API] Saved {len(saved_tasks)} tasks from extraction")
+    logger.info(f"[Discussion API] Saved {len(saved_tasks)} tasks from extraction {extraction.id}")
     return ExtractResponse(
         tasks=[TaskResponse.model_validate(t) for t in saved_tasks],
         count=len(saved_tasks),
+        extraction_run_id=extraction.id,
     )
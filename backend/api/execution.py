@@ -3,6 +3,9 @@ Execution API — POST /api/execution/{task_id}/execute
 Triggers TicketAgent → EmailAgent for an approved task.
 This is the explicit human-triggered step after approval.
 """
+import asyncio
+import json
+import time
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,30 +13,45 @@ from sqlalchemy import select
 
 from backend.db.database import get_db
 from backend.db.models import Task
-from backend.schemas.task import TaskResponse
+from backend.schemas.task import TaskResponse, BatchExecuteRequest
 from backend.agents.ticket_agent import TicketAgent
 from backend.agents.email_agent import EmailAgent
-from backend.agents.code_agent import CodeAgent
+from backend.agents.code_agent import CodeAgent, CodeDraft
 from backend.agents.pr_agent import PRAgent
 from backend.agents.sonar_agent import SonarAgent
 from backend.agents.sonar_sweep_agent import SonarSweepAgent
 from backend.core.orchestrator import Orchestrator
 from backend.core.logging import get_logger
-from backend.db.models import Project
-from typing import Dict, Any, List
+from backend.core.project_cache import project_cache, ProjectContext
+from backend.core.idempotency import single_flight, digest
+from backend.core.run_registry import run_registry, CANCELED_BY_USER
+from backend.core import deadline, tracing
+from backend.config import get_settings
+from backend.db.database import AsyncSessionLocal
+from backend.services.gemini_service import get_genai_client
+from backend.services.github_service import shared_client
+from typing import Dict, Any, List, Optional, Callable, Set, AsyncIterator
 
 logger = get_logger(__name__)
+settings = get_settings()
 router = APIRouter(prefix="/api/execution", tags=["Execution"])
 
 PROJECT_NOT_FOUND = "Project not found"
 
 
-from fastapi import BackgroundTasks
+from fastapi import BackgroundTasks, Header
+from fastapi.responses import StreamingResponse
 from backend.core.orchestrator import IdentityEnvelope
 
-async def background_code_generation(task_id: UUID, db_session_factory: Any, context: Dict[str, Any]):
+async def background_code_generation(
+    task_id: UUID,
+    db_session_factory: Any,
+    context: Dict[str, Any],
+    draft_job: Optional[asyncio.Task] = None,
+):
     """
     Background worker to handle Phase 2: Code Generation.
+    draft_job is the speculative CodeAgent generation started alongside Phase 1, if any.
     """
     from backend.db.database import AsyncSessionLocal
     async with AsyncSessionLocal() as db:
@@ -44,15 +62,16 @@ async def background_code_generation(task_id: UUID, db_session_factory: Any, con
                 return
 
             logger.info(f"[Background] Starting Phase 2 for task {task_id}")
-            orchestrator = Orchestrator(db)
+            orchestrator = Orchestrator(db, session_factory=AsyncSessionLocal)
             
             # Step 3: Generate Code and PR
-            code_result = await orchestrator.run_agent(CodeAgent, task, context)
+            with deadline.budget(settings.PIPELINE_TIME_BUDGET_SECONDS):
+                code_result = await orchestrator.run_agent(
+                    CodeAgent, task, context, agent_attrs={"draft_job": draft_job}
+                )
             
             if code_result.success:
-                task.github_pr_id = code_result.output.get("github_pr_id")
-                task.github_pr_url = code_result.output.get("github_pr_url")
-                task.branch_name = code_result.output.get("branch_name")
+                _apply_stage_output(task, CodeAgent.name, code_result.output)
                 task.status = "COMPLETED"
                 task.error_message = None
                 logger.info(f"[Background] Task {task_id} Phase 2 completed")
@@ -74,18 +93,128 @@ async def background_code_generation(task_id: UUID, db_session_factory: Any, con
             except Exception: # Changed from 'except Exception as inner_e:'
                 # If we can't record the error, just log it without trying to access inner_e
                 logger.error(f"[Background] Failed to record fatal error during recovery for task {task_id}")
+        finally:
+            # CodeAgent was skipped (e.g. aborted) without consuming the draft
+            _discard_draft(draft_job)
+
+PHASE_1_AGENTS = [TicketAgent, EmailAgent]
+PIPELINE_AGENTS = PHASE_1_AGENTS + [CodeAgent]
+
+
+def _build_task_context(task: Task) -> Dict[str, Any]:
+    return {
+        "task_id": str(task.id),
+        "title": task.title,
+        "description": task.description,
+        "acceptance_criteria": task.acceptance_criteria,
+        "deadline": task.deadline,
+        "priority": task.priority,
+        "github_repo": task.github_repo,
+    }
+
+
+async def _speculate_code(context: Dict[str, Any]) -> CodeDraft:
+    """CodeAgent's LLM step, run concurrently with Phase 1 under CodeAgent's own budget."""
+    with deadline.budget(CodeAgent.time_budget_seconds), \
+            tracing.span("CodeAgent.speculate", task_id=context["task_id"]):
+        return await CodeAgent.generate(context)
+
+
+def _start_speculation(task: Task, context: Dict[str, Any], project: Optional[ProjectContext]) -> asyncio.Task:
+    # Project context is resolved by the caller: the draft must not share the request's session
+    draft_context = {**context, **(project.as_agent_context() if project else {})}
+    logger.info(f"[Execution API] Starting speculative code generation for {task.id}")
+    return asyncio.create_task(_speculate_code(draft_context))
+
+
+def _discard_draft(draft_job: Optional[asyncio.Task]) -> None:
+    """Drops a speculative draft that will never be published."""
+    if draft_job is None:
+        return
+    if not draft_job.done():
+        draft_job.cancel()
+        logger.info("[Execution API] Discarded speculative code draft")
+    elif not draft_job.cancelled():
+        draft_job.exception()  # retrieved, so a failed draft doesn't warn at GC time
+
+
+def _apply_stage_output(task: Task, agent_name: str, output: Dict[str, Any]) -> None:
+    """Copies an agent's output onto the task columns that stage owns."""
+    if agent_name == TicketAgent.name:
+        task.github_issue_id = output.get("github_issue_id")
+        task.github_issue_url = output.get("github_issue_url")
+    elif agent_name == EmailAgent.name:
+        task.email_sent = True
+    elif agent_name == CodeAgent.name:
+        task.github_pr_id = output.get("github_pr_id")
+        task.github_pr_url = output.get("github_pr_url")
+        task.branch_name = output.get("branch_name")
+
+
+async def _run_phase_1(
+    orchestrator: Orchestrator,
+    db: AsyncSession,
+    task: Task,
+    context: Dict[str, Any],
+    agents: List[Any],
+    on_stage: Optional[Callable[[str, bool], None]] = None,
+) -> bool:
+    """
+    Runs the given Phase 1 stages, committing after each one so a crash in a later
+    stage never loses (or repeats) the GitHub issue / email of an earlier one.
+    Returns False if the pipeline must halt (TicketAgent failed).
+    on_stage(agent_name, success) is called as each stage finishes (batch progress).
+    """
+    with deadline.budget(settings.PIPELINE_TIME_BUDGET_SECONDS):
+        for agent_cls in agents:
+            result = await orchestrator.run_agent(agent_cls, task, context)
+            if on_stage:
+                on_stage(agent_cls.name, result.success)
+            if run_registry.is_aborted(task.id):
+                task.status = "FAILED"
+                task.error_message = CANCELED_BY_USER
+                await db.commit()
+                return False
+            if result.success:
+                _apply_stage_output(task, agent_cls.name, result.output)
+                context.update(result.output)
+            elif agent_cls is TicketAgent:
+                task.status = "FAILED"
+                await db.commit()
+                return False
+            await db.commit()
+    return True
+
 
 @router.post("/{task_id}/execute", response_model=TaskResponse)
 async def execute_task(
     task_id: UUID, 
     background_tasks: BackgroundTasks,
+    speculative: bool = False,
+    idempotency_key: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Refined execution trigger:
     1. Phase 1 (Issue + Email) runs Synchronously.
     2. Phase 2 (Code Generation) triggered as a Background Task.
+    With speculative=true, CodeAgent's LLM generation starts alongside Phase 1 and the
+    issue number is only filled in when the PR is opened; the draft is discarded if
+    Phase 1 halts.
+    Single-flight per task: duplicates coalesce onto the running execution; one with a
+    different speculative flag gets a 409.
     """
+    return await single_flight(
+        f"pipeline:{task_id}",
+        lambda: _execute_task(task_id, background_tasks, db, speculative),
+        idempotency_key,
+        params={"speculative": speculative},
+    )
+
+
+async def _execute_task(
+    task_id: UUID, background_tasks: BackgroundTasks, db: AsyncSession, speculative: bool = False
+) -> TaskResponse:
     result = await db.execute(select(Task).where(Task.id == task_id))
     task = result.scalar_one_or_none()
     if not task:
@@ -99,42 +228,25 @@ async def execute_task(
 
     # Start Phase 1
     task.status = "IN_PROGRESS"
+    run_registry.clear_abort(task.id)
     await db.flush()
 
-    orchestrator = Orchestrator(db)
-    context = {
-        "task_id": str(task.id),
-        "title": task.title,
-        "description": task.description,
-        "acceptance_criteria": task.acceptance_criteria,
-        "deadline": task.deadline,
-        "priority": task.priority,
-        "github_repo": task.github_repo,
-    }
+    orchestrator = Orchestrator(db, session_factory=AsyncSessionLocal)
+    context = _build_task_context(task)
+
+    draft_job = None
+    if speculative:
+        project = await project_cache.get(db, task.project_id) if task.project_id else None
+        draft_job = _start_speculation(task, context, project)
 
     try:
-        # Step 1: Create GitHub issue
-        ticket_result = await orchestrator.run_agent(TicketAgent, task, context)
-        if ticket_result.success:
-            task.github_issue_id = ticket_result.output.get("github_issue_id")
-            task.github_issue_url = ticket_result.output.get("github_issue_url")
-            context.update(ticket_result.output)
-        else:
-            task.status = "FAILED"
-            await db.commit()
+        # Step 1: Create GitHub issue, Step 2: Send email
+        if not await _run_phase_1(orchestrator, db, task, context, PHASE_1_AGENTS):
+            _discard_draft(draft_job)
             return TaskResponse.model_validate(task)
 
-        # Step 2: Send email
-        email_context = {**context, "github_issue_url": task.github_issue_url or ""}
-        email_result = await orchestrator.run_agent(EmailAgent, task, email_context)
-        if email_result.success:
-            task.email_sent = True
-
-        # Phase 1 Complete - Commit so background task sees the updated state
-        await db.commit()
-        
         # Trigger Phase 2 in background
-        background_tasks.add_task(background_code_generation, task.id, None, context)
+        background_tasks.add_task(background_code_generation, task.id, None, context, draft_job)
         
         # We return the task state after Phase 1. 
         # The UI will see it as "IN_PROGRESS" or we can set a specific status.
@@ -142,23 +254,228 @@ async def execute_task(
         logger.info(f"[Execution API] Phase 1 complete for {task_id}. Backgrounding Phase 2.")
         return TaskResponse.model_validate(task)
 
+    except asyncio.CancelledError:
+        _discard_draft(draft_job)
+        raise
     except Exception as e:
+        _discard_draft(draft_job)
         task.status = "FAILED"
         logger.error(f"[Execution API] pipeline failed: {e}")
         await db.commit()
         raise HTTPException(status_code=500, detail=str(e))
 
+_batch_workers: Set[asyncio.Task] = set()
+
+
+@router.post("/batch")
+async def execute_batch(request: BatchExecuteRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Runs the full pipeline (Phase 1 + code generation) for many approved tasks, at most
+    `concurrency` at a time, sharing the warmed GitHub / Gemini clients and project context.
+    Streams NDJSON progress: queued, started, stage, then one of completed / failed / skipped
+    per task, and a final batch_completed summary.
+    Each task takes the same single-flight scope as /execute, so they never overlap.
+    """
+    stmt = select(Task.id, Task.project_id, Task.approved)
+    if request.task_ids:
+        if len(request.task_ids) > settings.BATCH_EXECUTION_MAX_TASKS:
+            raise HTTPException(status_code=400, detail=f"At most {settings.BATCH_EXECUTION_MAX_TASKS} tasks per batch")
+        stmt = stmt.where(Task.id.in_(request.task_ids))
+    else:
+        stmt = (
+            stmt.where(
+                Task.project_id == request.project_id,
+                Task.approved.is_(True),
+                Task.github_issue_id.is_(None),
+                Task.status.notin_(("IN_PROGRESS", "COMPLETED")),
+            )
+            .order_by(Task.created_at)
+            .limit(settings.BATCH_EXECUTION_MAX_TASKS)
+        )
+    rows = (await db.execute(stmt)).all()
+
+    # Warm everything the pipelines share before they start racing for it
+    for project_id in {row.project_id for row in rows if row.project_id}:
+        await project_cache.get(db, project_id)
+    get_genai_client()
+    shared_client()
+
+    found = {row.id: row for row in rows}
+    runnable = [row.id for row in rows if row.approved]
+    skipped = {task_id: "Task not found" for task_id in (request.task_ids or []) if task_id not in found}
+    skipped.update({row.id: "Task must be approved first." for row in rows if not row.approved})
+    concurrency = request.concurrency or settings.BATCH_EXECUTION_CONCURRENCY
+
+    logger.info(f"[Execution API] Batch of {len(runnable)} tasks (concurrency={concurrency}, skipped={len(skipped)})")
+    return StreamingResponse(
+        _stream_batch(runnable, skipped, concurrency),
+        media_type="application/x-ndjson",
+    )
+
+
+async def _stream_batch(
+    task_ids: List[UUID], skipped: Dict[UUID, str], concurrency: int
+) -> AsyncIterator[str]:
+    started = time.monotonic()
+    queue: asyncio.Queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    def emit(task_id: UUID, event: str, **fields: Any) -> None:
+        elapsed_ms = round((time.monotonic() - started) * 1000)
+        queue.put_nowait({"task_id": str(task_id), "event": event, "elapsed_ms": elapsed_ms, **fields})
+
+    for task_id, reason in skipped.items():
+        emit(task_id, "skipped", detail=reason)
+    for task_id in task_ids:
+        emit(task_id, "queued")
+        # Workers outlive a dropped client connection; the set keeps them referenced
+        worker = asyncio.create_task(_batch_worker(task_id, semaphore, emit))
+        _batch_workers.add(worker)
+        worker.add_done_callback(_batch_workers.discard)
+
+    counts: Dict[str, int] = {"completed": 0, "failed": 0, "skipped": 0}
+    remaining = len(task_ids) + len(skipped)
+    while remaining:
+        event = await queue.get()
+        if event["event"] in counts:
+            counts[event["event"]] += 1
+            remaining -= 1
+        yield json.dumps(event) + "\n"
+
+    elapsed_ms = round((time.monotonic() - started) * 1000)
+    yield json.dumps({"event": "batch_completed", "elapsed_ms": elapsed_ms, **counts}) + "\n"
+
+
+async def _batch_worker(task_id: UUID, semaphore: asyncio.Semaphore, emit: Callable[..., None]) -> None:
+    """Emits exactly one terminal event (completed / failed / skipped) for the task."""
+    async with semaphore:
+        emit(task_id, "started")
+        try:
+            task = await single_flight(
+                f"pipeline:{task_id}", lambda: _execute_batched(task_id, emit), params={"speculative": False}
+            )
+        except HTTPException as e:
+            emit(task_id, "skipped", detail=e.detail)
+        except Exception as e:
+            logger.error(f"[Execution API] Batch pipeline for {task_id} failed: {e}")
+            emit(task_id, "failed", detail=str(e))
+        else:
+            event = "completed" if task.status == "COMPLETED" else "failed"
+            emit(task_id, event, status=task.status, github_issue_url=task.github_issue_url,
+                 github_pr_url=task.github_pr_url, detail=task.error_message)
+
+
+async def _execute_batched(task_id: UUID, emit: Callable[..., None]) -> TaskResponse:
+    """execute_task for one batch entry: own session, and code generation runs in the slot."""
+    async with AsyncSessionLocal() as db:
+        task = (await db.execute(select(Task).where(Task.id == task_id))).scalar_one_or_none()
+        if not task:
+            raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+        if task.status in ("IN_PROGRESS", "COMPLETED") and not task.github_issue_id:
+            raise HTTPException(status_code=409, detail="Task already executing Phase 1")
+
+        task.status = "IN_PROGRESS"
+        run_registry.clear_abort(task.id)
+        await db.commit()
+
+        context = _build_task_context(task)
+        on_stage = lambda agent_name, success: emit(task_id, "stage", agent=agent_name, success=success)
+        try:
+            if await _run_phase_1(Orchestrator(db, session_factory=AsyncSessionLocal), db, task, context, PHASE_1_AGENTS, on_stage):
+                await background_code_generation(task.id, None, context)
+                await db.refresh(task)
+                emit(task_id, "stage", agent=CodeAgent.name, success=task.status == "COMPLETED")
+        except Exception:
+            task.status = "FAILED"
+            await db.commit()
+            raise
+        return TaskResponse.model_validate(task)
+
+
+@router.post("/{task_id}/resume", response_model=TaskResponse)
+async def resume_task(
+    task_id: UUID,
+    background_tasks: BackgroundTasks,
+    idempotency_key: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Restarts the pipeline from the first stage without a COMPLETED AgentRun.
+    Completed stages are not re-run: their stored output is re-applied to the task and
+    inherited as context, so no LLM calls or GitHub writes are repeated.
+    Shares the execute single-flight scope, so resume and execute never overlap (a resume
+    arriving while an execute runs gets a 409).
+    """
+    return await single_flight(
+        f"pipeline:{task_id}",
+        lambda: _resume_task(task_id, background_tasks, db),
+        idempotency_key,
+        params={"resume": True},
+    )
+
+
+async def _resume_task(task_id: UUID, background_tasks: BackgroundTasks, db: AsyncSession) -> TaskResponse:
+    result = await db.execute(select(Task).where(Task.id == task_id))
+    task = result.scalar_one_or_none()
+    if not task:
+        raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+
+    if not task.approved:
+        raise HTTPException(status_code=400, detail="Task must be approved first.")
+
+    orchestrator = Orchestrator(db, session_factory=AsyncSessionLocal)
+    checkpoint, remaining = await orchestrator.load_checkpoint(task, PIPELINE_AGENTS)
+    if not remaining:
+        raise HTTPException(status_code=409, detail="All pipeline stages already completed")
+
+    # Outputs of completed stages may have been lost with the request that died
+    for agent_cls in PIPELINE_AGENTS[:len(PIPELINE_AGENTS) - len(remaining)]:
+        _apply_stage_output(task, agent_cls.name, checkpoint)
+
+    task.status = "IN_PROGRESS"
+    run_registry.clear_abort(task.id)
+    task.error_message = None
+    await db.commit()
+
+    context = {**_build_task_context(task), **checkpoint}
+    logger.info(f"[Execution API] Resuming task {task_id} at {remaining[0].name}")
+
+    try:
+        phase_1 = [a for a in remaining if a in PHASE_1_AGENTS]
+        if not await _run_phase_1(orchestrator, db, task, context, phase_1):
+            return TaskResponse.model_validate(task)
+
+        background_tasks.add_task(background_code_generation, task.id, None, context)
+        return TaskResponse.model_validate(task)
+
+    except Exception as e:
+        task.status = "FAILED"
+        logger.error(f"[Execution API] resume failed: {e}")
+        await db.commit()
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/{task_id}/code", response_model=TaskResponse)
 async def generate_code(
     task_id: UUID, 
     base_branch: str = None, 
     target_branch: str = None, 
+    idempotency_key: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Explicit execution trigger for Phase 2: Code Generation.
     Triggers CodeAgent to read instructions, generate code, create a branch, and open a PR.
+    A duplicate for other branches while one runs gets a 409.
     """
+    return await single_flight(
+        f"code:{task_id}",
+        lambda: _generate_code(task_id, base_branch, target_branch, db),
+        idempotency_key,
+        params={"base_branch": base_branch, "target_branch": target_branch},
+    )
+
+
+async def _generate_code(task_id: UUID, base_branch: str, target_branch: str, db: AsyncSession) -> TaskResponse:
     result = await db.execute(select(Task).where(Task.id == task_id))
     task = result.scalar_one_or_none()
     
@@ -172,9 +489,10 @@ async def generate_code(
         )
 
     task.status = "IN_PROGRESS"
+    run_registry.clear_abort(task.id)
     await db.flush()
 
-    orchestrator = Orchestrator(db)
+    orchestrator = Orchestrator(db, session_factory=AsyncSessionLocal)
     context = {
         "task_id": str(task.id),
         "title": task.title,
@@ -211,11 +529,19 @@ async def generate_code(
     return TaskResponse.model_validate(task)
 
 @router.post("/{task_id}/review", response_model=TaskResponse)
-async def review_pr(task_id: UUID, db: AsyncSession = Depends(get_db)):
+async def review_pr(
+    task_id: UUID,
+    idempotency_key: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
     """
     Explicit execution trigger for Phase 2.5: PR Review.
     Triggers PRAgent to analyze the PR diff, post comments, and resolve any generated errors.
     """
+    return await single_flight(f"review:{task_id}", lambda: _review_pr(task_id, db), idempotency_key)
+
+
+async def _review_pr(task_id: UUID, db: AsyncSession) -> TaskResponse:
     result = await db.execute(select(Task).where(Task.id == task_id))
     task = result.scalar_one_or_none()
     
@@ -229,9 +555,10 @@ async def review_pr(task_id: UUID, db: AsyncSession = Depends(get_db)):
         )
 
     task.status = "IN_PROGRESS"
+    run_registry.clear_abort(task.id)
     await db.flush()
 
-    orchestrator = Orchestrator(db)
+    orchestrator = Orchestrator(db, session_factory=AsyncSessionLocal)
     context = {
         "task_id": str(task.id),
         "title": task.title,
@@ -265,6 +592,7 @@ async def review_pr(task_id: UUID, db: AsyncSession = Depends(get_db)):
 async def fix_sonar_issue(
     project_id: UUID,
     issue: Dict[str, Any],
+    idempotency_key: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -272,7 +600,15 @@ async def fix_sonar_issue(
     1. Creates a temporary task for tracking.
     2. Runs SonarAgent to apply the fix.
     """
-    project = await db.get(Project, project_id)
+    return await single_flight(
+        f"sonar-fix:{project_id}:{issue.get('key') or digest(issue)}",
+        lambda: _fix_sonar_issue(project_id, issue, db),
+        idempotency_key,
+    )
+
+
+async def _fix_sonar_issue(project_id: UUID, issue: Dict[str, Any], db: AsyncSession) -> Dict[str, Any]:
+    project = await project_cache.get(db, project_id)
     if not project:
         raise HTTPException(status_code=404, detail=PROJECT_NOT_FOUND)
 
@@ -289,7 +625,7 @@ async def fix_sonar_issue(
     await db.flush()
 
     # 2. Run SonarAgent
-    orchestrator = Orchestrator(db)
+    orchestrator = Orchestrator(db, session_factory=AsyncSessionLocal)
     context = {
         "task_id": str(task.id),
         "sonar_issue": issue,
@@ -327,7 +663,7 @@ async def manual_pr_review(
     """
     Trigger AI review for an EXISTING Pull Request.
     """
-    project = await db.get(Project, project_id)
+    project = await project_cache.get(db, project_id)
     if not project:
         raise HTTPException(status_code=404, detail=PROJECT_NOT_FOUND)
     
@@ -354,7 +690,7 @@ async def manual_pr_review(
     db.add(task)
     await db.flush()
     
-    orchestrator = Orchestrator(db)
+    orchestrator = Orchestrator(db, session_factory=AsyncSessionLocal)
     context = {
         "task_id": str(task.id),
         "title": task.title,
@@ -386,12 +722,22 @@ async def manual_pr_review(
 async def sonar_sweep(
     project_id: UUID,
     issues: List[Dict[str, Any]],
+    idempotency_key: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Triggers a batch fix for ALL provided Sonar issues.
     """
-    project = await db.get(Project, project_id)
+    issue_keys = sorted(i.get("key") or digest(i) for i in issues)
+    return await single_flight(
+        f"sonar-sweep:{project_id}:{digest(issue_keys)}",
+        lambda: _sonar_sweep(project_id, issues, db),
+        idempotency_key,
+    )
+
+
+async def _sonar_sweep(project_id: UUID, issues: List[Dict[str, Any]], db: AsyncSession) -> Dict[str, Any]:
+    project = await project_cache.get(db, project_id)
     if not project:
         raise HTTPException(status_code=404, detail=PROJECT_NOT_FOUND)
 
@@ -407,7 +753,7 @@ async def sonar_sweep(
     db.add(task)
     await db.flush()
 
-    orchestrator = Orchestrator(db)
+    orchestrator = Orchestrator(db, session_factory=AsyncSessionLocal)
     context = {
         "task_id": str(task.id),
         "sonar_issues": issues,
@@ -1,14 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import List
+from typing import Optional
 from uuid import UUID
 
-from backend.db.database import get_db
+from backend.config import get_settings
+from backend.db.database import get_db, get_read_db
 from backend.db.models import Project
 from backend.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse
+from backend.schemas.pagination import Page
+from backend.core.pagination import paginate
+from backend.core.project_cache import project_cache, publish_project_change
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
+settings = get_settings()
 
 PROJECT_NOT_FOUND_MSG = "Project not found"
 
@@ -21,14 +26,18 @@ async def create_project(req: ProjectCreate, db: AsyncSession = Depends(get_db))
     return project
 
 
-@router.get("", response_model=List[ProjectResponse])
-async def list_projects(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Project).order_by(Project.created_at.desc()))
-    return result.scalars().all()
+@router.get("", response_model=Page[ProjectResponse])
+async def list_projects(
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    db: AsyncSession = Depends(get_read_db),
+):
+    projects, next_cursor = await paginate(db, select(Project), Project.created_at, Project.id, cursor, limit)
+    return Page(items=[ProjectResponse.model_validate(p) for p in projects], next_cursor=next_cursor)
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
-async def get_project(project_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_project(project_id: UUID, db: AsyncSession = Depends(get_read_db)):
     project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail=PROJECT_NOT_FOUND_MSG)
@@ -45,7 +54,9 @@ async def update_project(project_id: UUID, req: ProjectUpdate, db: AsyncSession
     for key, value in update_data.items():
         setattr(project, key, value)
     
+    await publish_project_change(db, project_id)
     await db.commit()
+    project_cache.invalidate(project_id)
     await db.refresh(project)
     return project
 
@@ -56,12 +67,14 @@ async def delete_project(project_id: UUID, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=404, detail=PROJECT_NOT_FOUND_MSG)
     
     await db.delete(project)
+    await publish_project_change(db, project_id)
     await db.commit()
+    project_cache.invalidate(project_id)
     return None
 from backend.services.sonar_service import SonarService
 
 @router.get("/{project_id}/sonar/issues")
-async def get_sonar_issues(project_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_sonar_issues(project_id: UUID, db: AsyncSession = Depends(get_read_db)):
     project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail=PROJECT_NOT_FOUND_MSG)
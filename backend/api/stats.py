@@ -0,0 +1,76 @@
+"""
+Stats API — GET /api/stats
+Dashboard counters read from the incrementally maintained aggregate tables
+(backend.core.dashboard_stats): cost depends on the day window, not on history size.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from backend.db.database import get_read_db
+from backend.db.models import AgentRunDailyStats, TaskStatusCount
+from backend.schemas.stats import AgentStats, DailyRunStats, DashboardStats, ProjectFailures
+from backend.core.dashboard_stats import NO_PROJECT
+
+router = APIRouter(prefix="/api/stats", tags=["Stats"])
+
+FAILED_RUN_STATUSES = ("FAILED", "TIMED_OUT")
+
+
+@router.get("", response_model=DashboardStats)
+async def get_stats(
+    project_id: Optional[UUID] = Query(None, description="Only this project's tasks and runs"),
+    days: int = Query(30, ge=1, le=366, description="Count runs started in the last N days"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Task counts per status, plus run counts, failures and token spend over the last `days` days."""
+    since = datetime.utcnow().date() - timedelta(days=days - 1)  # run days are UTC (started_at)
+
+    task_query = select(TaskStatusCount.status, TaskStatusCount.count).where(TaskStatusCount.count != 0)
+    run_query = select(AgentRunDailyStats).where(AgentRunDailyStats.day >= since)
+    if project_id:
+        task_query = task_query.where(TaskStatusCount.project_id == project_id)
+        run_query = run_query.where(AgentRunDailyStats.project_id == project_id)
+
+    tasks_by_status: Dict[str, int] = defaultdict(int)
+    for status, count in await db.execute(task_query):
+        tasks_by_status[status] += count
+
+    runs_by_status: Dict[str, int] = defaultdict(int)
+    agents: Dict[str, AgentStats] = {}
+    failures: Dict[UUID, int] = defaultdict(int)
+    daily: Dict[date, DailyRunStats] = {}
+    for row in (await db.execute(run_query)).scalars():
+        runs_by_status[row.status] += row.runs
+        agent = agents.setdefault(row.agent_name, AgentStats())
+        if row.runs:
+            agent.runs_by_status[row.status] = agent.runs_by_status.get(row.status, 0) + row.runs
+        agent.prompt_tokens += row.prompt_tokens
+        agent.completion_tokens += row.completion_tokens
+        day = daily.setdefault(row.day, DailyRunStats(day=row.day))
+        day.runs += row.runs
+        day.prompt_tokens += row.prompt_tokens
+        day.completion_tokens += row.completion_tokens
+        if row.status in FAILED_RUN_STATUSES:
+            failures[row.project_id] += row.runs
+            day.failed_runs += row.runs
+
+    return DashboardStats(
+        since=since,
+        tasks_by_status={status: count for status, count in tasks_by_status.items() if count},
+        runs_by_status={status: count for status, count in runs_by_status.items() if count},
+        agents=agents,
+        failures_by_project=[
+            ProjectFailures(project_id=None if pid == NO_PROJECT else pid, failed_runs=count)
+            for pid, count in sorted(failures.items(), key=lambda item: -item[1])
+            if count
+        ],
+        prompt_tokens=sum(agent.prompt_tokens for agent in agents.values()),
+        completion_tokens=sum(agent.completion_tokens for agent in agents.values()),
+        daily=[daily[day] for day in sorted(daily)],
+    )
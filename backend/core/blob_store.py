@@ -0,0 +1,121 @@
+"""
+Out-of-line storage for large AgentRun context values.
+
+externalize() swaps every top-level value whose JSON encoding exceeds BLOB_MIN_BYTES for
+a {"$blob": "<sha256>"} reference and stores the value once in context_blobs.
+hydrate() does the reverse for API responses and checkpoint loading. Blobs are
+immutable, so decoded values are cached in-process.
+"""
+import hashlib
+import json
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.config import get_settings
+from backend.core import tracing
+from backend.db.models import ContextBlob
+
+settings = get_settings()
+
+BLOB_REF_KEY = "$blob"
+_CACHE_SIZE = 1024
+
+_decoded: "OrderedDict[str, Any]" = OrderedDict()
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _ref_hash(value: Any) -> Optional[str]:
+    if isinstance(value, dict) and len(value) == 1 and BLOB_REF_KEY in value:
+        return value[BLOB_REF_KEY]
+    return None
+
+
+def _remember(digest: str, value: Any) -> None:
+    _decoded[digest] = value
+    _decoded.move_to_end(digest)
+    while len(_decoded) > _CACHE_SIZE:
+        _decoded.popitem(last=False)
+
+
+async def externalize(db: AsyncSession, context: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Returns a copy of context with large values replaced by blob refs, storing new blobs."""
+    if not context:
+        return context
+
+    out: Dict[str, Any] = {}
+    pending: Dict[str, bytes] = {}
+    for key, value in context.items():
+        raw = _encode(value)
+        if len(raw) < settings.BLOB_MIN_BYTES:
+            out[key] = value
+            continue
+        digest = hashlib.sha256(raw).hexdigest()
+        pending[digest] = raw
+        out[key] = {BLOB_REF_KEY: digest}
+
+    if not pending:
+        return out
+
+    with tracing.span("blob_store.externalize", category="db", blobs=len(pending)):
+        # Only ship the payloads the table doesn't have yet
+        existing = await db.execute(select(ContextBlob.hash).where(ContextBlob.hash.in_(pending)))
+        for digest in existing.scalars():
+            pending.pop(digest, None)
+        if pending:
+            stmt = insert(ContextBlob).values([
+                {"hash": digest, "data": zlib.compress(raw), "size_bytes": len(raw)}
+                for digest, raw in pending.items()
+            ]).on_conflict_do_nothing(index_elements=[ContextBlob.hash])
+            await db.execute(stmt)
+    return out
+
+
+async def load_blobs(db: AsyncSession, hashes: Iterable[str]) -> Dict[str, Any]:
+    wanted = set(hashes)
+    found = {h: _decoded[h] for h in wanted if h in _decoded}
+    missing = wanted - found.keys()
+    if missing:
+        with tracing.span("blob_store.load_blobs", category="db", blobs=len(missing)):
+            result = await db.execute(select(ContextBlob.hash, ContextBlob.data).where(ContextBlob.hash.in_(missing)))
+        for digest, data in result.all():
+            value = json.loads(zlib.decompress(data))
+            _remember(digest, value)
+            found[digest] = value
+    return found
+
+
+def _resolve(context: Optional[Dict[str, Any]], blobs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if not isinstance(context, dict):
+        return context
+    return {
+        key: blobs.get(_ref_hash(value), value) if _ref_hash(value) else value
+        for key, value in context.items()
+    }
+
+
+async def hydrate(db: AsyncSession, contexts: List[Optional[Dict[str, Any]]]) -> List[Optional[Dict[str, Any]]]:
+    """Resolves blob refs in a batch of contexts with a single lookup. Returns new dicts."""
+    hashes = {
+        _ref_hash(value)
+        for context in contexts if isinstance(context, dict)
+        for value in context.values() if _ref_hash(value)
+    }
+    blobs = await load_blobs(db, hashes) if hashes else {}
+    return [_resolve(context, blobs) for context in contexts]
+
+
+async def hydrate_runs(db: AsyncSession, responses: list) -> list:
+    """Hydrates input_context / output on AgentRunResponse models in place."""
+    contexts = await hydrate(db, [r.input_context for r in responses] + [r.output for r in responses])
+    for i, response in enumerate(responses):
+        response.input_context = contexts[i]
+        response.output = contexts[len(responses) + i]
+    return responses
@@ -0,0 +1,235 @@
+"""
+Dashboard aggregates — task status counts per project and agent run counts / token
+spend per day, kept current by the state transitions themselves so GET /api/stats
+reads a handful of rows however much history there is.
+
+Deltas are collected on the session (task transitions by a flush listener, run
+transitions explicitly by the orchestrator and the abort endpoint) and written as one
+upsert per table just before the session commits. They commit or roll back with the
+rows they count, and the shared counter rows are locked only for the commit itself.
+
+ORM changes to tasks and ORM deletes of runs (e.g. cascaded from a task) are picked
+up by the listeners; Core writes to tasks must report their own deltas (add_tasks).
+Sessions that touch neither tasks nor runs skip the listeners' work entirely.
+"""
+import uuid
+from datetime import date
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, func, inspect, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import NO_VALUE
+
+from backend.core.logging import get_logger
+from backend.db.models import (
+    AgentRun, AgentRunDailyStats, AgentRunStep, ExtractionRun, Task, TaskStatusCount,
+)
+
+logger = get_logger(__name__)
+
+# Stands in for "no project" in the aggregate keys (primary key columns can't be NULL)
+NO_PROJECT = uuid.UUID(int=0)
+
+_TASK_DELTAS = "dashboard_task_deltas"
+_RUN_DELTAS = "dashboard_run_deltas"
+
+# Statuses whose runs have not had their tokens counted yet
+_OPEN_STATUSES = ("PENDING", "RUNNING")
+
+
+def add_tasks(session: Any, project_id: Optional[uuid.UUID], status: str, count: int = 1) -> None:
+    """Counts count tasks (negative to uncount) under project / status at the next commit."""
+    if isinstance(session, AsyncSession):
+        session = session.sync_session
+    deltas: Dict[Tuple[uuid.UUID, str], int] = session.info.setdefault(_TASK_DELTAS, {})
+    key = (project_id or NO_PROJECT, status)
+    deltas[key] = deltas.get(key, 0) + count
+
+
+def run_transition(
+    session: Any,
+    project_id: Optional[uuid.UUID],
+    agent_name: str,
+    day: date,
+    old_status: Optional[str],
+    new_status: str,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+) -> None:
+    """Moves one run from old_status (None for a new run) to new_status, adding its tokens."""
+    if isinstance(session, AsyncSession):
+        session = session.sync_session
+    deltas: Dict[Tuple[Any, ...], list] = session.info.setdefault(_RUN_DELTAS, {})
+    project_id = project_id or NO_PROJECT
+    if old_status is not None:
+        deltas.setdefault((day, project_id, agent_name, old_status), [0, 0, 0])[0] -= 1
+    entry = deltas.setdefault((day, project_id, agent_name, new_status), [0, 0, 0])
+    entry[0] += 1
+    entry[1] += prompt_tokens
+    entry[2] += completion_tokens
+
+
+async def run_tokens(
+    db: AsyncSession, run_ids: Iterable[uuid.UUID], since: date
+) -> Dict[uuid.UUID, Tuple[int, int]]:
+    """(prompt, completion) tokens per run, summed over its steps (created on or after since)."""
+    run_ids = list(run_ids)
+    if not run_ids:
+        return {}
+    rows = await db.execute(
+        select(
+            AgentRunStep.agent_run_id,
+            func.coalesce(func.sum(AgentRunStep.prompt_tokens), 0),
+            func.coalesce(func.sum(AgentRunStep.completion_tokens), 0),
+        )
+        .where(AgentRunStep.agent_run_id.in_(run_ids), AgentRunStep.created_at >= since)
+        .group_by(AgentRunStep.agent_run_id)
+    )
+    return {run_id: (int(prompt), int(completion)) for run_id, prompt, completion in rows}
+
+
+def _previous(session: Session, obj: Task) -> Tuple[Any, Any]:
+    """(project_id, status) as stored, before the task's pending changes."""
+    state = inspect(obj)
+    values = [
+        state.committed_state[attr] if attr in state.committed_state else state.dict.get(attr, NO_VALUE)
+        for attr in ("project_id", "status")
+    ]
+    if NO_VALUE in values:
+        # Never loaded on this instance (e.g. left unset when the task was created); not flushed yet
+        row = session.connection().execute(
+            select(Task.project_id, Task.status).where(Task.id == obj.id)
+        ).one()
+        values = [row[i] if value is NO_VALUE else value for i, value in enumerate(values)]
+    return values[0], values[1]
+
+
+def _uncount_runs(session: Session, runs: List[AgentRun]) -> None:
+    """Takes deleted runs, with the tokens counted for them, out of the daily stats."""
+    tokens = (
+        select(
+            AgentRunStep.agent_run_id,
+            func.sum(AgentRunStep.prompt_tokens).label("prompt_tokens"),
+            func.sum(AgentRunStep.completion_tokens).label("completion_tokens"),
+        )
+        .where(
+            AgentRunStep.agent_run_id.in_([run.id for run in runs]),
+            AgentRunStep.created_at >= min(run.started_at for run in runs).date(),
+        )
+        .group_by(AgentRunStep.agent_run_id)
+        .subquery()
+    )
+    # As stored: the counters hold what was committed, whatever is pending on the instances
+    rows = session.connection().execute(
+        select(
+            AgentRun.started_at, AgentRun.agent_name, AgentRun.status,
+            func.coalesce(Task.project_id, ExtractionRun.project_id),
+            func.coalesce(tokens.c.prompt_tokens, 0), func.coalesce(tokens.c.completion_tokens, 0),
+        )
+        .outerjoin(Task, Task.id == AgentRun.task_id)
+        .outerjoin(ExtractionRun, ExtractionRun.id == AgentRun.extraction_run_id)
+        .outerjoin(tokens, tokens.c.agent_run_id == AgentRun.id)
+        .where(tuple_(AgentRun.id, AgentRun.started_at).in_([(run.id, run.started_at) for run in runs]))
+    )
+    deltas: Dict[Tuple[Any, ...], list] = session.info.setdefault(_RUN_DELTAS, {})
+    for started_at, agent_name, status, project_id, prompt_tokens, completion_tokens in rows:
+        entry = deltas.setdefault((started_at.date(), project_id or NO_PROJECT, agent_name, status), [0, 0, 0])
+        entry[0] -= 1
+        if status not in _OPEN_STATUSES:
+            entry[1] -= prompt_tokens
+            entry[2] -= completion_tokens
+
+
+def _touches_counted_rows(session: Session) -> bool:
+    return any(
+        isinstance(obj, (Task, AgentRun)) for obj in chain(session.new, session.deleted, session.dirty)
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_task_changes(session: Session, flush_context, instances) -> None:
+    if not _touches_counted_rows(session):
+        return
+    for obj in session.dirty:
+        if not isinstance(obj, Task):
+            continue
+        state = inspect(obj)
+        if "project_id" not in state.committed_state and "status" not in state.committed_state:
+            continue  # neither was set since the last flush
+        old_project, old_status = _previous(session, obj)
+        new_project, new_status = state.dict.get("project_id", old_project), state.dict.get("status", old_status)
+        if (old_project, old_status) != (new_project, new_status):
+            add_tasks(session, old_project, old_status, -1)
+            add_tasks(session, new_project, new_status)
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            add_tasks(session, *_previous(session, obj), -1)
+    runs = [obj for obj in session.deleted if isinstance(obj, AgentRun)]
+    if runs:
+        _uncount_runs(session, runs)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_new_tasks(session: Session, flush_context) -> None:
+    # After the INSERT, so column defaults (status) are on the instance; unset columns are NULL
+    for obj in session.new:
+        if isinstance(obj, Task):
+            add_tasks(session, obj.__dict__.get("project_id"), obj.status)
+
+
+@event.listens_for(Session, "before_commit")
+def _apply_deltas(session: Session) -> None:
+    if not (session.info.get(_TASK_DELTAS) or session.info.get(_RUN_DELTAS) or _touches_counted_rows(session)):
+        return
+    # Flush first so changes made since the last flush are collected too
+    session.flush()
+    task_deltas = session.info.pop(_TASK_DELTAS, None) or {}
+    run_deltas = session.info.pop(_RUN_DELTAS, None) or {}
+
+    # Sorted keys: concurrent commits lock shared counter rows in the same order
+    task_rows = [
+        {"project_id": project_id, "status": status, "count": count}
+        for (project_id, status), count in sorted(task_deltas.items())
+        if count
+    ]
+    run_rows = [
+        {
+            "day": day, "project_id": project_id, "agent_name": agent_name, "status": status,
+            "runs": runs, "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+        }
+        for (day, project_id, agent_name, status), (runs, prompt_tokens, completion_tokens) in sorted(run_deltas.items())
+        if runs or prompt_tokens or completion_tokens
+    ]
+    if not (task_rows or run_rows):
+        return
+
+    connection = session.connection()
+    if task_rows:
+        stmt = insert(TaskStatusCount).values(task_rows)
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=[TaskStatusCount.project_id, TaskStatusCount.status],
+            set_={"count": TaskStatusCount.count + stmt.excluded["count"]},
+        ))
+    if run_rows:
+        stmt = insert(AgentRunDailyStats).values(run_rows)
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=[
+                AgentRunDailyStats.day, AgentRunDailyStats.project_id,
+                AgentRunDailyStats.agent_name, AgentRunDailyStats.status,
+            ],
+            set_={
+                column: getattr(AgentRunDailyStats, column) + stmt.excluded[column]
+                for column in ("runs", "prompt_tokens", "completion_tokens")
+            },
+        ))
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_deltas(session: Session, transaction) -> None:
+    # Deltas of a rolled-back (or otherwise ended) transaction must not leak into the next
+    if transaction.parent is None:
+        session.info.pop(_TASK_DELTAS, None)
+        session.info.pop(_RUN_DELTAS, None)
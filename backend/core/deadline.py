@@ -0,0 +1,44 @@
+"""
+Deadline propagation for pipelines and agent runs.
+
+A pipeline opens a total budget; each Orchestrator.run_agent opens a slice of what is
+left; LLM, GitHub and SMTP calls read remaining() from the context and use it as their
+timeout. Budgets only ever shrink — a nested budget can't outlive its parent.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+@contextmanager
+def budget(seconds: float) -> Iterator[float]:
+    """Opens a time budget for the enclosed work. Yields the effective seconds available."""
+    parent = _deadline.get()
+    deadline = time.monotonic() + seconds
+    if parent is not None:
+        deadline = min(deadline, parent)
+    token = _deadline.set(deadline)
+    try:
+        yield max(deadline - time.monotonic(), 0.0)
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current budget, or None when no budget is open."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0.0)
+
+
+def timeout_for(cap: float) -> float:
+    """Per-call timeout for clients with their own cap (httpx, smtplib): min(cap, remaining)."""
+    left = remaining()
+    if left is None:
+        return cap
+    # A zero timeout means "no timeout" to some clients; fail fast instead
+    return max(min(cap, left), 0.001)
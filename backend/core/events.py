@@ -0,0 +1,149 @@
+"""
+Cross-replica events over Postgres LISTEN/NOTIFY.
+
+In-process caches and registries subscribe to a channel at import time; any replica
+publishes inside its own transaction, so the event is only delivered once it commits.
+
+A supervisor task health-checks the listener connection and reconnects with backoff when
+it is lost. Events published while it was down are gone, so subscribers register a
+resync hook (on_reconnect) that catches up from the database after a reconnect.
+"""
+import asyncio
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.config import get_settings
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+RECONNECT_MIN_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 30.0
+HEALTH_CHECK_SECONDS = 30.0
+HEALTH_CHECK_TIMEOUT_SECONDS = 10.0
+
+_handlers: Dict[str, List[Callable[[str], None]]] = defaultdict(list)
+_resync_hooks: List[Callable[[], Awaitable[None]]] = []
+_connection: Optional[asyncpg.Connection] = None
+_supervisor: Optional[asyncio.Task] = None
+_lost = asyncio.Event()
+
+
+def subscribe(channel: str, handler: Callable[[str], None]) -> None:
+    """Registers a handler for a channel. Must be called before start_listener()."""
+    _handlers[channel].append(handler)
+
+
+def on_reconnect(hook: Callable[[], Awaitable[None]]) -> None:
+    """Registers a coroutine run after the listener reconnects, to catch up on missed events."""
+    _resync_hooks.append(hook)
+
+
+async def publish(db: AsyncSession, channel: str, payload: str) -> None:
+    """Queues a NOTIFY on the caller's transaction — delivered to every replica on commit."""
+    if db.bind.dialect.name != "postgresql":
+        return
+    await db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": channel, "payload": payload})
+
+
+def _dispatch(connection, pid, channel: str, payload: str) -> None:
+    for handler in _handlers.get(channel, []):
+        try:
+            handler(payload)
+        except Exception as e:
+            logger.error(f"[Events] Handler for {channel!r} failed: {e}")
+
+
+def _on_terminated(connection) -> None:
+    logger.warning("[Events] Listener connection lost; reconnecting")
+    _lost.set()
+
+
+def _dsn() -> str:
+    return settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+async def _connect() -> None:
+    """Opens the listener connection and LISTENs on every subscribed channel."""
+    global _connection
+    connection = await asyncpg.connect(_dsn())
+    try:
+        for channel in _handlers:
+            await connection.add_listener(channel, _dispatch)
+    except Exception:
+        await connection.close()
+        raise
+    connection.add_termination_listener(_on_terminated)
+    _connection = connection
+
+
+async def _resync() -> None:
+    for hook in _resync_hooks:
+        try:
+            await hook()
+        except Exception as e:
+            logger.error(f"[Events] Resync hook {hook.__qualname__} failed: {e}")
+
+
+async def _supervise() -> None:
+    """Keeps the listener connected: health checks it, reconnects with backoff, then resyncs."""
+    delay = RECONNECT_MIN_SECONDS
+    while True:
+        if _connection is None or _connection.is_closed():
+            try:
+                await _connect()
+            except Exception as e:
+                logger.warning(f"[Events] Listener reconnect failed, retrying in {delay:.0f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+                continue
+            delay = RECONNECT_MIN_SECONDS
+            logger.info(f"[Events] Listener reconnected on {sorted(_handlers)}")
+            await _resync()
+
+        _lost.clear()
+        try:
+            await asyncio.wait_for(_lost.wait(), HEALTH_CHECK_SECONDS)
+        except TimeoutError:
+            # A silently dropped TCP connection never reports termination; a query notices
+            try:
+                await asyncio.wait_for(_connection.execute("SELECT 1"), HEALTH_CHECK_TIMEOUT_SECONDS)
+            except Exception as e:
+                logger.warning(f"[Events] Listener health check failed; reconnecting: {e!r}")
+                _connection.terminate()
+
+
+async def start_listener() -> None:
+    """Opens a dedicated connection, LISTENs on every subscribed channel and keeps it up."""
+    global _supervisor
+    if not settings.DATABASE_URL.startswith("postgresql"):
+        logger.info("[Events] Non-Postgres database, cross-replica events disabled")
+        return
+
+    try:
+        await _connect()
+        logger.info(f"[Events] Listening on {sorted(_handlers)}")
+    except Exception as e:
+        logger.warning(f"[Events] Could not start listener, retrying in the background: {e}")
+    _supervisor = asyncio.create_task(_supervise())
+
+
+async def stop_listener() -> None:
+    global _connection, _supervisor
+    if _supervisor is not None:
+        _supervisor.cancel()
+        try:
+            await _supervisor
+        except asyncio.CancelledError:
+            pass
+        _supervisor = None
+    if _connection is not None:
+        _connection.remove_termination_listener(_on_terminated)
+        if not _connection.is_closed():
+            await _connection.close()
+        _connection = None
@@ -0,0 +1,195 @@
+"""
+Idempotency keys and single-flight execution for the execution endpoints.
+
+A unit of work is identified by a scope (e.g. "pipeline:<task_id>"):
+  - Concurrent duplicates in this process await the same future and get the same result,
+    provided they carry the same params (e.g. the branches of a code run); a duplicate
+    with other params gets a 409 rather than a result it didn't ask for.
+  - Across replicas, an IN_FLIGHT row with the scope as primary key is the lock. A duplicate
+    that carries an Idempotency-Key waits (up to IDEMPOTENCY_WAIT_SECONDS) for the lock to
+    go: it replays the cached response if one was stored under its key, and otherwise
+    claims the scope and runs itself. One without a key gets a 409.
+  - When the client sends an Idempotency-Key, the response is cached and replayed
+    to retries for IDEMPOTENCY_TTL_HOURS.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from backend.config import get_settings
+from backend.core.logging import get_logger
+from backend.db.database import AsyncSessionLocal
+from backend.db.models import IdempotencyRecord
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# scope -> (params digest, future of the running request)
+_inflight: Dict[str, Tuple[str, asyncio.Future]] = {}
+
+POLL_INTERVAL_SECONDS = 1.0
+
+
+def digest(value: Any) -> str:
+    """Stable short hash of a JSON-serialisable request payload, for building scopes."""
+    raw = json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+def _response_key(scope: str, params: str, idempotency_key: str) -> str:
+    return f"idem:{scope}:{params}:{idempotency_key}"
+
+
+async def _load_response(key: str) -> Optional[Any]:
+    cutoff = datetime.utcnow() - timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS)
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(IdempotencyRecord.response).where(
+                IdempotencyRecord.key == key,
+                IdempotencyRecord.status == "COMPLETED",
+                IdempotencyRecord.created_at > cutoff,
+            )
+        )
+        row = result.one_or_none()
+    return row.response if row else None
+
+
+async def _claim(scope: str) -> bool:
+    """Atomically inserts the IN_FLIGHT row; takes over rows left behind by a dead worker."""
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=settings.IDEMPOTENCY_INFLIGHT_TIMEOUT_SECONDS)
+    stmt = (
+        insert(IdempotencyRecord)
+        .values(key=scope, status="IN_FLIGHT", created_at=now)
+        .on_conflict_do_update(
+            index_elements=[IdempotencyRecord.key],
+            set_={"created_at": now},
+            where=IdempotencyRecord.created_at < stale_before,
+        )
+        .returning(IdempotencyRecord.key)
+    )
+    async with AsyncSessionLocal() as db:
+        claimed = (await db.execute(stmt)).scalar_one_or_none() is not None
+        await db.commit()
+    return claimed
+
+
+async def _release(scope: str, params: str, idempotency_key: Optional[str], response: Any) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(IdempotencyRecord).where(IdempotencyRecord.key == scope))
+        if idempotency_key and response is not None:
+            now = datetime.utcnow()
+            stmt = insert(IdempotencyRecord).values(
+                key=_response_key(scope, params, idempotency_key),
+                status="COMPLETED",
+                response=response,
+                created_at=now,
+                completed_at=now,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[IdempotencyRecord.key],
+                set_={"response": stmt.excluded.response, "completed_at": now},
+            )
+            await db.execute(stmt)
+        await db.commit()
+
+
+async def _is_in_flight(scope: str) -> bool:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(IdempotencyRecord.key).where(
+                IdempotencyRecord.key == scope, IdempotencyRecord.status == "IN_FLIGHT"
+            )
+        )
+        return result.one_or_none() is not None
+
+
+async def _wait_for_remote(scope: str, params: str, idempotency_key: Optional[str]) -> Tuple[Any, bool]:
+    """
+    Waits for another worker's run of scope to finish. Returns (cached response, False), or
+    (None, True) once this worker has claimed the scope because no response was stored
+    under its key and params (the other request had no key, another key or other params,
+    or it failed).
+    """
+    if not idempotency_key:
+        raise HTTPException(status_code=409, detail=f"Execution already in progress ({scope})")
+
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        if await _is_in_flight(scope):
+            continue
+        # _release drops the lock and stores the response in one commit, so a response
+        # is visible by the time the lock is gone
+        cached = await _load_response(_response_key(scope, params, idempotency_key))
+        if cached is not None:
+            return cached, False
+        if await _claim(scope):
+            return None, True
+    raise HTTPException(status_code=409, detail=f"Execution already in progress ({scope})")
+
+
+async def single_flight(
+    scope: str,
+    fn: Callable[[], Awaitable[Any]],
+    idempotency_key: Optional[str] = None,
+    params: Any = None,
+) -> Any:
+    """
+    Runs fn at most once per scope at a time and replays cached responses for retries.
+    params are the request parameters fn depends on beyond the scope; only duplicates with
+    equal params share a result.
+    """
+    params = digest(params)
+    if idempotency_key:
+        cached = await _load_response(_response_key(scope, params, idempotency_key))
+        if cached is not None:
+            logger.info(f"[Idempotency] Replaying cached response for {scope}")
+            return cached
+
+    if scope in _inflight:
+        running_params, running = _inflight[scope]
+        if running_params != params:
+            raise HTTPException(
+                status_code=409, detail=f"Execution already in progress with other parameters ({scope})"
+            )
+        logger.info(f"[Idempotency] Coalescing duplicate request onto in-flight {scope}")
+        return await asyncio.shield(running)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[scope] = (params, future)
+    try:
+        if not await _claim(scope):
+            logger.info(f"[Idempotency] {scope} is in flight on another worker")
+            cached, claimed = await _wait_for_remote(scope, params, idempotency_key)
+            if not claimed:
+                future.set_result(cached)
+                return cached
+            logger.info(f"[Idempotency] {scope} finished elsewhere without a response for this key; running")
+
+        response = None
+        try:
+            result = await fn()
+            response = jsonable_encoder(result)
+        finally:
+            await _release(scope, params, idempotency_key, response)
+        future.set_result(response)
+        return result
+    except BaseException as exc:
+        if not future.done():
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exc)
+                future.exception()  # waiters re-raise it; don't warn when there are none
+        raise
+    finally:
+        _inflight.pop(scope, None)
@@ -0,0 +1,89 @@
+"""
+Minimal in-process metrics — histograms, counters and gauges with labels, exposed as
+JSON on GET /metrics. No external dependency; each replica reports its own numbers.
+Gauges are callbacks read at snapshot time (e.g. connection pool occupancy).
+"""
+import bisect
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    def __init__(self, name: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counts: Dict[LabelKey, List[int]] = defaultdict(lambda: [0] * (len(self.buckets) + 1))
+        self._sums: Dict[LabelKey, float] = defaultdict(float)
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._counts[key][bisect.bisect_left(self.buckets, value)] += 1
+            self._sums[key] += value
+
+    def snapshot(self) -> list:
+        with self._lock:
+            series = []
+            for key, counts in self._counts.items():
+                cumulative, running = {}, 0
+                for bound, count in zip([*self.buckets, "+Inf"], counts):
+                    running += count
+                    cumulative[str(bound)] = running
+                series.append({"labels": dict(key), "buckets": cumulative, "count": running, "sum": self._sums[key]})
+            return series
+
+
+class Counter:
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._values: Dict[LabelKey, float] = defaultdict(float)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] += amount
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [{"labels": dict(key), "value": value} for key, value in self._values.items()]
+
+
+_histograms: Dict[str, Histogram] = {}
+_counters: Dict[str, Counter] = {}
+# name -> callback returning [{"labels": {...}, "value": ...}, ...]
+_gauges: Dict[str, Callable[[], List[Dict[str, Any]]]] = {}
+
+
+def histogram(name: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    if name not in _histograms:
+        _histograms[name] = Histogram(name, buckets)
+    return _histograms[name]
+
+
+def counter(name: str) -> Counter:
+    if name not in _counters:
+        _counters[name] = Counter(name)
+    return _counters[name]
+
+
+def gauge(name: str, callback: Callable[[], List[Dict[str, Any]]]) -> None:
+    """Registers a gauge whose series are produced by callback on every snapshot."""
+    _gauges[name] = callback
+
+
+def snapshot() -> dict:
+    return {
+        "histograms": {name: h.snapshot() for name, h in _histograms.items()},
+        "counters": {name: c.snapshot() for name, c in _counters.items()},
+        "gauges": {name: callback() for name, callback in _gauges.items()},
+    }
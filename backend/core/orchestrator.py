@@ -8,18 +8,29 @@ Phase 4 Pipeline:  DeployAgent                  (future)
 
 New phases = add one new pipeline entry + implement the agent. Nothing else changes here.
 """
+import asyncio
 from datetime import datetime, timezone
-from typing import List, Type, Dict, Any, Optional
+from typing import Callable, List, Type, Dict, Any, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from backend.agents.base_agent import BaseAgent, AgentResult
-from backend.db.models import AgentRun, Task, Project
+from backend.db.models import AgentRun, ExtractionRun, Task
+from backend.core.project_cache import project_cache
+from backend.core.run_registry import run_registry, CANCELED_BY_USER
 from backend.core.logging import get_logger
+from backend.core import blob_store, dashboard_stats, deadline, metrics, tracing
+from backend.config import get_settings
 
 logger = get_logger(__name__)
+settings = get_settings()
+
+BUDGET_UTILIZATION = metrics.histogram(
+    "agent_budget_utilization",
+    buckets=(0.1, 0.25, 0.5, 0.75, 0.9, 1.0),
+)
 
 @dataclass(frozen=True)
 class IdentityEnvelope:
@@ -36,7 +47,9 @@ class ContextEngine:
     Managed context lifecycle: Planning, Stabilization, and Promotion.
     """
     @staticmethod
-    async def plan_context_needs(agent_name: str, task: Task, initial_context: dict, project_context: dict = None) -> dict:
+    async def plan_context_needs(
+        agent_name: str, task: Union[Task, ExtractionRun], initial_context: dict, project_context: dict = None
+    ) -> dict:
         """
         Step 2: Plan Context Needs. Determine what the agent actually needs to see.
         """
@@ -44,7 +57,7 @@ class ContextEngine:
         
         needed = {
             "task_id": str(task.id),
-            "priority": task.priority,
+            "priority": getattr(task, "priority", None),  # extractions have no priority
             "status": task.status,
             "project_id": str(task.project_id) if task.project_id else None
         }
@@ -72,8 +85,14 @@ class ContextEngine:
         return stabilized
 
 class Orchestrator:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, *, session_factory: Callable[[], AsyncSession]):
         self.db = db
+        # Run bookkeeping uses brief sessions of its own: the caller's session is committed
+        # before an agent starts, so no pooled connection is held through LLM / GitHub calls.
+        # Required so a caller working inside an outer transaction (replay) passes sessions
+        # bound to its connection rather than committing around it; request handlers and
+        # background jobs pass AsyncSessionLocal.
+        self.session_factory = session_factory
 
     async def _get_task_with_project(self, task_id: Any) -> Task:
         """Helper to ensure we have project context loaded."""
@@ -84,31 +103,39 @@ class Orchestrator:
     async def run_agent(
         self,
         agent_cls: Type[BaseAgent],
-        task: Task,
+        task: Union[Task, ExtractionRun],
         context: Dict[str, Any],
         identity: Optional[IdentityEnvelope] = None,
+        agent_attrs: Optional[Dict[str, Any]] = None,
     ) -> AgentResult:
         """
         Production-grade agent execution loop following the 'Context Engine' pattern.
+        task is the run's owner: a Task, or the ExtractionRun for a DiscussionAgent extraction.
+        agent_attrs are set on the agent instance (e.g. CodeAgent.draft_job) and are never persisted.
+
+        Commits the caller's session first (the run row references the task), then records
+        the run on separate short sessions: inserted RUNNING before the agent starts, updated
+        once it finishes.
         """
         agent = agent_cls()
+        for attr, value in (agent_attrs or {}).items():
+            setattr(agent, attr, value)
         agent_name = agent.name
 
+        if run_registry.is_aborted(task.id):
+            logger.warning(f"[{agent_name}] Skipped: task_id={task.id} was aborted")
+            return AgentResult(success=False, error=CANCELED_BY_USER)
+
         # 1. Ingest & Identity Check (Data-plane isolation)
         uid = identity.user_id if identity else "system"
         
-        # Fetch project context explicitly to avoid lazy-load greenlet errors
+        # Project context comes from the in-process cache (no lazy loads, no per-run SELECT)
         project_context = {}
         if task.project_id:
             try:
-                stmt = select(Project).where(Project.id == task.project_id)
-                result = await self.db.execute(stmt)
-                project = result.scalar_one_or_none()
+                project = await project_cache.get(self.db, task.project_id)
                 if project:
-                    project_context = {
-                        "project_guidelines": project.coding_guidelines,
-                        "services_architecture": project.services_context
-                    }
+                    project_context = project.as_agent_context()
             except Exception as e:
                 logger.warning(f"Failed to fetch project context for {task.project_id}: {e}")
         
@@ -121,44 +148,144 @@ class Orchestrator:
             **context  # User-passed context overrides
         }
 
-        # 4. Execute (Inference & Action)
-        run = AgentRun(
-            task_id=task.id,
-            agent_name=agent_name,
-            status="RUNNING",
-            input_context=working_context,
-            started_at=datetime.now(timezone.utc).replace(tzinfo=None),
-        )
-        self.db.add(run)
-        await self.db.flush()
+        # Releases the caller's connection for the length of the run
+        with tracing.span("db.commit", category="db"):
+            await self.db.commit()
 
-        agent.run_id = str(run.id)
+        # 4. Execute (Inference & Action) within this agent's slice of the pipeline budget.
+        # The agent span parents every LLM / GitHub / DB span below and yields the latency breakdown.
+        with deadline.budget(agent.time_budget_seconds or settings.AGENT_TIME_BUDGET_SECONDS) as budget_seconds, \
+                tracing.span(f"agent.{agent_name}", collect=True, task_id=str(task.id), agent=agent_name) as agent_span:
+            owner = {"extraction_run_id": task.id} if isinstance(task, ExtractionRun) else {"task_id": task.id}
+            async with self.session_factory() as db:
+                run = AgentRun(
+                    **owner,
+                    agent_name=agent_name,
+                    status="RUNNING",
+                    input_context=await blob_store.externalize(db, working_context),
+                    time_budget_seconds=budget_seconds,
+                    trace_id=agent_span.trace_id,
+                    started_at=datetime.now(timezone.utc).replace(tzinfo=None),
+                )
+                db.add(run)
+                dashboard_stats.run_transition(
+                    db, task.project_id, agent_name, run.started_at.date(), None, run.status,
+                )
+                with tracing.span("db.commit", category="db"):
+                    await db.commit()
 
-        agent.db_session = self.db
-        
-        logger.info(f"[{agent_name}] Running for task_id={task.id} (User: {uid})")
-        
-        try:
-            result = await agent.run(working_context)
-            
-            # 5. Semantic Stabilization
-            stabilized_output = ContextEngine.stabilize_output(result)
-            
-            # 6. Promotion (Decide what becomes durable memory)
-            run.status = "COMPLETED" if result.success else "FAILED"
-            run.output = stabilized_output
-            run.error_message = result.error
-            run.completed_at = datetime.now(timezone.utc).replace(tzinfo=None)
+            agent.run_id = str(run.id)
+            agent_span.set_attribute("run_id", agent.run_id)
+
+            agent.session_factory = self.session_factory
             
-            logger.info(f"[{agent_name}] Completed loop.")
-            return result
+            logger.info(f"[{agent_name}] Running for task_id={task.id} (User: {uid}, budget={budget_seconds:.0f}s)")
             
-        except Exception as exc:
-            run.status = "FAILED"
-            run.error_message = str(exc)
-            run.completed_at = datetime.now(timezone.utc).replace(tzinfo=None)
-            logger.error(f"[{agent_name}] Exception: {exc}")
-            raise
+            # The agent runs as its own asyncio task so abort can cancel it mid-flight
+            agent_job = asyncio.create_task(agent.run(working_context))
+            stabilized_output = None
+            try:
+                with run_registry.track(task.id, agent_job):
+                    async with asyncio.timeout(budget_seconds):
+                        result = await agent_job
+                
+                # 5. Semantic Stabilization
+                stabilized_output = ContextEngine.stabilize_output(result)
+                
+                # 6. Promotion (Decide what becomes durable memory)
+                run.status = "COMPLETED" if result.success else "FAILED"
+                run.error_message = result.error
+                
+                logger.info(f"[{agent_name}] Completed loop.")
+                return result
+
+            except TimeoutError:
+                run.status = "TIMED_OUT"
+                run.error_message = f"Exceeded time budget of {budget_seconds:.1f}s"
+                logger.error(f"[{agent_name}] {run.error_message} for task_id={task.id}")
+                return AgentResult(success=False, error=run.error_message)
+
+            except asyncio.CancelledError:
+                run.status = "CANCELLED"
+                run.error_message = CANCELED_BY_USER
+                logger.warning(f"[{agent_name}] Cancelled for task_id={task.id}")
+                # Only swallow our own abort; a cancelled caller (shutdown, disconnect) must still unwind
+                if asyncio.current_task().cancelling():
+                    raise
+                return AgentResult(success=False, error=CANCELED_BY_USER)
+                
+            except Exception as exc:
+                run.status = "FAILED"
+                run.error_message = str(exc)
+                logger.error(f"[{agent_name}] Exception: {exc}")
+                raise
+
+            finally:
+                run.completed_at = datetime.now(timezone.utc).replace(tzinfo=None)
+                run.latency_breakdown = agent_span.breakdown()
+                elapsed = (run.completed_at - run.started_at).total_seconds()
+                BUDGET_UTILIZATION.observe(
+                    elapsed / budget_seconds if budget_seconds else 1.0,
+                    agent=agent_name,
+                    status=run.status,
+                )
+                await self._finish_run(task, run, stabilized_output)
+
+    async def _finish_run(self, task: Union[Task, ExtractionRun], run: AgentRun, output: Optional[dict]) -> None:
+        """
+        Writes the run's final state on a brief session and moves its dashboard count from
+        the stored status to the final one, adding its tokens.
+        """
+        async with self.session_factory() as db:
+            # abort_task may already have marked (and counted) the run CANCELLED; the row
+            # lock waits out an abort that hasn't committed yet, so nothing counts twice
+            stored = (await db.execute(
+                select(AgentRun.status)
+                .where(AgentRun.id == run.id, AgentRun.started_at == run.started_at)
+                .with_for_update()
+            )).scalar()
+            old_status, tokens = "RUNNING", (0, 0)
+            if stored == "CANCELLED":
+                old_status = stored  # its tokens were counted with the cancellation
+            else:
+                tokens = (await dashboard_stats.run_tokens(db, [run.id], run.started_at.date())).get(run.id, tokens)
+
+            if output is not None:
+                run.output = await blob_store.externalize(db, output)
+            db.add(run)  # detached since the insert; its pending changes become one UPDATE
+            if old_status != run.status:
+                dashboard_stats.run_transition(
+                    db, task.project_id, run.agent_name, run.started_at.date(), old_status, run.status, *tokens,
+                )
+            with tracing.span("db.commit", category="db"):
+                await db.commit()
+
+    async def load_checkpoint(
+        self,
+        task: Task,
+        agents: List[Type[BaseAgent]],
+    ) -> Tuple[dict, List[Type[BaseAgent]]]:
+        """
+        Rebuilds the accumulated pipeline context from the task's COMPLETED agent runs.
+        Returns (inherited context, agents still to run) — the remaining list starts
+        at the first stage without a completed run.
+        """
+        stmt = (
+            select(AgentRun.agent_name, AgentRun.output)
+            .where(AgentRun.task_id == task.id, AgentRun.status == "COMPLETED")
+            .order_by(AgentRun.started_at.asc())
+        )
+        rows = (await self.db.execute(stmt)).all()
+        hydrated = await blob_store.hydrate(self.db, [output for _, output in rows])
+        # Later runs of the same agent win
+        outputs = {name: output or {} for (name, _), output in zip(rows, hydrated)}
+
+        context: Dict[str, Any] = {}
+        for i, agent_cls in enumerate(agents):
+            if agent_cls.name not in outputs:
+                return context, agents[i:]
+            context.update(outputs[agent_cls.name])
+        return context, []
 
     async def run_pipeline(
         self,
@@ -166,27 +293,42 @@ class Orchestrator:
         task: Task,
         initial_context: dict,
         identity: Optional[IdentityEnvelope] = None,
+        resume: bool = False,
     ) -> dict:
         """
         Runs a list of agents sequentially with managed context inheritance.
+        Each completed stage is committed as a checkpoint; with resume=True, stages that
+        already have a COMPLETED run are skipped and their stored output is inherited.
         """
         context = initial_context.copy()
+        if resume:
+            checkpoint, agents = await self.load_checkpoint(task, agents)
+            context.update(checkpoint)
+            if not agents:
+                logger.info(f"⏭️  Nothing to resume for task_id={task.id}")
+                return context
+
         pipeline_name = " -> ".join([a.name for a in agents])
         logger.info(f"🚀 Starting Pipeline: [{pipeline_name}]")
         
-        for i, agent_cls in enumerate(agents):
-            logger.info(f"📍 Pipeline Step {i+1}/{len(agents)}: {agent_cls.name}")
-            result = await self.run_agent(agent_cls, task, context, identity)
+        with deadline.budget(settings.PIPELINE_TIME_BUDGET_SECONDS):
+            for i, agent_cls in enumerate(agents):
+                logger.info(f"📍 Pipeline Step {i+1}/{len(agents)}: {agent_cls.name}")
+                result = await self.run_agent(agent_cls, task, context, identity)
             
-            if not result.success:
-                logger.error(f"❌ Pipeline halted: {agent_cls.name} failed with error: {result.error}")
-                break
+                # Checkpoint: the run row is already committed by run_agent; this commits
+                # whatever the caller changed on the task meanwhile
+                await self.db.commit()
+
+                if not result.success:
+                    logger.error(f"❌ Pipeline halted: {agent_cls.name} failed with error: {result.error}")
+                    break
             
-            # Context Inheritance (Step 9: Promotion to next agent)
-            if result.output:
-                new_keys = list(result.output.keys())
-                logger.debug(f"↗️  Inheriting output keys from {agent_cls.name}: {new_keys}")
-                context.update(result.output)
+                # Context Inheritance (Step 9: Promotion to next agent)
+                if result.output:
+                    new_keys = list(result.output.keys())
+                    logger.debug(f"↗️  Inheriting output keys from {agent_cls.name}: {new_keys}")
+                    context.update(result.output)
                 
         logger.info(f"🏁 Pipeline Finished: [{pipeline_name}]")
         return context
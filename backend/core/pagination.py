@@ -0,0 +1,72 @@
+"""
+Keyset pagination for the list endpoints.
+
+Rows are ordered newest first on (timestamp, id) — id breaks ties between rows created
+in the same microsecond, so the order is total and stable while new rows arrive. A page
+continues strictly after the last row of the previous one, which the composite
+(…, timestamp, id) indexes serve as a single backward index scan regardless of depth.
+
+Cursors are opaque to clients: urlsafe base64 of the JSON [timestamp, id] of the last row.
+
+List endpoints return summary schemas and load only the columns those declare
+(load_fields), so large JSON / text columns are never read for a list.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple, Type
+from uuid import UUID
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+
+
+def load_fields(model: Any, schema: Type[BaseModel]) -> Any:
+    """Loader option that selects only the model columns the response schema declares."""
+    columns = model.__table__.columns
+    return load_only(*(getattr(model, name) for name in schema.model_fields if name in columns))
+
+
+def encode_cursor(timestamp: datetime, row_id: UUID) -> str:
+    raw = json.dumps([timestamp.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        timestamp = datetime.fromisoformat(timestamp)
+        # Timestamp columns are naive UTC; an aware value would fail in the query instead
+        if timestamp.tzinfo is not None:
+            raise ValueError("cursor timestamp has a timezone")
+        return timestamp, UUID(row_id)
+    except (ValueError, TypeError, AttributeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    timestamp_column: Any,
+    id_column: Any,
+    cursor: Optional[str],
+    limit: int,
+) -> Tuple[List[Any], Optional[str]]:
+    """Runs one page of query (newest first). Returns the rows and the next page's cursor."""
+    if cursor:
+        query = query.where(tuple_(timestamp_column, id_column) < tuple_(*decode_cursor(cursor)))
+    # One extra row tells us whether another page exists without a COUNT
+    query = query.order_by(timestamp_column.desc(), id_column.desc()).limit(limit + 1)
+    rows = list((await db.execute(query)).scalars().all())
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, timestamp_column.key), getattr(last, id_column.key))
+    return rows, next_cursor
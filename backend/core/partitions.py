@@ -0,0 +1,184 @@
+"""
+Monthly range partitions for agent_runs (started_at) and agent_run_steps (created_at).
+
+Queries go through the parent tables, and Postgres prunes to the partitions a time
+range can touch, so the dashboard's newest-first reads only scan the current month or
+two. Every partition is a plain table with its own (small) indexes and vacuum cycle.
+
+maintain() runs daily from the scheduler (and once at startup):
+  - creates the partitions for the current month and PARTITION_PREMAKE_MONTHS ahead;
+    rows outside every range land in the <table>_default partition, and are moved into
+    their month's partition when it is created (e.g. maintenance didn't run in time);
+  - for partitions wholly older than RUN_RETENTION_MONTHS, streams the rows to
+    ARCHIVE_DIR/<partition>.ndjson.gz and then detaches and drops the partition.
+
+Archived rows are written as stored: {"$blob": ...} refs still resolve against
+context_blobs, which is never pruned here.
+"""
+import asyncio
+import gzip
+import os
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from backend.config import get_settings
+from backend.core.logging import get_logger
+from backend.db.database import engine
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Partitioned table -> partition key column
+PARTITIONED_TABLES = {
+    "agent_runs": "started_at",
+    "agent_run_steps": "created_at",
+}
+
+ARCHIVE_BATCH_ROWS = 1000
+
+
+def month_start(value: datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year}m{month.month:02d}"
+
+
+async def _is_partitioned(conn: AsyncConnection, table: str) -> bool:
+    result = await conn.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"),
+        {"table": table},
+    )
+    return result.scalar() is not None
+
+
+async def _partitions(conn: AsyncConnection, table: str) -> List[Tuple[str, Optional[date]]]:
+    """(partition name, lower bound month) for each partition; the default partition has None."""
+    result = await conn.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table)"
+        ),
+        {"table": table},
+    )
+    partitions = []
+    for name, bound in result.all():
+        # e.g. FOR VALUES FROM ('2026-10-01 00:00:00') TO ('2026-11-01 00:00:00')
+        lower = bound.split("'")[1] if bound.startswith("FOR VALUES FROM ('") else None
+        partitions.append((name, datetime.fromisoformat(lower).date() if lower else None))
+    return partitions
+
+
+async def _create_partition(conn: AsyncConnection, table: str, month: date) -> Tuple[str, int]:
+    """Creates the month's partition, moving in any of its rows the default partition holds."""
+    name = partition_name(table, month)
+    column = PARTITIONED_TABLES[table]
+    bounds = f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    in_range = f"{column} >= '{month.isoformat()}' AND {column} < '{add_months(month, 1).isoformat()}'"
+
+    # CREATE ... PARTITION OF is rejected while the default partition holds rows of the range
+    stranded = (await conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {table}_default WHERE {in_range})"))).scalar()
+    if not stranded:
+        await conn.execute(text(f"CREATE TABLE {name} PARTITION OF {table} {bounds}"))
+        return name, 0
+
+    await conn.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    moved = (await conn.execute(text(
+        f"WITH moved AS (DELETE FROM {table}_default WHERE {in_range} RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ))).rowcount
+    # Builds the partition's indexes; the default partition no longer holds rows of the range
+    await conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {name} {bounds}"))
+    return name, moved
+
+
+async def ensure_partitions(months_ahead: Optional[int] = None, now: Optional[datetime] = None) -> List[str]:
+    """Creates any missing partitions from this month through months_ahead. Returns the new ones."""
+    months_ahead = settings.PARTITION_PREMAKE_MONTHS if months_ahead is None else months_ahead
+    current = month_start(now or datetime.utcnow())
+    created = []
+    for table in PARTITIONED_TABLES:
+        async with engine.begin() as conn:
+            if not await _is_partitioned(conn, table):
+                continue
+            await conn.execute(text(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"))
+            existing = {lower for _, lower in await _partitions(conn, table)}
+        # One transaction per month: a month that fails doesn't keep the later ones from being made
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            if month in existing:
+                continue
+            try:
+                async with engine.begin() as conn:
+                    name, moved = await _create_partition(conn, table, month)
+            except Exception as e:
+                logger.error(f"[Partitions] Failed to create {partition_name(table, month)}: {e}")
+                continue
+            if moved:
+                logger.warning(f"[Partitions] Moved {moved} rows of {name} out of {table}_default")
+            created.append(name)
+    if created:
+        logger.info(f"[Partitions] Created {', '.join(created)}")
+    return created
+
+
+async def _write_archive(conn: AsyncConnection, partition: str, path: str) -> int:
+    """Streams the partition as NDJSON into a gzip file (written to a temp name, then renamed)."""
+    tmp_path = f"{path}.tmp"
+    rows = 0
+    result = await conn.stream(text(f"SELECT row_to_json(p)::text FROM {partition} p"))
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as archive:
+        async for batch in result.partitions(ARCHIVE_BATCH_ROWS):
+            lines = "".join(line + "\n" for (line,) in batch)
+            await asyncio.to_thread(archive.write, lines)
+            rows += len(batch)
+    os.replace(tmp_path, path)
+    return rows
+
+
+async def archive_expired(retention_months: Optional[int] = None, now: Optional[datetime] = None) -> List[str]:
+    """Archives and drops partitions whose whole month is older than the retention window."""
+    retention_months = settings.RUN_RETENTION_MONTHS if retention_months is None else retention_months
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(now or datetime.utcnow()), -retention_months)
+    os.makedirs(settings.ARCHIVE_DIR, exist_ok=True)
+
+    archived = []
+    for table in PARTITIONED_TABLES:
+        async with engine.connect() as conn:
+            if not await _is_partitioned(conn, table):
+                continue
+            expired = sorted(name for name, lower in await _partitions(conn, table) if lower and lower < cutoff)
+        for partition in expired:
+            path = os.path.join(settings.ARCHIVE_DIR, f"{partition}.ndjson.gz")
+            try:
+                async with engine.connect() as conn:
+                    rows = await _write_archive(conn, partition, path)
+                async with engine.begin() as conn:
+                    await conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition}"))
+                    await conn.execute(text(f"DROP TABLE {partition}"))
+                archived.append(partition)
+                logger.info(f"[Partitions] Archived {partition} ({rows} rows) to {path}")
+            except Exception as e:
+                logger.error(f"[Partitions] Failed to archive {partition}: {e}")
+    return archived
+
+
+async def maintain() -> None:
+    """Scheduler entry point: premake upcoming partitions, then retire expired ones."""
+    try:
+        await ensure_partitions()
+        await archive_expired()
+    except Exception as e:
+        logger.error(f"[Partitions] Maintenance failed: {e}")
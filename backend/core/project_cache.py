@@ -0,0 +1,112 @@
+"""
+Project context cache — the guidelines, services architecture and repos every agent
+run needs, kept in-process so agent start-up doesn't pay a DB round trip per run.
+
+Entries are invalidated locally by the projects API and on other replicas through the
+`project_updated` NOTIFY channel. The cache is cleared when the listener reconnects
+(invalidations sent while it was down are lost), and a TTL bounds staleness meanwhile.
+"""
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.config import get_settings
+from backend.core import events
+from backend.core.logging import get_logger
+from backend.db.models import Project
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+PROJECT_CHANNEL = "project_updated"
+
+
+@dataclass(frozen=True)
+class ProjectContext:
+    project_id: UUID
+    updated_at: datetime
+    coding_guidelines: Optional[str] = None
+    services_context: Dict[str, Any] = field(default_factory=dict)
+    github_repos: List[str] = field(default_factory=list)
+
+    def as_agent_context(self) -> dict:
+        """Shape consumed by ContextEngine.plan_context_needs."""
+        return {
+            "project_guidelines": self.coding_guidelines,
+            "services_architecture": self.services_context,
+        }
+
+
+class ProjectContextCache:
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[UUID, Tuple[ProjectContext, float]] = {}
+
+    async def get(self, db: AsyncSession, project_id: UUID) -> Optional[ProjectContext]:
+        entry = self._entries.get(project_id)
+        if entry and time.monotonic() - entry[1] < self.ttl_seconds:
+            return entry[0]
+
+        stmt = select(
+            Project.id,
+            Project.updated_at,
+            Project.coding_guidelines,
+            Project.services_context,
+            Project.github_repos,
+        ).where(Project.id == project_id)
+        row = (await db.execute(stmt)).one_or_none()
+        if row is None:
+            self.invalidate(project_id)
+            return None
+
+        ctx = ProjectContext(
+            project_id=row.id,
+            updated_at=row.updated_at,
+            coding_guidelines=row.coding_guidelines,
+            services_context=row.services_context or {},
+            github_repos=row.github_repos or [],
+        )
+        self.put(ctx)
+        return ctx
+
+    def put(self, ctx: ProjectContext) -> None:
+        """Stores an entry unless a newer version (by updated_at) is already cached."""
+        current = self._entries.get(ctx.project_id)
+        if current and current[0].updated_at > ctx.updated_at:
+            return
+        self._entries[ctx.project_id] = (ctx, time.monotonic())
+
+    def invalidate(self, project_id: UUID) -> None:
+        self._entries.pop(project_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+project_cache = ProjectContextCache(ttl_seconds=settings.PROJECT_CACHE_TTL_SECONDS)
+
+
+def _on_project_updated(payload: str) -> None:
+    try:
+        project_cache.invalidate(UUID(payload))
+    except ValueError:
+        logger.warning(f"[ProjectCache] Ignoring malformed invalidation payload {payload!r}")
+
+
+async def _on_listener_reconnected() -> None:
+    project_cache.clear()
+
+
+events.subscribe(PROJECT_CHANNEL, _on_project_updated)
+events.on_reconnect(_on_listener_reconnected)
+
+
+async def publish_project_change(db: AsyncSession, project_id: UUID) -> None:
+    """Invalidates the local entry and notifies other replicas once the caller commits."""
+    project_cache.invalidate(project_id)
+    await events.publish(db, PROJECT_CHANNEL, str(project_id))
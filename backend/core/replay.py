@@ -0,0 +1,368 @@
+"""
+Replay engine — re-executes stored AgentRuns as a regression and performance benchmark.
+
+Each selected run is replayed through Orchestrator.run_agent with:
+  - a replay LLM provider whose responses are synthesized from the run's stored output
+    (and steps), so agents parse the same shapes they saw in production;
+  - GitHub and SMTP stubbed out, GitHub returning the recorded issue / PR numbers;
+  - every DB write inside one transaction that is rolled back at the end.
+
+Per run it reports wall time, CPU time, peak allocations and DB round trips, and
+whether the replayed output matches the recorded one.
+
+    python -m backend.core.replay --agent TicketAgent --limit 50
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from unittest import mock
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from backend.agents.code_agent import CodeAgent
+from backend.agents.discussion_agent import DiscussionAgent
+from backend.agents.email_agent import EmailAgent
+from backend.agents.pr_agent import PRAgent
+from backend.agents.sonar_agent import SonarAgent
+from backend.agents.sonar_sweep_agent import SonarSweepAgent
+from backend.agents.ticket_agent import TicketAgent
+from backend.core import blob_store
+from backend.core.logging import get_logger
+from backend.core.orchestrator import Orchestrator
+from backend.db.database import engine
+from backend.db.models import AgentRun, ExtractionRun, Task
+from backend.services.gemini_service import GeminiService
+from backend.services.interfaces import LLMProvider, LLMResponse
+from backend.services.llm_provider import GeminiProvider
+from backend.services.mailer_service import MailerService
+
+logger = get_logger(__name__)
+
+AGENTS: Dict[str, type] = {
+    agent_cls.name: agent_cls
+    for agent_cls in (
+        DiscussionAgent, TicketAgent, EmailAgent, CodeAgent, PRAgent, SonarAgent, SonarSweepAgent
+    )
+}
+
+# Modules that construct GitHubService themselves
+GITHUB_CALLERS = (
+    "backend.agents.ticket_agent",
+    "backend.agents.code_agent",
+    "backend.agents.pr_agent",
+    "backend.agents.sonar_agent",
+    "backend.agents.sonar_sweep_agent",
+)
+
+
+@dataclass
+class ReplayReport:
+    run_id: str
+    agent_name: str
+    success: bool
+    output_matches: bool
+    mismatched_keys: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    alloc_peak_kb: float = 0.0
+    db_round_trips: int = 0
+    recorded_wall_ms: Optional[float] = None
+
+
+# ---------------------------------------------------------------------------
+# Response synthesis — what each agent's LLM call must have returned
+# ---------------------------------------------------------------------------
+
+def _discussion_responses(run: AgentRun, context: dict, output: dict) -> List[str]:
+    if "extracted_tasks" in output:
+        return [json.dumps(output["extracted_tasks"])]
+    return [output.get("raw", "")]
+
+
+def _ticket_responses(run: AgentRun, context: dict, output: dict) -> List[str]:
+    return [json.dumps({
+        "security_scan": output.get("security_scan_results", {}),
+        "sanitized_title": context.get("title", ""),
+        "issue_body": context.get("description") or "",
+    })]
+
+
+def _email_responses(run: AgentRun, context: dict, output: dict) -> List[str]:
+    return [json.dumps({
+        "privacy_scan": output.get("privacy_scan_results", {}),
+        "email_subject": output.get("subject", ""),
+        "email_html_body": "",
+    })]
+
+
+def _code_responses(run: AgentRun, context: dict, output: dict) -> List[str]:
+    files: List[str] = []
+    for step in run.steps:
+        files = (step.tool_input or {}).get("files", files)
+    return [json.dumps({path: "" for path in files or ["replay.txt"]})]
+
+
+def _pr_responses(run: AgentRun, context: dict, output: dict) -> List[str]:
+    resolutions = {f"replay_{i}.txt": "" for i in range(output.get("resolutions_applied", 0))}
+    return [json.dumps({
+        "status": output.get("pr_review_status", "APPROVED"),
+        "comment": output.get("pr_review_comment", ""),
+        "resolutions": resolutions,
+    })]
+
+
+def _sonar_responses(run: AgentRun, context: dict, output: dict) -> List[str]:
+    issue = context.get("sonar_issue") or {}
+    return [json.dumps({issue.get("component", "replay.txt").split(":")[-1]: ""})]
+
+
+SYNTHESIZERS: Dict[str, Callable[[AgentRun, dict, dict], List[str]]] = {
+    DiscussionAgent.name: _discussion_responses,
+    TicketAgent.name: _ticket_responses,
+    EmailAgent.name: _email_responses,
+    CodeAgent.name: _code_responses,
+    PRAgent.name: _pr_responses,
+    SonarAgent.name: _sonar_responses,
+    # SonarSweepAgent: one free-text file per call, the default "" is enough
+}
+
+
+class ReplayLLMProvider(LLMProvider):
+    """Serves pre-synthesized responses in call order, then `fallback` once they run out."""
+
+    def __init__(self, responses: List[str], fallback: str):
+        self.responses = list(responses)
+        self.fallback = fallback
+        self.calls = 0
+
+    async def complete(self, prompt: str) -> str:
+        self.calls += 1
+        return self.responses.pop(0) if self.responses else self.fallback
+
+    async def generate(self, prompt: str, system_prompt: str = None, require_json: bool = False) -> LLMResponse:
+        content = await self.complete(prompt)
+        result = LLMResponse(content=content)
+        if require_json:
+            try:
+                result.parsed_json = json.loads(content)
+            except json.JSONDecodeError:
+                pass
+        return result
+
+
+class ReplayGitHub:
+    """GitHubService stand-in: writes are no-ops, creates return the recorded numbers."""
+
+    def __init__(self, output: dict, repo: str = None):
+        self.repo = repo or "replay/replay"
+        self.output = output
+
+    async def create_issue(self, title: str, body: str, labels: list = None) -> dict:
+        return {"number": self.output.get("github_issue_id", "0"), "html_url": self.output.get("github_issue_url", "")}
+
+    async def create_pull_request(self, title: str, body: str, head: str, base: str = None) -> dict:
+        return {"number": self.output.get("github_pr_id", "0"), "html_url": self.output.get("github_pr_url", "")}
+
+    async def get_default_branch(self) -> str:
+        return "main"
+
+    async def get_file_content(self, file_path: str, ref: str = "main") -> str:
+        return ""
+
+    async def get_pull_request_files(self, pr_number: int) -> list:
+        return []
+
+    async def get_pr_comments(self, pr_number: int) -> list:
+        return []
+
+    def __getattr__(self, name: str):
+        # create_branch, create_or_update_file, create_pr_review_comment, ...
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        async def noop(*args, **kwargs) -> dict:
+            return {}
+        return noop
+
+
+def _patches(provider: ReplayLLMProvider, output: dict) -> ExitStack:
+    stack = ExitStack()
+
+    async def complete(_service, prompt: str) -> str:
+        return await provider.complete(prompt)
+
+    async def generate(_provider, prompt: str, system_prompt: str = None, require_json: bool = False) -> LLMResponse:
+        return await provider.generate(prompt, system_prompt, require_json)
+
+    async def send(_mailer, subject: str, body: str, is_html: bool = True) -> None:
+        return None
+
+    stack.enter_context(mock.patch.object(GeminiService, "complete", complete))
+    stack.enter_context(mock.patch.object(GeminiProvider, "generate", generate))
+    stack.enter_context(mock.patch.object(MailerService, "send", send))
+    for module in GITHUB_CALLERS:
+        stack.enter_context(mock.patch(f"{module}.GitHubService", lambda repo=None: ReplayGitHub(output, repo)))
+    return stack
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+def _compare(recorded: dict, replayed: dict) -> List[str]:
+    return sorted(key for key in recorded if recorded.get(key) != replayed.get(key))
+
+
+async def _replay_one(
+    db: AsyncSession, session_factory: Callable[[], AsyncSession], run: AgentRun, round_trips: List[int]
+) -> ReplayReport:
+    agent_cls = AGENTS[run.agent_name]
+    context, output = run.input_context or {}, run.output or {}
+    recorded_wall_ms = None
+    if run.started_at and run.completed_at:
+        recorded_wall_ms = round((run.completed_at - run.started_at).total_seconds() * 1000, 1)
+
+    if run.task_id:
+        task = (await db.execute(select(Task).where(Task.id == run.task_id))).scalar_one_or_none()
+    else:
+        task = await db.get(ExtractionRun, run.extraction_run_id)
+    if task is None:
+        return ReplayReport(str(run.id), run.agent_name, False, False, error="Task no longer exists")
+
+    synthesize = SYNTHESIZERS.get(run.agent_name, lambda *_: [])
+    provider = ReplayLLMProvider(synthesize(run, context, output), fallback="")
+
+    with _patches(provider, output):
+        round_trips[0] = 0
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+
+        result = await Orchestrator(db, session_factory=session_factory).run_agent(agent_cls, task, context)
+
+        wall_ms = (time.perf_counter() - wall_start) * 1000
+        cpu_ms = (time.process_time() - cpu_start) * 1000
+        peak = tracemalloc.get_traced_memory()[1]
+
+    mismatched = _compare(output, result.output or {})
+    return ReplayReport(
+        run_id=str(run.id),
+        agent_name=run.agent_name,
+        success=result.success,
+        output_matches=result.success and not mismatched,
+        mismatched_keys=mismatched,
+        error=result.error,
+        wall_ms=round(wall_ms, 1),
+        cpu_ms=round(cpu_ms, 1),
+        alloc_peak_kb=round(max(peak - baseline, 0) / 1024, 1),
+        db_round_trips=round_trips[0],
+        recorded_wall_ms=recorded_wall_ms,
+    )
+
+
+async def replay_runs(
+    run_ids: Optional[List[str]] = None,
+    agent_name: Optional[str] = None,
+    limit: int = 20,
+) -> List[ReplayReport]:
+    """Replays the most recent COMPLETED runs (optionally filtered); nothing is persisted."""
+    stmt = (
+        select(AgentRun)
+        .options(selectinload(AgentRun.steps))
+        .where(AgentRun.status == "COMPLETED", AgentRun.agent_name.in_(list(AGENTS)))
+        .order_by(AgentRun.started_at.desc())
+        .limit(limit)
+    )
+    if run_ids:
+        stmt = stmt.where(AgentRun.id.in_(run_ids))
+    if agent_name:
+        stmt = stmt.where(AgentRun.agent_name == agent_name)
+
+    round_trips = [0]
+
+    def count_round_trip(*args) -> None:
+        round_trips[0] += 1
+
+    reports: List[ReplayReport] = []
+    async with engine.connect() as conn:
+        outer = await conn.begin()
+        # Agent / orchestrator commits become savepoints inside the outer transaction,
+        # including those of the orchestrator's own run-bookkeeping sessions
+        def session_factory() -> AsyncSession:
+            return AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+
+        db = session_factory()
+        event.listen(engine.sync_engine, "before_cursor_execute", count_round_trip)
+        tracemalloc.start()
+        try:
+            runs = (await db.execute(stmt)).scalars().all()
+            contexts = await blob_store.hydrate(db, [r.input_context for r in runs])
+            outputs = await blob_store.hydrate(db, [r.output for r in runs])
+            for run, context, output in zip(runs, contexts, outputs):
+                db.expunge(run)  # hydrated copies must never be flushed
+                run.input_context, run.output = context, output
+                logger.info(f"[Replay] {run.agent_name} run {run.id}")
+                reports.append(await _replay_one(db, session_factory, run, round_trips))
+        finally:
+            tracemalloc.stop()
+            event.remove(engine.sync_engine, "before_cursor_execute", count_round_trip)
+            await db.close()
+            await outer.rollback()
+    return reports
+
+
+def summarize(reports: List[ReplayReport]) -> Dict[str, Dict[str, Any]]:
+    """Per-agent means and match rate."""
+    summary: Dict[str, Dict[str, Any]] = {}
+    for name in sorted({r.agent_name for r in reports}):
+        rows = [r for r in reports if r.agent_name == name]
+        n = len(rows)
+        summary[name] = {
+            "runs": n,
+            "matched": sum(r.output_matches for r in rows),
+            "wall_ms": round(sum(r.wall_ms for r in rows) / n, 1),
+            "cpu_ms": round(sum(r.cpu_ms for r in rows) / n, 1),
+            "alloc_peak_kb": round(sum(r.alloc_peak_kb for r in rows) / n, 1),
+            "db_round_trips": round(sum(r.db_round_trips for r in rows) / n, 1),
+        }
+    return summary
+
+
+async def _main() -> None:
+    parser = argparse.ArgumentParser(description="Replay stored AgentRuns against stubbed LLM / GitHub / SMTP.")
+    parser.add_argument("--run-id", action="append", dest="run_ids", help="Replay this run (repeatable)")
+    parser.add_argument("--agent", help="Only replay runs of this agent")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Print per-run reports as JSON lines")
+    args = parser.parse_args()
+
+    try:
+        reports = await replay_runs(args.run_ids, args.agent, args.limit)
+    finally:
+        await engine.dispose()
+
+    if args.json:
+        for report in reports:
+            print(json.dumps(asdict(report)))
+        return
+    print(f"{'agent':<18}{'runs':>6}{'match':>7}{'wall ms':>10}{'cpu ms':>9}{'alloc KB':>10}{'db trips':>10}")
+    for name, row in summarize(reports).items():
+        print(
+            f"{name:<18}{row['runs']:>6}{row['matched']:>7}{row['wall_ms']:>10}"
+            f"{row['cpu_ms']:>9}{row['alloc_peak_kb']:>10}{row['db_round_trips']:>10}"
+        )
+    for report in reports:
+        if not report.output_matches:
+            print(f"  mismatch {report.agent_name} {report.run_id}: {report.mismatched_keys or report.error}")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
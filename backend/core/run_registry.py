@@ -0,0 +1,99 @@
+"""
+Run registry — maps task ids to the asyncio tasks running their agents in this process,
+so aborting a task cancels the in-flight agent (and its outstanding Gemini / GitHub
+request) instead of only flipping the task status.
+
+Aborts are broadcast on the `task_abort` NOTIFY channel, so whichever replica is
+actually running the agent cancels it. When the listener reconnects, tasks running here
+are re-checked against the database for aborts sent while it was down.
+"""
+import asyncio
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Set
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core import events
+from backend.core.logging import get_logger
+from backend.db.database import AsyncSessionLocal
+from backend.db.models import Task
+
+logger = get_logger(__name__)
+
+ABORT_CHANNEL = "task_abort"
+CANCELED_BY_USER = "Canceled by user"
+
+
+class RunRegistry:
+    def __init__(self):
+        self._runs: Dict[str, Set[asyncio.Task]] = defaultdict(set)
+        self._aborted: Set[str] = set()
+
+    @contextmanager
+    def track(self, task_id: UUID, job: asyncio.Task) -> Iterator[None]:
+        key = str(task_id)
+        self._runs[key].add(job)
+        try:
+            yield
+        finally:
+            self._runs[key].discard(job)
+            if not self._runs[key]:
+                del self._runs[key]
+
+    def cancel(self, task_id: UUID) -> int:
+        """Marks the task aborted and cancels its running agents. Returns how many were cancelled."""
+        key = str(task_id)
+        self._aborted.add(key)
+        jobs = [job for job in self._runs.get(key, ()) if not job.done()]
+        for job in jobs:
+            job.cancel()
+        if jobs:
+            logger.info(f"[RunRegistry] Cancelled {len(jobs)} running agent(s) for task {key}")
+        return len(jobs)
+
+    def running(self) -> List[UUID]:
+        """Ids of the tasks with agents running in this process."""
+        return [UUID(key) for key in self._runs]
+
+    def is_aborted(self, task_id: UUID) -> bool:
+        return str(task_id) in self._aborted
+
+    def clear_abort(self, task_id: UUID) -> None:
+        """Called when a task is (re-)executed, so an old abort doesn't cancel the new run."""
+        self._aborted.discard(str(task_id))
+
+
+run_registry = RunRegistry()
+
+
+def _on_task_abort(payload: str) -> None:
+    run_registry.cancel(payload)
+
+
+async def _on_listener_reconnected() -> None:
+    running = run_registry.running()
+    if not running:
+        return
+    # abort_task marks the task FAILED / CANCELED_BY_USER in the same commit as the NOTIFY
+    async with AsyncSessionLocal() as db:
+        aborted = (await db.execute(
+            select(Task.id).where(
+                Task.id.in_(running), Task.status == "FAILED", Task.error_message == CANCELED_BY_USER,
+            )
+        )).scalars().all()
+    for task_id in aborted:
+        logger.info(f"[RunRegistry] Abort of task {task_id} was missed while the listener was down")
+        run_registry.cancel(task_id)
+
+
+events.subscribe(ABORT_CHANNEL, _on_task_abort)
+events.on_reconnect(_on_listener_reconnected)
+
+
+async def publish_abort(db: AsyncSession, task_id: UUID) -> None:
+    """Cancels local runs now and notifies other replicas once the caller commits."""
+    run_registry.cancel(task_id)
+    await events.publish(db, ABORT_CHANNEL, str(task_id))
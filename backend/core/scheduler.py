@@ -1,45 +1,83 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from sqlalchemy import select, update
+from sqlalchemy import column, select, update, values
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from backend.config import get_settings
 from backend.db.database import AsyncSessionLocal
 from backend.db.models import Project
 from backend.services.sonar_service import SonarService
 from backend.core.logging import get_logger
+from backend.core import metrics, partitions
 
 logger = get_logger(__name__)
+settings = get_settings()
+
+SONAR_SYNC_SECONDS = metrics.histogram("sonar_sync_seconds")
+SONAR_SYNC_FAILURES = metrics.counter("sonar_sync_failures_total")
+
+
+async def _fetch_sonar_metrics(row, limit: asyncio.Semaphore) -> Optional[Tuple[Any, Dict[str, int]]]:
+    async with limit:
+        start = time.monotonic()
+        try:
+            result = await SonarService(row.sonar_project_key, row.sonar_token).get_metrics()
+        except Exception as e:
+            logger.error(f"[Scheduler] Sonar fetch for project {row.name} raised: {e}")
+            result = {}
+        outcome = "ok" if result else "failed"
+        SONAR_SYNC_SECONDS.observe(time.monotonic() - start, project=row.name, outcome=outcome)
+    if not result:
+        # SonarService logs the cause and returns {} on any API or network error
+        SONAR_SYNC_FAILURES.inc(project=row.name)
+        return None
+    return row.id, result
+
 
 async def sync_all_sonar_projects():
-    """Iterate through all projects and sync Sonar metrics if configured."""
+    """Fetch Sonar metrics for every configured project and store them in one UPDATE."""
     logger.info("Starting scheduled SonarCloud sync...")
-    
+
+    # Only the columns the fetch needs, streamed in batches; the read transaction is
+    # closed before any HTTP call so no connection is held while Sonar answers.
+    query = (
+        select(Project.id, Project.name, Project.sonar_project_key, Project.sonar_token)
+        .where(Project.sonar_project_key.is_not(None), Project.sonar_token.is_not(None))
+        .execution_options(yield_per=100)
+    )
     async with AsyncSessionLocal() as db:
-        result = await db.execute(select(Project))
-        projects = result.scalars().all()
-        
-        for project in projects:
-            if not project.sonar_project_key or not project.sonar_token:
-                logger.debug(f"Skipping Sonar sync for project {project.name} (Not configured)")
-                continue
-                
-            logger.info(f"Syncing Sonar metrics for project: {project.name}")
-            sonar = SonarService(project.sonar_project_key, project.sonar_token)
-            metrics = await sonar.get_metrics()
-            
-            if metrics:
-                await db.execute(
-                    update(Project)
-                    .where(Project.id == project.id)
-                    .values(sonar_metrics=metrics)
-                )
-                logger.info(f"Successfully synced metrics for {project.name}: {metrics}")
-        
-        await db.commit()
-    
-    logger.info("SonarCloud sync complete.")
+        rows = [row async for row in await db.stream(query) if row.sonar_project_key and row.sonar_token]
+
+    limit = asyncio.Semaphore(settings.SONAR_SYNC_CONCURRENCY)
+    results = await asyncio.gather(*(_fetch_sonar_metrics(row, limit) for row in rows))
+    synced: List[Tuple[Any, Dict[str, int]]] = [r for r in results if r is not None]
+
+    if synced:
+        # One UPDATE ... FROM (VALUES ...) for the whole run
+        fresh = values(
+            column("id", UUID(as_uuid=True)), column("metrics", JSONB), name="fresh"
+        ).data(synced)
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Project)
+                .where(Project.id == fresh.c.id)
+                .values(sonar_metrics=fresh.c.metrics)
+            )
+            await db.commit()
+
+    logger.info(
+        f"SonarCloud sync complete: {len(synced)} synced, {len(rows) - len(synced)} failed "
+        f"of {len(rows)} configured projects."
+    )
 
 def start_scheduler():
     scheduler = AsyncIOScheduler()
     # Run sync every hour
     scheduler.add_job(sync_all_sonar_projects, 'interval', hours=1)
+    # Premake next months' run partitions, archive and drop expired ones
+    scheduler.add_job(partitions.maintain, 'interval', days=1)
     scheduler.start()
-    logger.info("🚀 APScheduler started (Sonar Sync: every 1 hour)")
+    logger.info("🚀 APScheduler started (Sonar Sync: every 1 hour, Run partitions: daily)")
     return scheduler
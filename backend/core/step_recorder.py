@@ -0,0 +1,149 @@
+"""
+StepRecorder — buffered, batched persistence of AgentRunStep rows.
+
+The ReAct loop only enqueues: ids are generated client-side, so an insert and its
+later update never need a round trip to learn the primary key. A background writer
+drains the bounded queue and writes each batch on its own short session, as one
+multi-row Core INSERT plus executemany UPDATEs (an update whose insert is in the same
+batch is folded into the insert). close() flushes whatever is left.
+
+A batch that fails is retried once on a fresh session. If the retry fails too, the
+operations are dropped and counted (step_write_failures_total), and leaving the
+recorder's context raises, so the run fails rather than succeeding with missing steps.
+
+The AgentRun row must be committed before steps reach the writer's session. The session
+factory is the run's own (Orchestrator.session_factory), so steps commit wherever the run
+does — inside replay's rolled-back transaction, for instance.
+"""
+import asyncio
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, insert, update
+
+from backend.core import metrics
+from backend.core.logging import get_logger
+from backend.db.models import AgentRunStep
+
+logger = get_logger(__name__)
+
+MAX_QUEUE_SIZE = 1000
+MAX_BATCH_SIZE = 200
+
+_table = AgentRunStep.__table__
+_STOP = object()
+
+# Step operations whose batch failed: outcome="retried" (written on the retry) or "dropped"
+STEP_WRITE_FAILURES = metrics.counter("step_write_failures_total")
+
+
+class StepRecorder:
+    def __init__(self, session_factory: Callable, max_queue: int = MAX_QUEUE_SIZE):
+        self.session_factory = session_factory
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._writer: Optional[asyncio.Task] = None
+        self.failed_ops = 0
+
+    async def __aenter__(self) -> "StepRecorder":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+        if self.failed_ops and exc_type is None:
+            raise RuntimeError(f"{self.failed_ops} agent step operations could not be persisted")
+
+    def start(self) -> None:
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._run())
+
+    async def add(self, **fields: Any) -> uuid.UUID:
+        """Queues a new step row and returns its id. Only waits if the queue is full."""
+        row = {
+            "id": uuid.uuid4(),
+            "step_number": 1,
+            "thought": None,
+            "tool_called": None,
+            "tool_input": None,
+            "tool_output": None,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "cache_hits": 0,
+            "status": "PENDING",
+            "created_at": datetime.utcnow(),
+            **fields,
+        }
+        await self._queue.put(("insert", row))
+        return row["id"]
+
+    async def update(self, step_id: uuid.UUID, **fields: Any) -> None:
+        await self._queue.put(("update", {"id": step_id, **fields}))
+
+    async def close(self) -> None:
+        """Writes everything queued so far and stops the writer."""
+        if self._writer is None:
+            return
+        await self._queue.put((_STOP, None))
+        await self._writer
+        self._writer = None
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[Tuple[Any, Any]] = [await self._queue.get()]
+            while len(batch) < MAX_BATCH_SIZE and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            if batch[-1][0] is _STOP:
+                stopping = True
+                batch.pop()
+            if batch:
+                await self._write(batch)
+
+    async def _write(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        inserts: Dict[uuid.UUID, Dict[str, Any]] = {}
+        updates: List[Dict[str, Any]] = []
+        for op, row in batch:
+            if op == "insert":
+                inserts[row["id"]] = row
+            elif row["id"] in inserts:
+                inserts[row["id"]].update(row)
+            else:
+                updates.append(row)
+
+        for attempt in (1, 2):
+            try:
+                await self._write_once(list(inserts.values()), updates)
+            except Exception as e:
+                logger.error(
+                    f"[StepRecorder] Failed to write {len(batch)} step operations (attempt {attempt}): {e}"
+                )
+                continue
+            if attempt > 1:
+                STEP_WRITE_FAILURES.inc(len(batch), outcome="retried")
+            return
+        self.failed_ops += len(batch)
+        STEP_WRITE_FAILURES.inc(len(batch), outcome="dropped")
+
+    async def _write_once(self, inserts: List[Dict[str, Any]], updates: List[Dict[str, Any]]) -> None:
+        async with self.session_factory() as db:
+            if inserts:
+                await db.execute(insert(_table), inserts)
+            # executemany needs one statement per distinct column set
+            by_columns: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+            for row in updates:
+                columns = tuple(sorted(k for k in row if k != "id"))
+                by_columns.setdefault(columns, []).append(row)
+            for columns, rows in by_columns.items():
+                # Bind names can't shadow column names in a SET clause
+                stmt = (
+                    update(_table)
+                    .where(_table.c.id == bindparam("step_id"))
+                    .values({column: bindparam(f"new_{column}") for column in columns})
+                )
+                params = [
+                    {"step_id": row["id"], **{f"new_{column}": row[column] for column in columns}}
+                    for row in rows
+                ]
+                await db.execute(stmt, params)
+            await db.commit()
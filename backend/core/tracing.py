@@ -0,0 +1,192 @@
+"""
+Lightweight tracing — OpenTelemetry-compatible spans without the SDK.
+
+Spans nest through a context variable, so a span opened inside an agent's asyncio task
+is a child of the agent span. Finished traces are exported as OTLP/JSON, either appended
+to TRACE_FILE_PATH (one export request per line) or POSTed to TRACE_OTLP_ENDPOINT.
+
+A span opened with collect=True (the agent span in Orchestrator.run_agent) also sums the
+time of its descendants per category (llm, github, sonar, smtp, db) into a latency
+breakdown that is stored on the AgentRun.
+"""
+import asyncio
+import functools
+import inspect
+import json
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+import httpx
+
+from backend.config import get_settings
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+SERVICE_NAME = "ai-orchestrator"
+
+_current: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+_finished: Dict[str, List["Span"]] = {}
+# OTLP POSTs in flight: the loop only holds tasks weakly, and shutdown drains them
+_exports: Set[asyncio.Task] = set()
+
+
+class Span:
+    def __init__(self, name: str, parent: Optional["Span"], category: Optional[str], collect: bool, attributes: dict):
+        self.name = name
+        self.parent = parent
+        self.category = category
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.attributes = dict(attributes)
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+        self._collected: Optional[Dict[str, float]] = {} if collect else None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns or time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def breakdown(self) -> Dict[str, float]:
+        """Milliseconds per category spent under this span, plus total and uncategorised time."""
+        collected = dict(self._collected or {})
+        total = self.duration_ms
+        summary = {f"{category}_ms": round(ms, 1) for category, ms in collected.items()}
+        summary["other_ms"] = round(max(total - sum(collected.values()), 0.0), 1)
+        summary["total_ms"] = round(total, 1)
+        return summary
+
+    def _report_to_collector(self) -> None:
+        # Nested spans of the same category (a GitHub call made by another GitHub call) count once
+        ancestor = self.parent
+        while ancestor is not None:
+            if ancestor.category == self.category:
+                return
+            if ancestor._collected is not None:
+                ancestor._collected[self.category] = ancestor._collected.get(self.category, 0.0) + self.duration_ms
+                return
+            ancestor = ancestor.parent
+
+    def to_otlp(self) -> dict:
+        data = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": {"stringValue": str(value)}}
+                for key, value in self.attributes.items()
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent:
+            data["parentSpanId"] = self.parent.span_id
+        return data
+
+
+@contextmanager
+def span(name: str, category: Optional[str] = None, collect: bool = False, **attributes: Any) -> Iterator[Span]:
+    """Opens a child of the current span (or a new trace) for the enclosed block."""
+    parent = _current.get()
+    current = Span(name, parent, category, collect, attributes)
+    if category:
+        current.set_attribute("category", category)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current.reset(token)
+        if category:
+            current._report_to_collector()
+        _finish(current)
+
+
+def traced(name: Optional[str] = None, category: Optional[str] = None) -> Callable:
+    """Decorator form of span() for async functions."""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(span_name, category=category):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def trace_methods(category: str) -> Callable:
+    """Class decorator: wraps every public async method in a span named Class.method."""
+    def decorator(cls: type) -> type:
+        for attr, value in list(vars(cls).items()):
+            if not attr.startswith("_") and inspect.iscoroutinefunction(value):
+                setattr(cls, attr, traced(f"{cls.__name__}.{attr}", category=category)(value))
+        return cls
+    return decorator
+
+
+def current_trace_id() -> Optional[str]:
+    current = _current.get()
+    return current.trace_id if current else None
+
+
+def _finish(finished: Span) -> None:
+    if settings.TRACE_EXPORTER == "none":
+        return
+    root = finished
+    while root.parent is not None:
+        root = root.parent
+    if root is not finished and root.end_ns is not None:
+        # Outlived its trace (e.g. work spawned from a finished request): export on its own
+        _export([finished])
+        return
+    _finished.setdefault(finished.trace_id, []).append(finished)
+    if root is finished:
+        _export(_finished.pop(finished.trace_id))
+
+
+def _export(spans: List[Span]) -> None:
+    payload = {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "backend.core.tracing"}, "spans": [s.to_otlp() for s in spans]}],
+        }]
+    }
+    try:
+        if settings.TRACE_EXPORTER == "file":
+            with open(settings.TRACE_FILE_PATH, "a", encoding="utf-8") as f:
+                f.write(json.dumps(payload) + "\n")
+        elif settings.TRACE_EXPORTER == "otlp":
+            task = asyncio.get_running_loop().create_task(_post(payload))
+            _exports.add(task)
+            task.add_done_callback(_exports.discard)
+    except Exception as e:
+        logger.warning(f"[Tracing] Failed to export {len(spans)} spans: {e}")
+
+
+async def _post(payload: dict) -> None:
+    try:
+        async with httpx.AsyncClient(timeout=5) as client:
+            await client.post(settings.TRACE_OTLP_ENDPOINT, json=payload)
+    except Exception as e:
+        logger.warning(f"[Tracing] OTLP export failed: {e}")
+
+
+async def flush() -> None:
+    """Waits for OTLP exports still in flight (called on shutdown)."""
+    if _exports:
+        await asyncio.gather(*_exports, return_exceptions=True)
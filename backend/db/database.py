@@ -1,9 +1,15 @@
+import time
+from typing import AsyncGenerator, Optional
+
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
-from typing import AsyncGenerator
+from sqlalchemy.orm import DeclarativeBase, Session
 from backend.config import get_settings
+from backend.core import metrics
+from backend.core.logging import get_logger
 
 settings = get_settings()
+logger = get_logger(__name__)
 
 engine = create_async_engine(
     settings.DATABASE_URL,
@@ -19,6 +25,21 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Read-only GET routes use the standby when one is configured; otherwise this is the primary
+read_engine = create_async_engine(
+    settings.DATABASE_REPLICA_URL,
+    echo=False,
+    pool_pre_ping=True,
+    pool_size=10,
+    max_overflow=20,
+) if settings.DATABASE_REPLICA_URL else engine
+
+ReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
 
 class Base(DeclarativeBase):
     pass
@@ -34,3 +55,93 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
         finally:
             await session.close()
+
+
+# ── Read routing ─────────────────────────────────────────────────────────────
+# Replication lag is sampled at most every REPLICA_LAG_CHECK_SECONDS. Reads stay on the
+# primary while the standby lags more than REPLICA_MAX_LAG_SECONDS, and for a lag's worth
+# of time after this process commits a write, so a client reads what it just executed.
+# (Writes made by other API processes aren't seen here; they are covered by the lag cap.)
+
+_last_write_at = 0.0
+_replica_lag: Optional[float] = None
+_lag_checked_at = 0.0
+
+read_routing = metrics.counter("db_read_routing_total")
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_write(session: Session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _record_write(session: Session) -> None:
+    global _last_write_at
+    if session.info.pop("wrote", False):
+        _last_write_at = time.time()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_write(session: Session) -> None:
+    session.info.pop("wrote", None)
+
+
+async def _replica_lag_seconds() -> Optional[float]:
+    """Seconds the standby is behind (0 when caught up); None if it can't be reached."""
+    global _replica_lag, _lag_checked_at
+    if time.monotonic() - _lag_checked_at < settings.REPLICA_LAG_CHECK_SECONDS:
+        return _replica_lag
+    _lag_checked_at = time.monotonic()
+    try:
+        async with read_engine.connect() as conn:
+            lag = (await conn.execute(text(
+                "SELECT CASE WHEN NOT pg_is_in_recovery() "
+                "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+            ))).scalar()
+        _replica_lag = float(lag or 0)
+    except Exception as e:
+        if _replica_lag is not None:
+            logger.warning(f"[Database] Replica lag check failed, reading from primary: {e}")
+        _replica_lag = None
+    return _replica_lag
+
+
+async def _read_target() -> str:
+    if read_engine is engine:
+        return "primary"
+    lag = await _replica_lag_seconds()
+    if lag is None:
+        reason = "replica_unavailable"
+    elif lag > settings.REPLICA_MAX_LAG_SECONDS:
+        reason = "replica_lagging"
+    elif time.time() - _last_write_at <= lag + settings.REPLICA_LAG_CHECK_SECONDS:
+        reason = "recent_write"
+    else:
+        read_routing.inc(target="replica", reason="ok")
+        return "replica"
+    read_routing.inc(target="primary", reason=reason)
+    return "primary"
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only routes: the standby when it is fresh enough, else the primary."""
+    factory = ReadSessionLocal if await _read_target() == "replica" else AsyncSessionLocal
+    async with factory() as session:
+        yield session
+
+
+def _pool_gauges() -> list:
+    engines = {"primary": engine} if read_engine is engine else {"primary": engine, "replica": read_engine}
+    series = []
+    for label, eng in engines.items():
+        pool = eng.pool
+        for stat in ("size", "checkedin", "checkedout", "overflow"):
+            series.append({"labels": {"engine": label, "stat": stat}, "value": getattr(pool, stat)()})
+    if read_engine is not engine:
+        series.append({"labels": {"engine": "replica", "stat": "lag_seconds"}, "value": _replica_lag})
+    return series
+
+
+metrics.gauge("db_pool", _pool_gauges)
@@ -2,6 +2,7 @@
 Alembic environment for async PostgreSQL migrations.
 """
 import asyncio
+import re
 from logging.config import fileConfig
 
 from alembic import context
@@ -20,11 +21,21 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+# Monthly / default partitions are managed at runtime by backend.core.partitions
+PARTITION_NAME = re.compile(r"^(agent_runs|agent_run_steps)_(y\d{4}m\d{2}|default)(_|$)")
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    if reflected and name and PARTITION_NAME.match(name):
+        return False
+    return True
+
 
 def run_migrations_offline() -> None:
     context.configure(
         url=settings.DATABASE_URL,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -33,7 +44,7 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection):
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
     with context.begin_transaction():
         context.run_migrations()
 
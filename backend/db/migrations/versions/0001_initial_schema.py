@@ -0,0 +1,111 @@
+"""initial schema
+
+The baseline schema: projects, tasks, agent_runs and agent_run_steps as the development
+create_all() built them before migrations were introduced. Such databases are stamped
+at this revision and then upgraded (0001a adds what came later, skipping what exists):
+    alembic -c backend/alembic.ini stamp 0001
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 10:16:43
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table("projects",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("github_repos", sa.JSON(), nullable=True),
+        sa.Column("services_context", sa.JSON(), nullable=True),
+        sa.Column("coding_guidelines", sa.Text(), nullable=True),
+        sa.Column("sonar_project_key", sa.String(length=200), nullable=True),
+        sa.Column("sonar_token", sa.String(length=500), nullable=True),
+        sa.Column("sonar_metrics", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id")
+    )
+
+    op.create_table("tasks",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("project_id", sa.UUID(), nullable=True),
+        sa.Column("title", sa.String(length=500), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("acceptance_criteria", sa.Text(), nullable=True),
+        sa.Column("deadline", sa.String(length=100), nullable=True),
+        sa.Column("priority", sa.String(length=50), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("approved", sa.Boolean(), nullable=False),
+        sa.Column("github_repo", sa.String(length=200), nullable=True),
+        sa.Column("github_issue_id", sa.String(length=50), nullable=True),
+        sa.Column("github_issue_url", sa.String(length=500), nullable=True),
+        sa.Column("email_sent", sa.Boolean(), nullable=True),
+        sa.Column("github_pr_id", sa.String(length=50), nullable=True),
+        sa.Column("github_pr_url", sa.String(length=500), nullable=True),
+        sa.Column("branch_name", sa.String(length=200), nullable=True),
+        sa.Column("pr_reviewed", sa.Boolean(), nullable=True),
+        sa.Column("tests_passed", sa.Boolean(), nullable=True),
+        sa.Column("test_report_url", sa.String(length=500), nullable=True),
+        sa.Column("image_tag", sa.String(length=200), nullable=True),
+        sa.Column("image_built_at", sa.DateTime(), nullable=True),
+        sa.Column("build_status", sa.String(length=50), nullable=True),
+        sa.Column("build_logs_url", sa.String(length=500), nullable=True),
+        sa.Column("docker_image_url", sa.String(length=500), nullable=True),
+        sa.Column("deployed_at", sa.DateTime(), nullable=True),
+        sa.Column("deploy_environment", sa.String(length=100), nullable=True),
+        sa.Column("deployment_status", sa.String(length=50), nullable=True),
+        sa.Column("deployment_url", sa.String(length=500), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"]),
+        sa.PrimaryKeyConstraint("id")
+    )
+
+    op.create_table("agent_runs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("task_id", sa.UUID(), nullable=False),
+        sa.Column("agent_name", sa.String(length=100), nullable=False),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("input_context", sa.JSON(), nullable=True),
+        sa.Column("output", sa.JSON(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"]),
+        sa.PrimaryKeyConstraint("id")
+    )
+
+    op.create_table("agent_run_steps",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("agent_run_id", sa.UUID(), nullable=False),
+        sa.Column("step_number", sa.Integer(), nullable=False),
+        sa.Column("thought", sa.Text(), nullable=True),
+        sa.Column("tool_called", sa.String(length=100), nullable=True),
+        sa.Column("tool_input", sa.JSON(), nullable=True),
+        sa.Column("tool_output", sa.Text(), nullable=True),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=True),
+        sa.Column("completion_tokens", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["agent_run_id"], ["agent_runs.id"]),
+        sa.PrimaryKeyConstraint("id")
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("agent_run_steps")
+    op.drop_table("agent_runs")
+    op.drop_table("tasks")
+    op.drop_table("projects")
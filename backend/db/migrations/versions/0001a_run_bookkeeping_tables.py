@@ -0,0 +1,74 @@
+"""run bookkeeping tables
+
+Tables and columns added after the baseline schema, before migrations were introduced:
+  - context_blobs (out-of-line AgentRun context values)
+  - idempotency_records (single-flight locks and cached responses)
+  - agent_runs.time_budget_seconds, trace_id, latency_breakdown
+  - agent_run_steps.cache_hits
+
+A database stamped at 0001 may have been created by create_all() at any point in
+between, so each one is only added when missing.
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-19 10:21:05
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0001a"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RUN_COLUMNS = [
+    sa.Column("time_budget_seconds", sa.Float(), nullable=True),
+    sa.Column("trace_id", sa.String(length=32), nullable=True),
+    sa.Column("latency_breakdown", sa.JSON(), nullable=True),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    if "context_blobs" not in tables:
+        op.create_table("context_blobs",
+            sa.Column("hash", sa.String(length=64), nullable=False),
+            sa.Column("data", sa.LargeBinary(), nullable=False),
+            sa.Column("size_bytes", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint("hash")
+        )
+
+    if "idempotency_records" not in tables:
+        op.create_table("idempotency_records",
+            sa.Column("key", sa.String(length=300), nullable=False),
+            sa.Column("status", sa.String(length=50), nullable=False),
+            sa.Column("response", sa.JSON(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("completed_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("key")
+        )
+
+    run_columns = {column["name"] for column in inspector.get_columns("agent_runs")}
+    for column in RUN_COLUMNS:
+        if column.name not in run_columns:
+            op.add_column("agent_runs", column)
+
+    step_columns = {column["name"] for column in inspector.get_columns("agent_run_steps")}
+    if "cache_hits" not in step_columns:
+        # Existing steps were never served from the memo cache
+        op.add_column("agent_run_steps", sa.Column("cache_hits", sa.Integer(), nullable=False, server_default="0"))
+        op.alter_column("agent_run_steps", "cache_hits", server_default=None)
+
+
+def downgrade() -> None:
+    op.drop_column("agent_run_steps", "cache_hits")
+    for column in reversed(RUN_COLUMNS):
+        op.drop_column("agent_runs", column.name)
+    op.drop_table("idempotency_records")
+    op.drop_table("context_blobs")
@@ -0,0 +1,46 @@
+"""hot path indexes
+
+Secondary indexes for the dashboard poll and list endpoints:
+  - list_agent_runs:       agent_runs (task_id, started_at, id) / (started_at, id)
+  - list_agent_run_steps:  agent_run_steps (agent_run_id, step_number)
+  - list_tasks:            tasks (project_id, created_at, id) / (created_at, id)
+  - sync_tasks:            tasks (github_pr_id), tasks (status)
+
+Built CONCURRENTLY so upgrading a live database doesn't block writes.
+
+Revision ID: 0002
+Revises: 0001a
+Create Date: 2026-10-19 10:30:12
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_agent_runs_task_id_started_at", "agent_runs", ["task_id", "started_at", "id"]),
+    ("ix_agent_runs_started_at", "agent_runs", ["started_at", "id"]),
+    ("ix_agent_run_steps_agent_run_id_step_number", "agent_run_steps", ["agent_run_id", "step_number"]),
+    ("ix_tasks_project_id_created_at", "tasks", ["project_id", "created_at", "id"]),
+    ("ix_tasks_created_at", "tasks", ["created_at", "id"]),
+    ("ix_tasks_status", "tasks", ["status"]),
+    ("ix_tasks_github_pr_id", "tasks", ["github_pr_id"]),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,77 @@
+"""jsonb columns
+
+Converts the JSON columns that are searched (project services context / Sonar metrics,
+agent run input / output, step tool input) to JSONB and adds GIN indexes so containment
+filters (@>) run in Postgres. jsonb_path_ops indexes only serve @>, which is all the
+API issues, and are much smaller than the default operator class.
+
+The type change rewrites each table under an ACCESS EXCLUSIVE lock; the indexes are
+then built CONCURRENTLY.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 11:05:40
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = [
+    ("projects", "services_context"),
+    ("projects", "sonar_metrics"),
+    ("agent_runs", "input_context"),
+    ("agent_runs", "output"),
+    ("agent_run_steps", "tool_input"),
+]
+
+GIN_INDEXES = [
+    ("ix_agent_runs_output", "agent_runs", "output"),
+    ("ix_agent_runs_input_context", "agent_runs", "input_context"),
+    ("ix_agent_run_steps_tool_input", "agent_run_steps", "tool_input"),
+]
+
+
+def upgrade() -> None:
+    for table, column in COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=postgresql.JSONB(), existing_type=sa.JSON(),
+            postgresql_using=f"{column}::jsonb",
+        )
+
+    with op.get_context().autocommit_block():
+        for name, table, column in GIN_INDEXES:
+            op.create_index(
+                name, table, [column],
+                postgresql_using="gin", postgresql_ops={column: "jsonb_path_ops"},
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+        op.create_index(
+            "ix_agent_run_steps_tool_called", "agent_run_steps", ["tool_called"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_agent_run_steps_tool_called", table_name="agent_run_steps",
+            postgresql_concurrently=True, if_exists=True,
+        )
+        for name, table, _ in reversed(GIN_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+    for table, column in reversed(COLUMNS):
+        op.alter_column(
+            table, column,
+            type_=sa.JSON(), existing_type=postgresql.JSONB(),
+            postgresql_using=f"{column}::json",
+        )
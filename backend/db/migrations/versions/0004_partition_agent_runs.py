@@ -0,0 +1,165 @@
+"""partition agent runs
+
+Rebuilds agent_runs (by started_at) and agent_run_steps (by created_at) as monthly
+range-partitioned tables:
+  - primary keys become (id, started_at) / (id, created_at), since a partitioned
+    table's unique constraints must include the partition key;
+  - agent_run_steps.agent_run_id loses its foreign key for the same reason (the ORM
+    relationship still joins on it);
+  - agent_runs.started_at becomes NOT NULL (runs without one take completed_at / now()).
+
+Existing rows are copied into one partition per month they span, plus a DEFAULT
+partition; backend.core.partitions keeps creating months ahead after this. The copy
+holds ACCESS EXCLUSIVE locks on both tables for its duration — run it in a maintenance
+window on large databases.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 11:48:02
+"""
+from datetime import date, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PREMAKE_MONTHS = 2
+
+RUN_COLUMNS = (
+    "id, task_id, agent_name, status, input_context, output, error_message, "
+    "time_budget_seconds, trace_id, latency_breakdown, started_at, completed_at"
+)
+STEP_COLUMNS = (
+    "id, agent_run_id, step_number, thought, tool_called, tool_input, tool_output, "
+    "prompt_tokens, completion_tokens, cache_hits, status, created_at"
+)
+
+INDEXES = [
+    ("ix_agent_runs_task_id_started_at", "agent_runs", ["task_id", "started_at", "id"], {}),
+    ("ix_agent_runs_started_at", "agent_runs", ["started_at", "id"], {}),
+    ("ix_agent_runs_output", "agent_runs", ["output"],
+     {"postgresql_using": "gin", "postgresql_ops": {"output": "jsonb_path_ops"}}),
+    ("ix_agent_runs_input_context", "agent_runs", ["input_context"],
+     {"postgresql_using": "gin", "postgresql_ops": {"input_context": "jsonb_path_ops"}}),
+    ("ix_agent_run_steps_agent_run_id_step_number", "agent_run_steps", ["agent_run_id", "step_number"], {}),
+    ("ix_agent_run_steps_tool_called", "agent_run_steps", ["tool_called"], {}),
+    ("ix_agent_run_steps_tool_input", "agent_run_steps", ["tool_input"],
+     {"postgresql_using": "gin", "postgresql_ops": {"tool_input": "jsonb_path_ops"}}),
+]
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_tables(partitioned: bool) -> None:
+    run_kwargs = {"postgresql_partition_by": "RANGE (started_at)"} if partitioned else {}
+    step_kwargs = {"postgresql_partition_by": "RANGE (created_at)"} if partitioned else {}
+    run_pk = ("id", "started_at") if partitioned else ("id",)
+    step_pk = ("id", "created_at") if partitioned else ("id",)
+
+    op.create_table("agent_runs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("task_id", sa.UUID(), nullable=False),
+        sa.Column("agent_name", sa.String(length=100), nullable=False),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("input_context", postgresql.JSONB(), nullable=True),
+        sa.Column("output", postgresql.JSONB(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("time_budget_seconds", sa.Float(), nullable=True),
+        sa.Column("trace_id", sa.String(length=32), nullable=True),
+        sa.Column("latency_breakdown", sa.JSON(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=not partitioned),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"]),
+        sa.PrimaryKeyConstraint(*run_pk),
+        **run_kwargs,
+    )
+
+    step_fk = [] if partitioned else [sa.ForeignKeyConstraint(["agent_run_id"], ["agent_runs.id"])]
+    op.create_table("agent_run_steps",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("agent_run_id", sa.UUID(), nullable=False),
+        sa.Column("step_number", sa.Integer(), nullable=False),
+        sa.Column("thought", sa.Text(), nullable=True),
+        sa.Column("tool_called", sa.String(length=100), nullable=True),
+        sa.Column("tool_input", postgresql.JSONB(), nullable=True),
+        sa.Column("tool_output", sa.Text(), nullable=True),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=True),
+        sa.Column("completion_tokens", sa.Integer(), nullable=True),
+        sa.Column("cache_hits", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        *step_fk,
+        sa.PrimaryKeyConstraint(*step_pk),
+        **step_kwargs,
+    )
+
+    for name, table, columns, kwargs in INDEXES:
+        op.create_index(name, table, columns, **kwargs)
+
+
+def _set_aside_tables() -> None:
+    """Renames the current tables to *_old, freeing the table, index and key names."""
+    for name, table, _, _ in INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
+    op.drop_constraint("agent_run_steps_agent_run_id_fkey", "agent_run_steps", type_="foreignkey")
+    for table in ("agent_runs", "agent_run_steps"):
+        op.rename_table(table, f"{table}_old")
+        op.execute(f"ALTER TABLE {table}_old RENAME CONSTRAINT {table}_pkey TO {table}_old_pkey")
+
+
+def _create_partitions(table: str, column: str) -> None:
+    bind = op.get_bind()
+    oldest = bind.execute(sa.text(f"SELECT min({column}) FROM {table}_old")).scalar()
+    now = datetime.utcnow()
+    month = date((oldest or now).year, (oldest or now).month, 1)
+    last = _add_months(date(now.year, now.month, 1), PREMAKE_MONTHS)
+
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE {table}_y{month.year}m{month.month:02d} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+
+
+def upgrade() -> None:
+    op.execute("UPDATE agent_runs SET started_at = COALESCE(completed_at, now()) WHERE started_at IS NULL")
+    _set_aside_tables()
+    _create_tables(partitioned=True)
+    _create_partitions("agent_runs", "started_at")
+    _create_partitions("agent_run_steps", "created_at")
+
+    op.execute(f"INSERT INTO agent_runs ({RUN_COLUMNS}) SELECT {RUN_COLUMNS} FROM agent_runs_old")
+    op.execute(f"INSERT INTO agent_run_steps ({STEP_COLUMNS}) SELECT {STEP_COLUMNS} FROM agent_run_steps_old")
+    op.drop_table("agent_run_steps_old")
+    op.drop_table("agent_runs_old")
+
+
+def downgrade() -> None:
+    for name, table, _, _ in INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
+    for table in ("agent_runs", "agent_run_steps"):
+        op.rename_table(table, f"{table}_old")
+        op.execute(f"ALTER TABLE {table}_old RENAME CONSTRAINT {table}_pkey TO {table}_old_pkey")
+
+    _create_tables(partitioned=False)
+    op.execute(f"INSERT INTO agent_runs ({RUN_COLUMNS}) SELECT {RUN_COLUMNS} FROM agent_runs_old")
+    # Steps whose run was archived can't satisfy the restored foreign key
+    op.execute(
+        f"INSERT INTO agent_run_steps ({STEP_COLUMNS}) SELECT {STEP_COLUMNS} FROM agent_run_steps_old s "
+        "WHERE EXISTS (SELECT 1 FROM agent_runs r WHERE r.id = s.agent_run_id)"
+    )
+    # Dropping a partitioned table drops its partitions
+    op.drop_table("agent_run_steps_old")
+    op.drop_table("agent_runs_old")
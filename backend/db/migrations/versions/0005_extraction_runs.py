@@ -0,0 +1,51 @@
+"""extraction runs
+
+Adds extraction_runs, which own DiscussionAgent runs in place of the placeholder task
+the extract endpoint used to insert and delete. agent_runs.task_id becomes nullable,
+with exactly one of task_id / extraction_run_id set.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 12:40:15
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table("extraction_runs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("project_id", sa.UUID(), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("transcript_chars", sa.Integer(), nullable=True),
+        sa.Column("task_count", sa.Integer(), nullable=False),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"]),
+        sa.PrimaryKeyConstraint("id")
+    )
+
+    op.add_column("agent_runs", sa.Column("extraction_run_id", sa.UUID(), nullable=True))
+    op.create_foreign_key(
+        "agent_runs_extraction_run_id_fkey", "agent_runs", "extraction_runs", ["extraction_run_id"], ["id"],
+    )
+    op.alter_column("agent_runs", "task_id", existing_type=sa.UUID(), nullable=True)
+    op.create_check_constraint("ck_agent_runs_owner", "agent_runs", "(task_id IS NULL) <> (extraction_run_id IS NULL)")
+
+
+def downgrade() -> None:
+    op.drop_constraint("ck_agent_runs_owner", "agent_runs", type_="check")
+    op.execute("DELETE FROM agent_runs WHERE task_id IS NULL")
+    op.alter_column("agent_runs", "task_id", existing_type=sa.UUID(), nullable=False)
+    op.drop_constraint("agent_runs_extraction_run_id_fkey", "agent_runs", type_="foreignkey")
+    op.drop_column("agent_runs", "extraction_run_id")
+    op.drop_table("extraction_runs")
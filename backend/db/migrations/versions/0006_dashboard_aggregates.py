@@ -0,0 +1,73 @@
+"""dashboard aggregates
+
+Adds task_status_counts and agent_run_daily_stats, the counters behind GET /api/stats,
+and fills them from the existing tasks and runs. From then on they are maintained by
+the application on every task / run transition (backend.core.dashboard_stats).
+
+Deploy with writers stopped (or accept a few transitions of drift): transitions
+committed between the backfill and the new code going live are not counted.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 14:02:31
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NO_PROJECT = "00000000-0000-0000-0000-000000000000"
+
+
+def upgrade() -> None:
+    op.create_table("task_status_counts",
+        sa.Column("project_id", sa.UUID(), nullable=False),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("project_id", "status")
+    )
+    op.create_table("agent_run_daily_stats",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("project_id", sa.UUID(), nullable=False),
+        sa.Column("agent_name", sa.String(length=100), nullable=False),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("runs", sa.Integer(), nullable=False),
+        sa.Column("prompt_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("completion_tokens", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "project_id", "agent_name", "status")
+    )
+
+    op.execute(f"""
+        INSERT INTO task_status_counts (project_id, status, count)
+        SELECT COALESCE(project_id, '{NO_PROJECT}'), status, count(*)
+        FROM tasks GROUP BY 1, 2
+    """)
+    # Tokens of runs still in progress are added when they finish, as the application does
+    op.execute(f"""
+        INSERT INTO agent_run_daily_stats
+            (day, project_id, agent_name, status, runs, prompt_tokens, completion_tokens)
+        SELECT r.started_at::date,
+               COALESCE(t.project_id, e.project_id, '{NO_PROJECT}'),
+               r.agent_name, r.status, count(*),
+               COALESCE(sum(s.prompt_tokens) FILTER (WHERE r.status NOT IN ('PENDING', 'RUNNING')), 0),
+               COALESCE(sum(s.completion_tokens) FILTER (WHERE r.status NOT IN ('PENDING', 'RUNNING')), 0)
+        FROM agent_runs r
+        LEFT JOIN tasks t ON t.id = r.task_id
+        LEFT JOIN extraction_runs e ON e.id = r.extraction_run_id
+        LEFT JOIN (
+            SELECT agent_run_id, sum(prompt_tokens) AS prompt_tokens, sum(completion_tokens) AS completion_tokens
+            FROM agent_run_steps GROUP BY agent_run_id
+        ) s ON s.agent_run_id = r.id
+        GROUP BY 1, 2, 3, 4
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table("agent_run_daily_stats")
+    op.drop_table("task_status_counts")
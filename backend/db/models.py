@@ -1,9 +1,10 @@
 import uuid
 from datetime import datetime
 from sqlalchemy import (
-    Column, String, Boolean, DateTime, Text, ForeignKey, JSON, Integer
+    Column, String, Boolean, Date, DateTime, Text, ForeignKey, JSON, Integer, BigInteger, Float, LargeBinary,
+    Index, CheckConstraint,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 from backend.db.database import Base
 
@@ -22,13 +23,13 @@ class Project(Base):
     name = Column(String(200), nullable=False)
     description = Column(Text, nullable=True)
     github_repos = Column(JSON, default=list)        # e.g., ["org/backend", "org/frontend"]
-    services_context = Column(JSON, default=dict)    # Details about internal APIs, architecture, etc.
+    services_context = Column(JSONB, default=dict)   # Details about internal APIs, architecture, etc.
     coding_guidelines = Column(Text, nullable=True)  # Standards for the agent to follow
     
     # SonarCloud Integration
     sonar_project_key = Column(String(200), nullable=True)
     sonar_token = Column(String(500), nullable=True)
-    sonar_metrics = Column(JSON, default=dict) # e.g. {"bugs": 0, "vulnerabilities": 0, "code_smells": 0}
+    sonar_metrics = Column(JSONB, default=dict) # e.g. {"bugs": 0, "vulnerabilities": 0, "code_smells": 0}
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -48,6 +49,13 @@ class Task(Base):
       Phase 4: deployed_at, deploy_environment
     """
     __tablename__ = "tasks"
+    __table_args__ = (
+        # list_tasks: newest first, optionally per project (id breaks created_at ties)
+        Index("ix_tasks_project_id_created_at", "project_id", "created_at", "id"),
+        Index("ix_tasks_created_at", "created_at", "id"),
+        Index("ix_tasks_status", "status"),
+        Index("ix_tasks_github_pr_id", "github_pr_id"),  # sync_tasks
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=True) # nullable true for backward compat right now
@@ -112,32 +120,94 @@ class Task(Base):
         return f"<Task id={self.id} title={self.title!r} status={self.status}>"
 
 
+class ExtractionRun(Base):
+    """
+    One transcript extraction (DiscussionAgent run). Owns that agent run, since no task
+    exists until the extraction produces them.
+    """
+    __tablename__ = "extraction_runs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=True)
+
+    # RUNNING | COMPLETED | FAILED
+    status = Column(String(50), default="RUNNING", nullable=False)
+    transcript_chars = Column(Integer, nullable=True)
+    task_count = Column(Integer, default=0, nullable=False)
+    error_message = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    completed_at = Column(DateTime, nullable=True)
+
+    agent_runs = relationship("AgentRun", back_populates="extraction_run")
+
+    def __repr__(self):
+        return f"<ExtractionRun id={self.id} status={self.status} tasks={self.task_count}>"
+
+
 class AgentRun(Base):
     """
     Execution log for every agent invocation.
-    One task can have multiple agent runs (one per agent).
+    One task can have multiple agent runs (one per agent); extraction runs belong
+    to an ExtractionRun instead of a task.
     UI polls this table for real-time dashboard updates.
+
+    Range-partitioned by month on started_at (see backend.core.partitions), so the primary
+    key includes started_at; the ORM still identifies runs by id alone.
     """
     __tablename__ = "agent_runs"
+    __table_args__ = (
+        # Dashboard poll: newest runs, overall or for one task
+        Index("ix_agent_runs_task_id_started_at", "task_id", "started_at", "id"),
+        Index("ix_agent_runs_started_at", "started_at", "id"),
+        # Containment filters (output @> {...}); jsonb_path_ops only serves @>, at a fraction of the size
+        Index("ix_agent_runs_output", "output", postgresql_using="gin", postgresql_ops={"output": "jsonb_path_ops"}),
+        Index(
+            "ix_agent_runs_input_context", "input_context",
+            postgresql_using="gin", postgresql_ops={"input_context": "jsonb_path_ops"},
+        ),
+        CheckConstraint("(task_id IS NULL) <> (extraction_run_id IS NULL)", name="ck_agent_runs_owner"),
+        {"postgresql_partition_by": "RANGE (started_at)"},
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id"), nullable=False)
+    # Exactly one owner: the task, or the extraction that runs before any task exists
+    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id"), nullable=True)
+    extraction_run_id = Column(UUID(as_uuid=True), ForeignKey("extraction_runs.id"), nullable=True)
     agent_name = Column(String(100), nullable=False)  # e.g. "DiscussionAgent"
 
-    # Status: PENDING | RUNNING | COMPLETED | FAILED
+    # Status: PENDING | RUNNING | COMPLETED | FAILED | CANCELLED | TIMED_OUT
     status = Column(String(50), default="PENDING", nullable=False)
 
-    # Context in / out stored as JSONB for full observability
-    input_context = Column(JSON, nullable=True)
-    output = Column(JSON, nullable=True)
+    # Context in / out stored as JSONB for full observability.
+    # Large top-level values are replaced by {"$blob": "<sha256>"} refs into context_blobs,
+    # so SQL filters see small scalars (statuses, ids, urls) but not blob contents.
+    input_context = Column(JSONB, nullable=True)
+    output = Column(JSONB, nullable=True)
     error_message = Column(Text, nullable=True)
 
-    started_at = Column(DateTime, nullable=True)
+    # Deadline this run was given (its slice of the pipeline budget)
+    time_budget_seconds = Column(Float, nullable=True)
+
+    # Tracing: correlates with exported spans; per-category ms (llm, github, db, ...)
+    trace_id = Column(String(32), nullable=True)
+    latency_breakdown = Column(JSON, nullable=True)
+
+    started_at = Column(DateTime, primary_key=True, default=datetime.utcnow)  # partition key
     completed_at = Column(DateTime, nullable=True)
 
     # Relationships
     task = relationship("Task", back_populates="agent_runs")
-    steps = relationship("AgentRunStep", back_populates="agent_run", cascade=CASCADE_DELETE)
+    extraction_run = relationship("ExtractionRun", back_populates="agent_runs")
+    # No database FK: a foreign key into a partitioned table would have to carry started_at
+    steps = relationship(
+        "AgentRunStep",
+        back_populates="agent_run",
+        cascade=CASCADE_DELETE,
+        primaryjoin="AgentRun.id == foreign(AgentRunStep.agent_run_id)",
+    )
+
+    __mapper_args__ = {"primary_key": [id]}
 
     def __repr__(self):
         return f"<AgentRun agent={self.agent_name} task={self.task_id} status={self.status}>"
@@ -147,26 +217,117 @@ class AgentRunStep(Base):
     """
     Individual step within a single agent run.
     Provides fine-grained observability of the reasoning loop (ReAct). 
+    Range-partitioned by month on created_at, like agent_runs.
     """
     __tablename__ = "agent_run_steps"
+    __table_args__ = (
+        Index("ix_agent_run_steps_agent_run_id_step_number", "agent_run_id", "step_number"),
+        Index("ix_agent_run_steps_tool_called", "tool_called"),
+        Index(
+            "ix_agent_run_steps_tool_input", "tool_input",
+            postgresql_using="gin", postgresql_ops={"tool_input": "jsonb_path_ops"},
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    agent_run_id = Column(UUID(as_uuid=True), ForeignKey("agent_runs.id"), nullable=False)
+    agent_run_id = Column(UUID(as_uuid=True), nullable=False)  # agent_runs.id (not enforced, see AgentRun.steps)
     step_number = Column(Integer, default=1, nullable=False)
 
     thought = Column(Text, nullable=True)
     tool_called = Column(String(100), nullable=True)
-    tool_input = Column(JSON, nullable=True)
+    tool_input = Column(JSONB, nullable=True)
     tool_output = Column(Text, nullable=True)
 
     prompt_tokens = Column(Integer, default=0)
     completion_tokens = Column(Integer, default=0)
+    # 1 when the tool result was served from the run's memo cache (pure tools)
+    cache_hits = Column(Integer, default=0, nullable=False)
     
     status = Column(String(50), default="PENDING", nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)  # partition key
 
     # Relationships
-    agent_run = relationship("AgentRun", back_populates="steps")
+    agent_run = relationship(
+        "AgentRun",
+        back_populates="steps",
+        primaryjoin="AgentRun.id == foreign(AgentRunStep.agent_run_id)",
+    )
+
+    __mapper_args__ = {"primary_key": [id]}
 
     def __repr__(self):
         return f"<AgentRunStep run={self.agent_run_id} step={self.step_number} tool={self.tool_called}>"
+
+
+class IdempotencyRecord(Base):
+    """
+    Single-flight guard and response cache for execution endpoints.
+    IN_FLIGHT rows are keyed by the work scope (e.g. "pipeline:<task_id>") and removed on
+    completion; COMPLETED rows are keyed by the client's Idempotency-Key and keep the response.
+    """
+    __tablename__ = "idempotency_records"
+
+    key = Column(String(300), primary_key=True)
+    status = Column(String(50), default="IN_FLIGHT", nullable=False)  # IN_FLIGHT | COMPLETED
+    response = Column(JSON, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    completed_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<IdempotencyRecord key={self.key!r} status={self.status}>"
+
+
+class ContextBlob(Base):
+    """
+    Content-addressed store for large AgentRun context / output values.
+    Each distinct value is stored once (zlib-compressed canonical JSON) and referenced
+    from runs by its SHA-256, so guidelines, architecture docs and file maps aren't
+    duplicated across every run row.
+    """
+    __tablename__ = "context_blobs"
+
+    hash = Column(String(64), primary_key=True)  # sha256 of the uncompressed JSON
+    data = Column(LargeBinary, nullable=False)
+    size_bytes = Column(Integer, nullable=False)  # uncompressed size
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ContextBlob hash={self.hash[:12]} size={self.size_bytes}>"
+
+
+class TaskStatusCount(Base):
+    """
+    Dashboard aggregate: tasks currently in each status, per project.
+    Maintained incrementally (backend.core.dashboard_stats); tasks without a project
+    are counted under the zero UUID.
+    """
+    __tablename__ = "task_status_counts"
+
+    project_id = Column(UUID(as_uuid=True), primary_key=True)  # no FK: the zero UUID stands for "no project"
+    status = Column(String(50), primary_key=True)
+    count = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<TaskStatusCount project={self.project_id} status={self.status} count={self.count}>"
+
+
+class AgentRunDailyStats(Base):
+    """
+    Dashboard aggregate: agent runs by start day, project, agent and current status,
+    plus the LLM tokens spent by finished runs. Maintained incrementally like
+    TaskStatusCount; unlike agent_runs it is never archived, so totals outlive retention.
+    """
+    __tablename__ = "agent_run_daily_stats"
+
+    day = Column(Date, primary_key=True)  # leading key: GET /api/stats reads a window of days
+    project_id = Column(UUID(as_uuid=True), primary_key=True)
+    agent_name = Column(String(100), primary_key=True)
+    status = Column(String(50), primary_key=True)
+    runs = Column(Integer, default=0, nullable=False)
+    prompt_tokens = Column(BigInteger, default=0, nullable=False)
+    completion_tokens = Column(BigInteger, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<AgentRunDailyStats day={self.day} agent={self.agent_name} status={self.status} runs={self.runs}>"
@@ -7,8 +7,8 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from backend.config import get_settings
 from backend.core.logging import setup_logging, get_logger
-from backend.db.database import engine, Base
-from backend.api import discussion, approval, execution, agent_runs, projects
+from backend.db.database import engine, read_engine, Base
+from backend.api import discussion, approval, execution, agent_runs, projects, stats
 
 settings = get_settings()
 setup_logging()
@@ -16,6 +16,8 @@ logger = get_logger(__name__)
 
 
 from backend.core.scheduler import start_scheduler
+from backend.core import events, metrics, partitions, tracing
+from backend.services.github_service import close_shared_client
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -26,15 +28,26 @@ async def lifespan(app: FastAPI):
         if settings.APP_ENV == "development":
             await conn.run_sync(Base.metadata.create_all)
             logger.info("✅ Database tables ready")
+
+    # agent_runs / agent_run_steps need a partition for the current month before any insert
+    await partitions.ensure_partitions()
     
     # Start the background sync scheduler
     scheduler = start_scheduler()
+
+    # Cross-replica cache invalidation (Postgres LISTEN/NOTIFY)
+    await events.start_listener()
     
     yield
     
     # Shutdown
+    await events.stop_listener()
+    await tracing.flush()
+    await close_shared_client()
     scheduler.shutdown()
     await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
     logger.info("🛑 AI Orchestrator shut down")
 
 
@@ -60,8 +73,15 @@ app.include_router(discussion.router)
 app.include_router(approval.router)
 app.include_router(execution.router)
 app.include_router(agent_runs.router)
+app.include_router(stats.router)
 
 
 @app.get("/health", tags=["Health"])
 async def health():
     return {"status": "ok", "app": settings.APP_NAME, "env": settings.APP_ENV}
+
+
+@app.get("/metrics", tags=["Health"])
+async def get_metrics():
+    """In-process metrics for this replica (histograms / counters / gauges)."""
+    return metrics.snapshot()
@@ -1,17 +1,20 @@
 from pydantic import BaseModel
-from typing import Optional, Any
+from typing import Optional, Any, Dict
 from uuid import UUID
 from datetime import datetime
 
 
-class AgentRunResponse(BaseModel):
+class AgentRunSummary(BaseModel):
+    """Row shown by the dashboard poll — everything except the context / output payloads."""
     id: UUID
-    task_id: UUID
+    task_id: Optional[UUID] = None
+    extraction_run_id: Optional[UUID] = None  # set instead of task_id for DiscussionAgent runs
     agent_name: str
     status: str
-    input_context: Optional[Any]
-    output: Optional[Any]
     error_message: Optional[str]
+    time_budget_seconds: Optional[float] = None
+    trace_id: Optional[str] = None
+    latency_breakdown: Optional[Dict[str, float]] = None
     started_at: Optional[datetime]
     completed_at: Optional[datetime]
 
@@ -19,6 +22,11 @@ class AgentRunResponse(BaseModel):
         from_attributes = True
 
 
+class AgentRunResponse(AgentRunSummary):
+    input_context: Optional[Any]
+    output: Optional[Any]
+
+
 class AgentRunStepResponse(BaseModel):
     id: UUID
     agent_run_id: UUID
@@ -29,6 +37,7 @@ class AgentRunStepResponse(BaseModel):
     tool_output: Optional[str]
     prompt_tokens: int
     completion_tokens: int
+    cache_hits: int = 0
     status: str
     created_at: datetime
 
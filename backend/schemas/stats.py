@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from datetime import date
+from uuid import UUID
+
+
+class AgentStats(BaseModel):
+    runs_by_status: Dict[str, int] = Field(default_factory=dict)
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+class ProjectFailures(BaseModel):
+    project_id: Optional[UUID]  # None for runs of tasks without a project
+    failed_runs: int  # FAILED + TIMED_OUT
+
+
+class DailyRunStats(BaseModel):
+    day: date
+    runs: int = 0
+    failed_runs: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+class DashboardStats(BaseModel):
+    """Dashboard counters: task statuses as of now, runs started on or after `since`."""
+    since: date
+    tasks_by_status: Dict[str, int]
+    runs_by_status: Dict[str, int]
+    agents: Dict[str, AgentStats]
+    failures_by_project: List[ProjectFailures]
+    prompt_tokens: int
+    completion_tokens: int
+    daily: List[DailyRunStats]
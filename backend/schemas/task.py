@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
@@ -24,23 +24,33 @@ class TaskUpdate(BaseModel):
     github_repo: Optional[str] = None
 
 
-class TaskResponse(BaseModel):
+class TaskSummary(BaseModel):
+    """Fields the task lists and dashboard render; the full record comes from GET /api/tasks/{id}."""
     id: UUID
     project_id: Optional[UUID] = None
     title: str
     description: Optional[str]
-    acceptance_criteria: Optional[str]
     deadline: Optional[str]
     priority: str
     status: str
     approved: bool
+    github_repo: Optional[str] = None
     github_issue_id: Optional[str]
     github_issue_url: Optional[str]
-    email_sent: bool
-    github_repo: Optional[str] = None
-    # Phase 2+
     github_pr_id: Optional[str]
     github_pr_url: Optional[str]
+    error_message: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class TaskResponse(TaskSummary):
+    acceptance_criteria: Optional[str]
+    email_sent: bool
+    # Phase 2+
     branch_name: Optional[str]
     pr_reviewed: bool
     
@@ -60,12 +70,6 @@ class TaskResponse(BaseModel):
     deploy_environment: Optional[str] = None
     deployment_status: Optional[str] = None
     deployment_url: Optional[str] = None
-    error_message: Optional[str] = None
-    created_at: datetime
-    updated_at: datetime
-
-    class Config:
-        from_attributes = True
 
 
 class ExtractRequest(BaseModel):
@@ -77,3 +81,17 @@ class ExtractRequest(BaseModel):
 class ExtractResponse(BaseModel):
     tasks: list[TaskResponse]
     count: int
+    extraction_run_id: Optional[UUID] = None
+
+
+class BatchExecuteRequest(BaseModel):
+    """Either explicit task ids, or every approved, not-yet-executed task of a project."""
+    task_ids: Optional[list[UUID]] = None
+    project_id: Optional[UUID] = None
+    concurrency: Optional[int] = Field(None, ge=1, le=20, description="Defaults to BATCH_EXECUTION_CONCURRENCY")
+
+    @model_validator(mode="after")
+    def _one_selector(self) -> "BatchExecuteRequest":
+        if bool(self.task_ids) == bool(self.project_id):
+            raise ValueError("Provide exactly one of task_ids or project_id")
+        return self
@@ -2,19 +2,30 @@
 GeminiService — pure wrapper around Google GenAI API.
 No business logic here. Agents use this service.
 """
+import asyncio
+from functools import lru_cache
 from google import genai
 from google.genai import types
 from backend.config import get_settings
 from backend.core.logging import get_logger
+from backend.core import deadline, tracing
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+
+@lru_cache
+def get_genai_client() -> genai.Client:
+    """Process-wide client, so every agent (and every task in a batch) shares its connection pool."""
+    return genai.Client(api_key=settings.GEMINI_API_KEY)
+
+
 class GeminiService:
     def __init__(self):
-        self.client = genai.Client(api_key=settings.GEMINI_API_KEY)
+        self.client = get_genai_client()
         self.model = settings.GEMINI_MODEL
 
+    @tracing.traced("GeminiService.complete", category="llm")
     async def complete(self, prompt: str) -> str:
         """
         Send a prompt to Gemini and return the raw text response.
@@ -25,14 +36,15 @@ class GeminiService:
             # We use the synchronous generate_content because async might require aiogoogle or specific async client methods. 
             # The standard new API 'google-genai' uses client.models.generate_content.
             # To avoid blocking the event loop in a real production app we'd wrap it or use the async client if available (client.aio).
-            # We'll use the async client here:
-            response = await self.client.aio.models.generate_content(
-                model=self.model,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json"
+            # We'll use the async client here, bounded by the caller's remaining time budget:
+            async with asyncio.timeout(deadline.remaining()):
+                response = await self.client.aio.models.generate_content(
+                    model=self.model,
+                    contents=prompt,
+                    config=types.GenerateContentConfig(
+                        response_mime_type="application/json"
+                    )
                 )
-            )
             return response.text
         except Exception as e:
             logger.error(f"[GeminiService] Error calling Gemini API: {str(e)}")
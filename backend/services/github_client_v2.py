@@ -4,6 +4,7 @@ import time
 from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception_type
 from pydantic import BaseModel
 from typing import Dict, Any, List
+from backend.core import deadline, tracing
 
 class GitHubError(Exception):
     def __init__(self, message: str, status_code: int):
@@ -16,6 +17,7 @@ class PullRequestResponse(BaseModel):
     html_url: str
     state: str
 
+@tracing.trace_methods(category="github")
 class GitHubAppClient:
     def __init__(self, app_id: str, private_key: str, installation_id: str, repo: str):
         self.app_id = app_id
@@ -64,7 +66,7 @@ class GitHubAppClient:
             "X-GitHub-Api-Version": "2022-11-28"
         })
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with httpx.AsyncClient(timeout=deadline.timeout_for(30.0)) as client:
             response = await client.request(method, f"{self.base_url}/repos/{self.repo}/{endpoint}", headers=headers, **kwargs)
             
             if response.status_code >= 400:
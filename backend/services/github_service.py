@@ -2,16 +2,42 @@
 GitHubService — pure wrapper around GitHub REST API.
 No business logic. TicketAgent (and future PRAgent) use this.
 """
+from typing import Optional
+
 import httpx
 from backend.config import get_settings
 from backend.core.logging import get_logger
+from backend.core import deadline, tracing
 
 logger = get_logger(__name__)
 settings = get_settings()
 
 GITHUB_API_BASE = "https://api.github.com"
+GITHUB_TIMEOUT_SECONDS = 30
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def shared_client() -> httpx.AsyncClient:
+    """
+    One pooled client per process: concurrent pipelines (e.g. a batch execution) reuse
+    warm keep-alive connections to api.github.com instead of a TLS handshake per call.
+    Timeouts are passed per request, from the caller's deadline.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(limits=httpx.Limits(max_connections=50, max_keepalive_connections=20))
+    return _client
+
 
+async def close_shared_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
+
+@tracing.trace_methods(category="github")
 class GitHubService:
     def __init__(self, repo: str = None):
         repo_str = repo or settings.GITHUB_REPO
@@ -36,8 +62,8 @@ class GitHubService:
         if labels:
             payload["labels"] = labels
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(url, json=payload, headers=self.headers)
+        client, timeout = shared_client(), deadline.timeout_for(GITHUB_TIMEOUT_SECONDS)
+        response = await client.post(url, json=payload, headers=self.headers, timeout=timeout)
 
         if response.status_code not in (200, 201):
             raise RuntimeError(
@@ -48,8 +74,8 @@ class GitHubService:
     async def get_issue(self, issue_number: int) -> dict:
         """Fetch a GitHub issue by number."""
         url = f"{GITHUB_API_BASE}/repos/{self.repo}/issues/{issue_number}"
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(url, headers=self.headers)
+        client, timeout = shared_client(), deadline.timeout_for(GITHUB_TIMEOUT_SECONDS)
+        response = await client.get(url, headers=self.headers, timeout=timeout)
         response.raise_for_status()
         return response.json()
 
@@ -58,17 +84,17 @@ class GitHubService:
     # -------------------------------------------------------
     async def get_ref(self, ref: str = None) -> str:
         """Get the SHA of a specific reference. If ref is None, try heads/main then heads/master."""
-        async with httpx.AsyncClient(timeout=30) as client:
-            if ref:
-                url = f"{GITHUB_API_BASE}/repos/{self.repo}/git/ref/{ref}"
-                response = await client.get(url, headers=self.headers)
-            else:
-                # Try discovery
-                url = f"{GITHUB_API_BASE}/repos/{self.repo}/git/ref/heads/main"
-                response = await client.get(url, headers=self.headers)
-                if response.status_code == 404:
-                    url = f"{GITHUB_API_BASE}/repos/{self.repo}/git/ref/heads/master"
-                    response = await client.get(url, headers=self.headers)
+        client, timeout = shared_client(), deadline.timeout_for(GITHUB_TIMEOUT_SECONDS)
+        if ref:
+            url = f"{GITHUB_API_BASE}/repos/{self.repo}/git/ref/{ref}"
+            response = await client.get(url, headers=self.headers, timeout=timeout)
+        else:
+            # Try discovery
+            url = f"{GITHUB_API_BASE}/repos/{self.repo}/git/ref/heads/main"
+            response = await client.get(url, headers=self.headers, timeout=timeout)
+            if response.status_code == 404:
+                url = f"{GITHUB_API_BASE}/repos/{self.repo}/git/ref/heads/master"
+                response = await client.get(url, headers=self.headers, timeout=timeout)
         
         if response.status_code != 200:
             raise RuntimeError(f"GitHub API error {response.status_code}: {response.text}")
@@ -89,9 +115,9 @@ class GitHubService:
             "sha": base_sha
         }
         
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(url, json=payload, headers=self.headers)
-            
+        client, timeout = shared_client(), deadline.timeout_for(GITHUB_TIMEOUT_SECONDS)
+        response = await client.post(url, json=payload, headers=self.headers, timeout=timeout)
+        
         if response.status_code != 201:
             raise RuntimeError(f"Failed to create branch: {response.status_code} - {response.text}")
         return response.json()
@@ -99,8 +125,8 @@ class GitHubService:
     async def get_default_branch(self) -> str:
         """Fetch the default branch name from the repo metadata."""
         url = f"{GITHUB_API_BASE}/repos/{self.repo}"
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(url, headers=self.headers)
+        client, timeout = shared_client(), deadline.timeout_for(GITHUB_TIMEOUT_SECONDS)
+        response = await client.get(url, headers=self.headers, timeout=timeout)
         if response.status_code == 200:
             return response.json().get("default_branch", "main")
         return "main"
@@ -116,14 +142,14 @@ class GitHubService:
             "branch": branch
         }
         
-        async with httpx.AsyncClient(timeout=30) as client:
-            # Check if file exists to get its SHA (required for updates)
-            get_resp = await client.get(url, params={"ref": branch}, headers=self.headers)
-            if get_resp.status_code == 200:
-                payload["sha"] = get_resp.json()["sha"]
-                
-            response = await client.put(url, json=payload, headers=self.headers)
+        client, timeout = shared_client(), deadline.timeout_for(GITHUB_TIMEOUT_SECONDS)
+        # Check if file exists to get its SHA (required for updates)
+        get_resp = await client.get(url, params={"ref": branch}, headers=self.headers, timeout=timeout)
+        if get_resp.status_code == 200:
+            payload["sha"] = get_resp.json()["sha"]
             
+        response = await client.put(url, json=payload, headers=self.headers, timeout=timeout)
+        
         if response.status_code not in (200, 201):
             raise RuntimeError(f"Failed to commit file: {response.status_code} - {response.text}")
         return response.json()
@@ -140,9 +166,9 @@ class GitHubService:
             "head": head,
             "base": base
         }
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(url, json=payload, headers=self.headers)
-            
+        client, timeout = shared_client(), deadline.timeout_for(GITHUB_TIMEOUT_SECONDS)
+        response = await client.post(url, json=payload, headers=self.headers, timeout=timeout)
+        
         if response.status_code != 201:
             raise RuntimeError(f"Failed to create PR: {response.status_code} - {response.text}")
         return response.json()
@@ -150,8 +176,8 @@ class GitHubService:
     async def get_pull_request(self, pr_number: int) -> dict:
         """Fetch Pull Request details."""
         url = f"{GITHUB_API_BASE}/repos/{self.repo}/pulls/{pr_number}"
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(url, headers=self.headers)
+        client, timeout = shared_client(), deadline.timeout_for(GITHUB_TIMEOUT_SECONDS)
+        response = await client.get(url, headers=self.headers, timeout=timeout)
         if response.status_code != 200:
             raise RuntimeError(f"Failed to fetch PR #{pr_number}: {response.status_code} - {response.text}")
         return response.json()
@@ -160,8 +186,8 @@ class GitHubService:
         """Fetch raw file content from the repository."""
         import base64
         url = f"{GITHUB_API_BASE}/repos/{self.repo}/contents/{file_path}"
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(url, params={"ref": ref}, headers=self.headers)
+        client, timeout = shared_client(), deadline.timeout_for(GITHUB_TIMEOUT_SECONDS)
+        response = await client.get(url, params={"ref": ref}, headers=self.headers, timeout=timeout)
         
         if response.status_code != 200:
             raise RuntimeError(f"Failed to fetch file {file_path}: {response.text}")
@@ -173,9 +199,9 @@ class GitHubService:
     async def get_pull_request_files(self, pr_number: int) -> list:
         """Fetch the list of files modified in a Pull Request, including their patch/diff."""
         url = f"{GITHUB_API_BASE}/repos/{self.repo}/pulls/{pr_number}/files"
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(url, headers=self.headers)
-            
+        client, timeout = shared_client(), deadline.timeout_for(GITHUB_TIMEOUT_SECONDS)
+        response = await client.get(url, headers=self.headers, timeout=timeout)
+        
         if response.status_code != 200:
             raise RuntimeError(f"Failed to fetch PR files: {response.status_code} - {response.text}")
         return response.json()
@@ -186,9 +212,9 @@ class GitHubService:
         url = f"{GITHUB_API_BASE}/repos/{self.repo}/issues/{pr_number}/comments"
         payload = {"body": body}
         
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(url, json=payload, headers=self.headers)
-            
+        client, timeout = shared_client(), deadline.timeout_for(GITHUB_TIMEOUT_SECONDS)
+        response = await client.post(url, json=payload, headers=self.headers, timeout=timeout)
+        
         if response.status_code != 201:
             raise RuntimeError(f"Failed to post PR comment: {response.status_code} - {response.text}")
         return response.json()
@@ -198,10 +224,10 @@ class GitHubService:
         issue_comments_url = f"{GITHUB_API_BASE}/repos/{self.repo}/issues/{pr_number}/comments"
         review_comments_url = f"{GITHUB_API_BASE}/repos/{self.repo}/pulls/{pr_number}/comments"
         
-        async with httpx.AsyncClient(timeout=30) as client:
-            issue_resp = await client.get(issue_comments_url, headers=self.headers)
-            review_resp = await client.get(review_comments_url, headers=self.headers)
-            
+        client, timeout = shared_client(), deadline.timeout_for(GITHUB_TIMEOUT_SECONDS)
+        issue_resp = await client.get(issue_comments_url, headers=self.headers, timeout=timeout)
+        review_resp = await client.get(review_comments_url, headers=self.headers, timeout=timeout)
+        
         all_comments = []
         if issue_resp.status_code == 200:
             all_comments.extend(issue_resp.json())
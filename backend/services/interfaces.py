@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
 from pydantic import BaseModel
+from backend.core import tracing
 
 class LLMResponse(BaseModel):
     content: str
@@ -10,6 +11,12 @@ class LLMResponse(BaseModel):
     total_tokens: int = 0
 
 class LLMProvider(ABC):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Every provider's generate() is traced as an LLM call
+        if "generate" in vars(cls):
+            cls.generate = tracing.traced(f"{cls.__name__}.generate", category="llm")(cls.generate)
+
     @abstractmethod
     async def generate(self, prompt: str, system_prompt: str = None, require_json: bool = False) -> LLMResponse:
         """Generate a response from the LLM."""
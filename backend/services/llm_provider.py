@@ -1,14 +1,16 @@
+import asyncio
 import json
-from google import genai
 from google.genai import types
 from backend.services.interfaces import LLMProvider, LLMResponse
+from backend.services.gemini_service import get_genai_client
 from backend.config import get_settings
+from backend.core import deadline
 
 settings = get_settings()
 
 class GeminiProvider(LLMProvider):
     def __init__(self):
-        self.client = genai.Client(api_key=settings.GEMINI_API_KEY)
+        self.client = get_genai_client()
         self.model = settings.GEMINI_MODEL
 
     async def generate(self, prompt: str, system_prompt: str = None, require_json: bool = False) -> LLMResponse:
@@ -18,11 +20,13 @@ class GeminiProvider(LLMProvider):
         if system_prompt:
             config.system_instruction = system_prompt
 
-        response = await self.client.aio.models.generate_content(
-            model=self.model,
-            contents=prompt,
-            config=config
-        )
+        # Bounded by the caller's remaining time budget (no budget → no timeout)
+        async with asyncio.timeout(deadline.remaining()):
+            response = await self.client.aio.models.generate_content(
+                model=self.model,
+                contents=prompt,
+                config=config
+            )
         
         # In a real app, track usage metadata returned by Gemini here
         result = LLMResponse(
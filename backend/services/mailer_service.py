@@ -8,10 +8,13 @@ from email.mime.text import MIMEText
 
 from backend.config import get_settings
 from backend.core.logging import get_logger
+from backend.core import deadline, tracing
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+SMTP_TIMEOUT_SECONDS = 30
+
 
 class MailerService:
     def __init__(self):
@@ -21,6 +24,7 @@ class MailerService:
         self.password = settings.SMTP_PASSWORD
         self.target_email = settings.TARGET_EMAIL
 
+    @tracing.traced("MailerService.send", category="smtp")
     async def send(self, subject: str, body: str, is_html: bool = True) -> None:
         """
         Send an email to the configured TARGET_EMAIL.
@@ -37,7 +41,8 @@ class MailerService:
 
         logger.info(f"[MailerService] Sending email to={self.target_email} subject={subject!r}")
         try:
-            with smtplib.SMTP(self.host, self.port) as server:
+            # smtplib blocks, so the remaining budget is applied as the socket timeout
+            with smtplib.SMTP(self.host, self.port, timeout=deadline.timeout_for(SMTP_TIMEOUT_SECONDS)) as server:
                 server.starttls()
                 server.login(self.user, self.password)
                 server.sendmail(self.user, self.target_email, msg.as_string())
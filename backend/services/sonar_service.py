@@ -1,11 +1,14 @@
 import httpx
 from typing import Dict, Any
 from backend.core.logging import get_logger
+from backend.core import deadline, tracing
 
 logger = get_logger(__name__)
 
 SONAR_API_BASE = "https://sonarcloud.io/api"
+SONAR_TIMEOUT_SECONDS = 30
 
+@tracing.trace_methods(category="sonar")
 class SonarService:
     def __init__(self, project_key: str, token: str):
         self.project_key = project_key
@@ -20,7 +23,7 @@ class SonarService:
             "metricKeys": "bugs,vulnerabilities,code_smells"
         }
         
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with httpx.AsyncClient(timeout=deadline.timeout_for(SONAR_TIMEOUT_SECONDS)) as client:
             try:
                 response = await client.get(url, params=params, auth=self.auth)
                 if response.status_code != 200:
@@ -62,7 +65,7 @@ class SonarService:
         if severity:
             params["severities"] = severity
 
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with httpx.AsyncClient(timeout=deadline.timeout_for(SONAR_TIMEOUT_SECONDS)) as client:
             try:
                 response = await client.get(url, params=params, auth=self.auth)
                 if response.status_code != 200:
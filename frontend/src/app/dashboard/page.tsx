@@ -4,8 +4,8 @@ import {
     RefreshCw, Activity, CheckCircle2, XCircle, Clock,
     Loader2, ChevronDown, ChevronRight, Server, Cpu, Zap, AlertTriangle
 } from 'lucide-react';
-import { AgentRun, Task } from '@/types';
-import { listAgentRuns, listTasks } from '@/lib/api';
+import { AgentRun, AgentRunSummary, AgentStats, DashboardStats } from '@/types';
+import { getAgentRun, getStats, listAgentRunsPage, listTasks, listTasksPage } from '@/lib/api';
 import { AgentStatusBadge } from '@/components/ui/Badges';
 import ToastContainer, { toast } from '@/components/ui/Toast';
 
@@ -33,7 +33,7 @@ const AGENT_COLORS: Record<string, string> = {
 // ─── Stage status helper ───────────────────────────────────────────────────
 type StageStatus = 'idle' | 'running' | 'failed' | 'done' | 'partial' | 'planned';
 
-function getStageStatus(agentKey: string, runs: AgentRun[], live: boolean): StageStatus {
+function getStageStatus(agentKey: string, runs: AgentRunSummary[], live: boolean): StageStatus {
     if (!live) return 'planned';
     const stageRuns = runs.filter(r => r.agent_name === agentKey);
     if (!stageRuns.length) return 'idle';
@@ -44,7 +44,7 @@ function getStageStatus(agentKey: string, runs: AgentRun[], live: boolean): Stag
 }
 
 // ─── Pipeline Stepper ─────────────────────────────────────────────────────
-function PipelineStepper({ runs }: { runs: AgentRun[] }) {
+function PipelineStepper({ runs }: { runs: AgentRunSummary[] }) {
     const stages = PIPELINE_STAGES.map(s => ({
         ...s,
         stageRuns: runs.filter(r => r.agent_name === s.key),
@@ -164,8 +164,15 @@ function PipelineStepper({ runs }: { runs: AgentRun[] }) {
 }
 
 // ─── Agent Run Row ─────────────────────────────────────────────────────────
-function RunItem({ run, taskTitle }: { run: AgentRun; taskTitle?: string }) {
+function RunItem({ run, taskTitle }: { run: AgentRunSummary; taskTitle?: string }) {
     const [expanded, setExpanded] = useState(false);
+    // The poll only carries summaries; fetch the output when the row is opened
+    const [detail, setDetail] = useState<AgentRun | null>(null);
+
+    useEffect(() => {
+        if (!expanded) return;
+        getAgentRun(run.id).then(setDetail).catch(() => setDetail(null));
+    }, [expanded, run.id, run.status]);
     const color = AGENT_COLORS[run.agent_name] ?? '#94a3b8';
 
     function duration(start: string | null, end: string | null): string {
@@ -211,7 +218,7 @@ function RunItem({ run, taskTitle }: { run: AgentRun; taskTitle?: string }) {
                 {/* Task title */}
                 <div style={{ flex: 1, minWidth: 0 }}>
                     <div style={{ fontSize: '0.83rem', color: 'var(--text-primary)', fontWeight: 500, overflow: 'hidden', textOverflow: 'ellipsis', whiteSpace: 'nowrap' }}>
-                        {taskTitle ?? `Task ${run.task_id.slice(0, 8)}`}
+                        {taskTitle ?? (run.task_id ? `Task ${run.task_id.slice(0, 8)}` : 'Transcript extraction')}
                     </div>
                     <div style={{ fontSize: '0.72rem', color: 'var(--text-muted)', fontFamily: 'JetBrains Mono, monospace', marginTop: 2 }}>
                         {formatTime(run.started_at)} · {duration(run.started_at, run.completed_at)}
@@ -246,15 +253,15 @@ function RunItem({ run, taskTitle }: { run: AgentRun; taskTitle?: string }) {
                                 <div style={{ fontSize: '0.78rem', color: 'var(--red)', fontFamily: 'JetBrains Mono, monospace' }}>{run.error_message}</div>
                             </div>
                         )}
-                        {run.output && (
+                        {detail?.output && (
                             <div className="console-panel" style={{ gridColumn: run.error_message ? '1/-1' : undefined }}>
                                 <div style={{ color: 'var(--text-muted)', fontSize: '0.65rem', fontWeight: 700, textTransform: 'uppercase', letterSpacing: '0.08em', marginBottom: 8 }}>Output</div>
                                 <pre style={{ whiteSpace: 'pre-wrap', fontSize: '0.75rem' }}>
-                                    {JSON.stringify(run.output, null, 2)}
+                                    {JSON.stringify(detail.output, null, 2)}
                                 </pre>
                             </div>
                         )}
-                        {!run.output && !run.error_message && (
+                        {detail && !detail.output && !run.error_message && (
                             <div style={{ gridColumn: '1/-1', fontSize: '0.78rem', color: 'var(--text-muted)', fontStyle: 'italic' }}>
                                 No output captured for this run.
                             </div>
@@ -267,7 +274,7 @@ function RunItem({ run, taskTitle }: { run: AgentRun; taskTitle?: string }) {
 }
 
 // ─── System Status Sidebar ─────────────────────────────────────────────────
-function SystemSidebar({ runs }: { runs: AgentRun[] }) {
+function SystemSidebar({ runs, agents }: { runs: AgentRunSummary[]; agents: Record<string, AgentStats> }) {
     const phases = [
         {
             num: 1, label: 'Discussion → Ticket → Email',
@@ -386,9 +393,9 @@ function SystemSidebar({ runs }: { runs: AgentRun[] }) {
                 </div>
                 <div style={{ padding: '8px 0' }}>
                     {PIPELINE_STAGES.filter(s => s.live).map(stage => {
-                        const agentRuns = runs.filter(r => r.agent_name === stage.key);
-                        const completed = agentRuns.filter(r => r.status === 'COMPLETED').length;
-                        const failed = agentRuns.filter(r => r.status === 'FAILED').length;
+                        const agentRuns = agents[stage.key]?.runs_by_status ?? {};
+                        const completed = agentRuns.COMPLETED ?? 0;
+                        const failed = agentRuns.FAILED ?? 0;
                         const color = AGENT_COLORS[stage.key] ?? '#94a3b8';
                         return (
                             <div key={stage.key} style={{ display: 'flex', alignItems: 'center', justifyContent: 'space-between', padding: '7px 16px' }}>
@@ -413,19 +420,34 @@ function SystemSidebar({ runs }: { runs: AgentRun[] }) {
 
 // ─── Main Dashboard ────────────────────────────────────────────────────────
 export default function DashboardPage() {
-    const [runs, setRuns] = useState<AgentRun[]>([]);
-    const [tasks, setTasks] = useState<Task[]>([]);
+    // Newest page of runs (refreshed by polling) plus older pages loaded on demand
+    const [runs, setRuns] = useState<AgentRunSummary[]>([]);
+    const [olderRuns, setOlderRuns] = useState<AgentRunSummary[]>([]);
+    const [runsCursor, setRunsCursor] = useState<string | null>(null);
+    const [loadingOlder, setLoadingOlder] = useState(false);
+    const [taskTitles, setTaskTitles] = useState<Record<string, string>>({});
+    const [counts, setCounts] = useState<DashboardStats | null>(null);
     const [loading, setLoading] = useState(true);
     const [lastUpdated, setLastUpdated] = useState<Date | null>(null);
     const [polling, setPolling] = useState(true);
     const intervalRef = useRef<ReturnType<typeof setInterval> | null>(null);
+    const titlesLoaded = useRef(false);
+    const olderLoaded = useRef(false);
 
     async function fetchData(silent = false) {
         if (!silent) setLoading(true);
         try {
-            const [runsData, tasksData] = await Promise.all([listAgentRuns(), listTasks()]);
-            setRuns(runsData);
-            setTasks(tasksData);
+            const [runsPage, tasksData, statsData] = await Promise.all([
+                listAgentRunsPage(),
+                // Every task title once; after that the newest page picks up new tasks
+                titlesLoaded.current ? listTasksPage().then(page => page.items) : listTasks(),
+                getStats(),
+            ]);
+            titlesLoaded.current = true;
+            setRuns(runsPage.items);
+            if (!olderLoaded.current) setRunsCursor(runsPage.next_cursor);
+            setTaskTitles(prev => ({ ...prev, ...Object.fromEntries(tasksData.map(t => [t.id, t.title])) }));
+            setCounts(statsData);
             setLastUpdated(new Date());
         } catch (err: unknown) {
             if (!silent) toast('error', err instanceof Error ? err.message : 'Failed to load data');
@@ -434,6 +456,21 @@ export default function DashboardPage() {
         }
     }
 
+    async function loadOlderRuns() {
+        if (!runsCursor) return;
+        setLoadingOlder(true);
+        try {
+            const page = await listAgentRunsPage(undefined, runsCursor);
+            olderLoaded.current = true;
+            setOlderRuns(prev => [...prev, ...page.items]);
+            setRunsCursor(page.next_cursor);
+        } catch (err: unknown) {
+            toast('error', err instanceof Error ? err.message : 'Failed to load older runs');
+        } finally {
+            setLoadingOlder(false);
+        }
+    }
+
     useEffect(() => {
         fetchData();
         if (polling) {
@@ -442,14 +479,18 @@ export default function DashboardPage() {
         return () => { if (intervalRef.current) clearInterval(intervalRef.current); };
     }, [polling]);
 
-    const taskMap = Object.fromEntries(tasks.map(t => [t.id, t.title]));
+    // Runs that moved from the newest page into an older one are listed once
+    const newestIds = new Set(runs.map(r => r.id));
+    const listedRuns = [...runs, ...olderRuns.filter(r => !newestIds.has(r.id))];
 
+    // Counters come from GET /api/stats (whole window), not from the page of runs listed below
+    const byStatus = counts?.runs_by_status ?? {};
     const stats = {
-        total: runs.length,
-        running: runs.filter(r => r.status === 'RUNNING').length,
-        completed: runs.filter(r => r.status === 'COMPLETED').length,
-        failed: runs.filter(r => r.status === 'FAILED').length,
-        pending: runs.filter(r => r.status === 'PENDING').length,
+        total: Object.values(byStatus).reduce((sum, n) => sum + (n ?? 0), 0),
+        running: byStatus.RUNNING ?? 0,
+        completed: byStatus.COMPLETED ?? 0,
+        failed: byStatus.FAILED ?? 0,
+        pending: byStatus.PENDING ?? 0,
     };
 
     return (
@@ -559,7 +600,7 @@ export default function DashboardPage() {
                         }}>
                             <div style={{ fontWeight: 700, fontSize: '0.83rem' }}>Agent Run History</div>
                             <div style={{ fontSize: '0.72rem', color: 'var(--text-muted)', fontFamily: 'JetBrains Mono, monospace' }}>
-                                {runs.length} records · click to expand
+                                {listedRuns.length} records · click to expand
                             </div>
                         </div>
 
@@ -569,7 +610,7 @@ export default function DashboardPage() {
                                     <div key={i} className="skeleton" style={{ height: 56, borderRadius: 'var(--radius-md)' }} />
                                 ))}
                             </div>
-                        ) : runs.length === 0 ? (
+                        ) : listedRuns.length === 0 ? (
                             <div className="empty-state">
                                 <div className="empty-icon">🤖</div>
                                 <div className="empty-title">No agent runs yet</div>
@@ -577,15 +618,22 @@ export default function DashboardPage() {
                             </div>
                         ) : (
                             <div>
-                                {runs.map(run => (
-                                    <RunItem key={run.id} run={run} taskTitle={taskMap[run.task_id]} />
+                                {listedRuns.map(run => (
+                                    <RunItem key={run.id} run={run} taskTitle={run.task_id ? taskTitles[run.task_id] : undefined} />
                                 ))}
+                                {runsCursor && (
+                                    <div style={{ padding: '12px 20px', display: 'flex', justifyContent: 'center' }}>
+                                        <button className="btn btn-secondary btn-sm" onClick={loadOlderRuns} disabled={loadingOlder}>
+                                            {loadingOlder ? 'Loading…' : 'Load older runs'}
+                                        </button>
+                                    </div>
+                                )}
                             </div>
                         )}
                     </div>
 
                     {/* Sidebar */}
-                    <SystemSidebar runs={runs} />
+                    <SystemSidebar runs={runs} agents={counts?.agents ?? {}} />
                 </div>
             </div>
         </div>
@@ -17,7 +17,7 @@ import {
     MessageSquareCode,
     RefreshCw
 } from 'lucide-react';
-import { Project, Task } from '@/types';
+import { Project, TaskSummary } from '@/types';
 import {
     getProject,
     listTasks,
@@ -54,7 +54,7 @@ export default function ProjectDashboardPage() {
     const projectId = params.id as string;
 
     const [project, setProject] = useState<Project | null>(null);
-    const [tasks, setTasks] = useState<Task[]>([]);
+    const [tasks, setTasks] = useState<TaskSummary[]>([]);
     const [sonarIssues, setSonarIssues] = useState<any[]>([]);
     const [loading, setLoading] = useState(true);
     const [fixingIssue, setFixingIssue] = useState<string | null>(null);
@@ -3,7 +3,7 @@ import { useEffect, useState } from 'react';
 import { useParams, useRouter } from 'next/navigation';
 import Link from 'next/link';
 import { ArrowLeft, CheckCircle2, Clock, Play, Github, Mail, AlertCircle, CheckSquare, Terminal, Tag, Search, ThumbsUp, Cpu, Folder, GitMerge, Trash2 } from 'lucide-react';
-import { Task, AgentRun, Project } from '@/types';
+import { Task, AgentRunSummary, Project } from '@/types';
 import { getTask, listAgentRuns, executeTask, generateCodeTask, reviewPRTask, updateTask, getProject, deleteTask } from '@/lib/api';
 import { StatusBadge, PriorityBadge } from '@/components/ui/Badges';
 import ToastContainer, { toast } from '@/components/ui/Toast';
@@ -14,7 +14,7 @@ export default function TaskDetailPage() {
     const taskId = params.id as string;
 
     const [task, setTask] = useState<Task | null>(null);
-    const [runs, setRuns] = useState<AgentRun[]>([]);
+    const [runs, setRuns] = useState<AgentRunSummary[]>([]);
     const [loading, setLoading] = useState(true);
     const [actionLoading, setActionLoading] = useState<string | null>(null);
     const [activeTab, setActiveTab] = useState<'details' | 'logs'>('details');
@@ -1,7 +1,7 @@
 'use client';
 import { useEffect, useState } from 'react';
 import { RefreshCw, Plus, Brain, FileText, Sparkles, GitBranch, Zap, Search, CheckCircle2 } from 'lucide-react';
-import { Task, Project } from '@/types';
+import { TaskSummary, Project } from '@/types';
 import { listTasks, listProjects, syncTasks } from '@/lib/api';
 import TaskCard from '@/components/tasks/TaskCard';
 import ToastContainer, { toast } from '@/components/ui/Toast';
@@ -10,7 +10,7 @@ import Link from 'next/link';
 
 
 export default function TasksPage() {
-    const [tasks, setTasks] = useState<Task[]>([]);
+    const [tasks, setTasks] = useState<TaskSummary[]>([]);
     const [projects, setProjects] = useState<Project[]>([]);
     const [loading, setLoading] = useState(true);
     const [refreshing, setRefreshing] = useState(false);
@@ -49,7 +49,7 @@ export default function TasksPage() {
 
     useEffect(() => { loadTasks(); }, []);
 
-    function updateTask(updated: Task) {
+    function updateTask(updated: TaskSummary) {
         setTasks(prev => prev.map(t => t.id === updated.id ? updated : t));
     }
 
@@ -22,6 +22,8 @@ const statusIcon: Record<string, React.ReactNode> = {
     RUNNING: <Loader2 size={14} color="var(--purple)" style={{ animation: 'spin 1s linear infinite' }} />,
     COMPLETED: <CheckCircle2 size={14} color="var(--green)" />,
     FAILED: <XCircle size={14} color="var(--red)" />,
+    CANCELLED: <XCircle size={14} color="var(--text-muted)" />,
+    TIMED_OUT: <XCircle size={14} color="var(--orange)" />,
 };
 
 function duration(start: string | null, end: string | null): string {
@@ -76,7 +78,7 @@ export default function AgentRunRow({ run, taskTitle }: { run: AgentRun; taskTit
             <tr className="dashboard-row" onClick={() => setExpanded(e => !e)} style={{ cursor: 'pointer' }}>
                 <td>
                     <div style={{ fontSize: '0.8rem', color: 'var(--text-secondary)', maxWidth: 220, overflow: 'hidden', textOverflow: 'ellipsis', whiteSpace: 'nowrap' }}>
-                        {taskTitle ?? run.task_id.slice(0, 8) + '…'}
+                        {taskTitle ?? (run.task_id ? run.task_id.slice(0, 8) + '…' : 'Transcript extraction')}
                     </div>
                 </td>
                 <td>
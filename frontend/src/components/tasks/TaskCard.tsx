@@ -1,7 +1,7 @@
 'use client';
 import { useState } from 'react';
 import { Calendar, Zap, Folder } from 'lucide-react';
-import { Task } from '@/types';
+import { Task, TaskSummary } from '@/types';
 import { approveTask, executeTask } from '@/lib/api';
 import { StatusBadge, PriorityBadge } from '@/components/ui/Badges';
 import { toast } from '@/components/ui/Toast';
@@ -11,14 +11,15 @@ import Link from 'next/link';
 
 
 interface TaskCardProps {
-    task: Task;
-    onChange: (t: Task) => void;
+    task: TaskSummary;
+    onChange: (t: TaskSummary) => void;
     projectName?: string;
     onDelete?: (id: string) => void;
 }
 
 export default function TaskCard({ task, onChange, projectName, onDelete }: TaskCardProps) {
-    const [editing, setEditing] = useState(false);
+    // Full record for the edit modal (lists only carry summaries)
+    const [editing, setEditing] = useState<Task | null>(null);
     const [showingInfo, setShowingInfo] = useState(false);
     const [loading, setLoading] = useState<string | null>(null);
 
@@ -105,9 +106,9 @@ export default function TaskCard({ task, onChange, projectName, onDelete }: Task
 
             {editing && (
                 <EditTaskModal
-                    task={task}
-                    onClose={() => setEditing(false)}
-                    onSaved={updated => { onChange(updated); setEditing(false); }}
+                    task={editing}
+                    onClose={() => setEditing(null)}
+                    onSaved={updated => { onChange(updated); setEditing(null); }}
                 />
             )}
 
@@ -7,6 +7,8 @@ const statusMap: Record<string, string> = {
     IN_PROGRESS: 'badge-in-progress',
     COMPLETED: 'badge-approved', // Show as blueish/purple since it's just in review, not entirely done
     FAILED: 'badge-failed',
+    CANCELLED: 'badge-failed',
+    TIMED_OUT: 'badge-failed',
     DONE: 'badge-completed', // The actual fully done state
 };
 const priorityMap: Record<string, string> = {
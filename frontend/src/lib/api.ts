@@ -1,4 +1,4 @@
-import { ExtractResponse, Task, AgentRun, AgentRunStep, Project } from '@/types';
+import { ExtractResponse, Task, TaskSummary, AgentRun, AgentRunSummary, AgentRunStep, Project, Page, DashboardStats } from '@/types';
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
@@ -17,9 +17,38 @@ export async function fetchApi<T>(endpoint: string, options?: RequestInit): Prom
     return res.json();
 }
 
+// List endpoints are keyset-paginated (newest first); pass next_cursor back to get older rows
+function pageQuery(params: Record<string, string | number | undefined>): string {
+    const searchParams = new URLSearchParams();
+    for (const [key, value] of Object.entries(params)) {
+        if (value !== undefined) searchParams.append(key, String(value));
+    }
+    const qs = searchParams.toString();
+    return qs ? `?${qs}` : '';
+}
+
+// Page size (the API's maximum) used when a view needs every row
+const ALL_PAGES_LIMIT = 200;
+
+// Follows next_cursor to the last page; for views that need the full set (pickers, task boards)
+async function fetchAllPages<T>(fetchPage: (cursor?: string) => Promise<Page<T>>): Promise<T[]> {
+    const items: T[] = [];
+    let cursor: string | undefined;
+    do {
+        const page = await fetchPage(cursor);
+        items.push(...page.items);
+        cursor = page.next_cursor ?? undefined;
+    } while (cursor);
+    return items;
+}
+
 // -- Projects --
+export function listProjectsPage(cursor?: string, limit?: number) {
+    return fetchApi<Page<Project>>(`/projects${pageQuery({ cursor, limit })}`);
+}
+
 export function listProjects() {
-    return fetchApi<Project[]>('/projects');
+    return fetchAllPages(cursor => listProjectsPage(cursor, ALL_PAGES_LIMIT));
 }
 
 export function getProject(id: string) {
@@ -79,10 +108,11 @@ export const extractTasks = (transcript: string, project_id?: string, github_rep
     });
 
 // -- Tasks --
-export const listTasks = (projectId?: string): Promise<Task[]> => {
-    const qs = projectId ? `?project_id=${projectId}` : '';
-    return fetchApi(`/api/tasks${qs}`);
-};
+export const listTasksPage = (projectId?: string, cursor?: string, limit?: number): Promise<Page<TaskSummary>> =>
+    fetchApi(`/api/tasks${pageQuery({ project_id: projectId, cursor, limit })}`);
+
+export const listTasks = (projectId?: string): Promise<TaskSummary[]> =>
+    fetchAllPages(cursor => listTasksPage(projectId, cursor, ALL_PAGES_LIMIT));
 
 export const syncTasks = (): Promise<{ status: string; updated_tasks: number }> =>
     fetchApi('/api/tasks/sync', { method: 'POST' });
@@ -110,8 +140,8 @@ export const deleteTask = (id: string): Promise<void> =>
     fetchApi(`/api/tasks/${id}`, { method: 'DELETE' });
 
 // -- Execution --
-export const executeTask = (id: string): Promise<Task> =>
-    fetchApi(`/api/execution/${id}/execute`, { method: 'POST' });
+export const executeTask = (id: string, speculative = false): Promise<Task> =>
+    fetchApi(`/api/execution/${id}/execute${speculative ? '?speculative=true' : ''}`, { method: 'POST' });
 
 export const generateCodeTask = (id: string, baseBranch?: string, targetBranch?: string): Promise<Task> => {
     const searchParams = new URLSearchParams();
@@ -125,10 +155,18 @@ export const reviewPRTask = (id: string): Promise<Task> =>
     fetchApi(`/api/execution/${id}/review`, { method: 'POST' });
 
 // -- Agent Runs --
-export const listAgentRuns = (taskId?: string): Promise<AgentRun[]> => {
-    const qs = taskId ? `?task_id=${taskId}` : '';
-    return fetchApi(`/api/agent-runs${qs}`);
-};
+export const listAgentRunsPage = (taskId?: string, cursor?: string, limit?: number): Promise<Page<AgentRunSummary>> =>
+    fetchApi(`/api/agent-runs${pageQuery({ task_id: taskId, cursor, limit })}`);
+
+export const listAgentRuns = (taskId?: string): Promise<AgentRunSummary[]> =>
+    fetchAllPages(cursor => listAgentRunsPage(taskId, cursor, ALL_PAGES_LIMIT));
+
+export const getAgentRun = (runId: string): Promise<AgentRun> =>
+    fetchApi(`/api/agent-runs/${runId}`);
 
 export const getAgentRunSteps = (runId: string): Promise<AgentRunStep[]> =>
     fetchApi(`/api/agent-runs/${runId}/steps`);
+
+// -- Stats --
+export const getStats = (projectId?: string, days?: number): Promise<DashboardStats> =>
+    fetchApi(`/api/stats${pageQuery({ project_id: projectId, days })}`);
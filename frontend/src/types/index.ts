@@ -9,7 +9,7 @@ export type TaskStatus =
 
 export type Priority = 'LOW' | 'MEDIUM' | 'HIGH' | 'CRITICAL';
 
-export type AgentRunStatus = 'PENDING' | 'RUNNING' | 'COMPLETED' | 'FAILED';
+export type AgentRunStatus = 'PENDING' | 'RUNNING' | 'COMPLETED' | 'FAILED' | 'CANCELLED' | 'TIMED_OUT';
 
 export interface Task {
     id: string;
@@ -48,6 +48,12 @@ export interface Task {
     updated_at: string;
 }
 
+// Shape returned by GET /api/tasks; the full Task comes from GET /api/tasks/{id}
+export type TaskSummary = Pick<Task,
+    'id' | 'project_id' | 'title' | 'description' | 'deadline' | 'priority' | 'status' | 'approved' |
+    'github_repo' | 'github_issue_id' | 'github_issue_url' | 'github_pr_id' | 'github_pr_url' |
+    'error_message' | 'created_at' | 'updated_at'>;
+
 export interface Project {
     id: string;
     name: string;
@@ -64,16 +70,23 @@ export interface Project {
 
 export interface AgentRun {
     id: string;
-    task_id: string;
+    task_id: string | null;  // null for extraction runs
+    extraction_run_id?: string | null;
     agent_name: string;
     status: AgentRunStatus;
     input_context: Record<string, unknown> | null;
     output: Record<string, unknown> | null;
     error_message: string | null;
+    time_budget_seconds?: number | null;
+    trace_id?: string | null;
+    latency_breakdown?: Record<string, number> | null;
     started_at: string | null;
     completed_at: string | null;
 }
 
+// Shape returned by GET /api/agent-runs; payloads come from GET /api/agent-runs/{id}
+export type AgentRunSummary = Omit<AgentRun, 'input_context' | 'output'>;
+
 export interface AgentRunStep {
     id: string;
     agent_run_id: string;
@@ -84,11 +97,36 @@ export interface AgentRunStep {
     tool_output: string | null;
     prompt_tokens: number;
     completion_tokens: number;
+    cache_hits?: number;
     status: string;
     created_at: string;
 }
 
+// GET /api/stats — task counts as of now, run counts / tokens for runs started since `since`
+export interface AgentStats {
+    runs_by_status: Partial<Record<AgentRunStatus, number>>;
+    prompt_tokens: number;
+    completion_tokens: number;
+}
+
+export interface DashboardStats {
+    since: string;
+    tasks_by_status: Partial<Record<TaskStatus, number>>;
+    runs_by_status: Partial<Record<AgentRunStatus, number>>;
+    agents: Record<string, AgentStats>;
+    failures_by_project: { project_id: string | null; failed_runs: number }[];
+    prompt_tokens: number;
+    completion_tokens: number;
+    daily: { day: string; runs: number; failed_runs: number; prompt_tokens: number; completion_tokens: number }[];
+}
+
+export interface Page<T> {
+    items: T[];
+    next_cursor: string | null;
+}
+
 export interface ExtractResponse {
     tasks: Task[];
     count: number;
+    extraction_run_id?: string;
 }
@@ -0,0 +1,81 @@
+"""
+Test setup. Required settings get dummy values so backend modules import without a .env.
+
+Postgres-backed tests run only when TEST_DATABASE_URL names a disposable database
+(e.g. postgresql+asyncpg://postgres@localhost/ai_orchestrator_test): its public schema
+is dropped and rebuilt with the Alembic migrations. Without it they are skipped.
+"""
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+
+for _name, _value in {
+    "DATABASE_URL": "postgresql+asyncpg://localhost/unused",
+    "GEMINI_API_KEY": "test",
+    "GITHUB_TOKEN": "test",
+    "GITHUB_REPO": "org/repo",
+    "SMTP_USER": "test",
+    "SMTP_PASSWORD": "test",
+    "TARGET_EMAIL": "test@example.com",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "backend" / "alembic.ini"
+
+
+@pytest.fixture(scope="session")
+def loop():
+    # One loop for the whole session: the engine's pooled connections are bound to it
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def run(loop):
+    """Runs a coroutine to completion on the session loop."""
+    return loop.run_until_complete
+
+
+@pytest.fixture(scope="session")
+def pg_schema(loop):
+    """A test database migrated to head. Skips the test when TEST_DATABASE_URL isn't set."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set")
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import text
+
+    from backend.db.database import engine
+
+    async def reset() -> None:
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP SCHEMA public CASCADE"))
+            await conn.execute(text("CREATE SCHEMA public"))
+
+    loop.run_until_complete(reset())
+    command.upgrade(Config(str(ALEMBIC_INI)), "head")
+    yield engine
+    loop.run_until_complete(engine.dispose())
+
+
+@pytest.fixture
+def pg(pg_schema, run):
+    """The migrated test database with every table emptied."""
+    from sqlalchemy import text
+
+    async def truncate() -> None:
+        async with pg_schema.begin() as conn:
+            tables = (await conn.execute(text(
+                "SELECT tablename FROM pg_tables WHERE schemaname = 'public' AND tablename <> 'alembic_version'"
+            ))).scalars().all()
+            await conn.execute(text(f"TRUNCATE {', '.join(tables)} CASCADE"))
+
+    run(truncate())
+    return pg_schema
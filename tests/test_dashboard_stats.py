@@ -0,0 +1,162 @@
+"""
+The dashboard counters against a fresh GROUP BY of the rows they count, through task
+creation, status and project changes, run transitions and deletes that cascade.
+"""
+import uuid
+from datetime import datetime
+from unittest import mock
+
+from sqlalchemy import select, text
+
+from backend.core import dashboard_stats
+from backend.db.database import AsyncSessionLocal
+from backend.db.models import AgentRun, AgentRunStep, Project, Task
+
+NO_PROJECT = dashboard_stats.NO_PROJECT
+
+TASK_COUNTS = text(f"""
+    SELECT COALESCE(project_id, '{NO_PROJECT}'), status, count(*) FROM tasks GROUP BY 1, 2
+""")
+# The backfill query of migration 0006
+RUN_STATS = text(f"""
+    SELECT r.started_at::date, COALESCE(t.project_id, e.project_id, '{NO_PROJECT}'), r.agent_name, r.status,
+           count(*),
+           COALESCE(sum(s.prompt_tokens) FILTER (WHERE r.status NOT IN ('PENDING', 'RUNNING')), 0),
+           COALESCE(sum(s.completion_tokens) FILTER (WHERE r.status NOT IN ('PENDING', 'RUNNING')), 0)
+    FROM agent_runs r
+    LEFT JOIN tasks t ON t.id = r.task_id
+    LEFT JOIN extraction_runs e ON e.id = r.extraction_run_id
+    LEFT JOIN (
+        SELECT agent_run_id, sum(prompt_tokens) AS prompt_tokens, sum(completion_tokens) AS completion_tokens
+        FROM agent_run_steps GROUP BY agent_run_id
+    ) s ON s.agent_run_id = r.id
+    GROUP BY 1, 2, 3, 4
+""")
+
+
+async def _assert_counters_match(engine) -> None:
+    async with engine.connect() as conn:
+        expected_tasks = {(p, s): n for p, s, n in await conn.execute(TASK_COUNTS)}
+        tasks = {
+            (p, s): n for p, s, n in await conn.execute(
+                text("SELECT project_id, status, count FROM task_status_counts WHERE count <> 0")
+            )
+        }
+        expected_runs = {tuple(row[:4]): tuple(row[4:]) for row in await conn.execute(RUN_STATS)}
+        runs = {
+            tuple(row[:4]): tuple(row[4:]) for row in await conn.execute(text(
+                "SELECT day, project_id, agent_name, status, runs, prompt_tokens, completion_tokens "
+                "FROM agent_run_daily_stats WHERE runs <> 0 OR prompt_tokens <> 0 OR completion_tokens <> 0"
+            ))
+        }
+    assert tasks == expected_tasks
+    assert runs == expected_runs
+
+
+async def _start_run(task: Task, agent_name: str) -> AgentRun:
+    """As the orchestrator does."""
+    async with AsyncSessionLocal() as db:
+        run = AgentRun(task_id=task.id, agent_name=agent_name, status="RUNNING", started_at=datetime.utcnow())
+        db.add(run)
+        dashboard_stats.run_transition(db, task.project_id, agent_name, run.started_at.date(), None, run.status)
+        await db.commit()
+        return run
+
+
+async def _finish_run(task: Task, run: AgentRun, status: str, tokens: list) -> None:
+    async with AsyncSessionLocal() as db:
+        db.add_all(
+            AgentRunStep(
+                agent_run_id=run.id, step_number=i + 1, status="COMPLETED",
+                prompt_tokens=prompt, completion_tokens=completion, cache_hits=0,
+            )
+            for i, (prompt, completion) in enumerate(tokens)
+        )
+        await db.flush()
+        used = await dashboard_stats.run_tokens(db, [run.id], run.started_at.date())
+        run.status = status
+        db.add(run)
+        dashboard_stats.run_transition(
+            db, task.project_id, run.agent_name, run.started_at.date(), "RUNNING", status, *used[run.id],
+        )
+        await db.commit()
+
+
+def test_counters_follow_task_and_run_changes(pg, run):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            project = Project(name="dashboard")
+            db.add(project)
+            await db.flush()
+            tasks = [
+                Task(title="a", project_id=project.id),
+                Task(title="b"),
+                Task(title="c", project_id=project.id, status="APPROVED"),
+            ]
+            db.add_all(tasks)
+            await db.commit()
+        await _assert_counters_match(pg)
+
+        runs = [await _start_run(tasks[0], "CodeAgent"), await _start_run(tasks[0], "TicketAgent")]
+        await _start_run(tasks[2], "CodeAgent")
+        await _finish_run(tasks[0], runs[0], "COMPLETED", [(100, 10), (50, 5)])
+        await _finish_run(tasks[0], runs[1], "FAILED", [(7, 1)])
+        await _assert_counters_match(pg)
+
+        async with AsyncSessionLocal() as db:
+            a, b = (await db.get(Task, tasks[0].id)), (await db.get(Task, tasks[1].id))
+            a.status = "IN_PROGRESS"
+            b.project_id = project.id
+            b.status = "APPROVED"
+            await db.flush()
+            a.status = "COMPLETED"  # a second change in the same transaction
+            await db.commit()
+        await _assert_counters_match(pg)
+
+        # Rolled back changes are not counted
+        async with AsyncSessionLocal() as db:
+            (await db.get(Task, tasks[1].id)).status = "FAILED"
+            await db.flush()
+            await db.rollback()
+        await _assert_counters_match(pg)
+
+        # Deleting a task removes its runs and steps with it
+        async with AsyncSessionLocal() as db:
+            await db.delete(await db.get(Task, tasks[0].id))
+            await db.commit()
+        await _assert_counters_match(pg)
+        async with pg.connect() as conn:
+            assert (await conn.execute(text("SELECT count(*) FROM agent_runs"))).scalar() == 1
+
+        # Deleting the project removes its remaining tasks and their runs
+        async with AsyncSessionLocal() as db:
+            await db.delete(await db.get(Project, project.id))
+            await db.commit()
+        await _assert_counters_match(pg)
+        async with pg.connect() as conn:
+            assert (await conn.execute(text("SELECT count(*) FROM tasks"))).scalar() == 0
+
+    run(scenario())
+
+
+def test_commit_without_task_or_run_changes_skips_flush(pg, run):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            db.add(Project(name="unrelated"))
+            db.add(Task(title="t"))
+            await db.commit()
+
+        async with AsyncSessionLocal() as db:
+            await db.execute(select(Task))
+            project = (await db.execute(select(Project))).scalar_one()
+            with mock.patch.object(db.sync_session, "flush", wraps=db.sync_session.flush) as flush:
+                await db.commit()
+            assert not flush.called
+
+            project.name = "renamed"
+            with mock.patch.object(db.sync_session, "flush", wraps=db.sync_session.flush) as flush:
+                await db.commit()
+            assert flush.call_count == 1  # the commit's own
+        await _assert_counters_match(pg)
+
+    run(scenario())
@@ -0,0 +1,172 @@
+"""
+single_flight against a SQLite idempotency table: in-process coalescing, the
+different-params 409, takeover of a stale IN_FLIGHT row and release when the work fails.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.core import idempotency
+from backend.db.models import IdempotencyRecord
+
+
+@pytest.fixture
+def sessions(monkeypatch, run, tmp_path):
+    # A file rather than :memory: so that concurrent sessions get their own connections
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'idempotency.db'}")
+
+    async def create() -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(IdempotencyRecord.__table__.create)
+
+    run(create())
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(idempotency, "AsyncSessionLocal", factory)
+    monkeypatch.setattr(idempotency, "POLL_INTERVAL_SECONDS", 0.01)
+    yield factory
+    assert not idempotency._inflight
+    run(engine.dispose())
+
+
+async def _rows(factory):
+    async with factory() as db:
+        return {r.key: r.status for r in (await db.execute(select(IdempotencyRecord))).scalars()}
+
+
+class Work:
+    """Counts calls; each call blocks until released."""
+
+    def __init__(self, result=None, error=None):
+        self.calls = 0
+        self.result = result
+        self.error = error
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        self.started.set()
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return self.result
+
+
+@pytest.fixture
+def coalesced(monkeypatch):
+    """Event set once a duplicate request has joined an in-flight one."""
+    joined = asyncio.Event()
+    info = idempotency.logger.info
+
+    def record(message, *args, **kwargs):
+        if message.startswith("[Idempotency] Coalescing"):
+            joined.set()
+        info(message, *args, **kwargs)
+
+    monkeypatch.setattr(idempotency.logger, "info", record)
+    return joined
+
+
+async def _settle(*tasks, timeout=5):
+    await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout)
+
+
+def test_concurrent_duplicates_coalesce(sessions, coalesced, run):
+    async def scenario():
+        work = Work(result={"ok": 1})
+        first = asyncio.ensure_future(idempotency.single_flight("pipeline:a", work, "key-1", {"b": 1}))
+        second = asyncio.ensure_future(idempotency.single_flight("pipeline:a", work, "key-1", {"b": 1}))
+        try:
+            await asyncio.wait_for(work.started.wait(), 5)
+            await asyncio.wait_for(coalesced.wait(), 5)
+            assert await _rows(sessions) == {"pipeline:a": "IN_FLIGHT"}
+        finally:
+            work.release.set()
+            await _settle(first, second)
+        return work, [first.result(), second.result()]
+
+    work, results = run(scenario())
+    assert work.calls == 1
+    assert results == [{"ok": 1}, {"ok": 1}]
+
+    # The lock is gone and a retry with the same key replays the stored response
+    key = idempotency._response_key("pipeline:a", idempotency.digest({"b": 1}), "key-1")
+    assert run(_rows(sessions)) == {key: "COMPLETED"}
+    again = Work(result={"ok": 2})
+    again.release.set()
+    assert run(idempotency.single_flight("pipeline:a", again, "key-1", {"b": 1})) == {"ok": 1}
+    assert again.calls == 0
+
+
+def test_duplicate_with_other_params_is_rejected(sessions, run):
+    async def scenario():
+        work = Work(result="done")
+        first = asyncio.ensure_future(idempotency.single_flight("code:a", work, params={"branch": "x"}))
+        try:
+            await asyncio.wait_for(work.started.wait(), 5)
+            with pytest.raises(HTTPException) as rejected:
+                await idempotency.single_flight("code:a", work, params={"branch": "y"})
+        finally:
+            work.release.set()
+            await _settle(first)
+        return work, rejected.value, first.result()
+
+    work, rejected, result = run(scenario())
+    assert rejected.status_code == 409
+    assert "other parameters" in rejected.detail
+    assert work.calls == 1
+    assert result == "done"
+
+
+async def _lock(factory, scope, age):
+    async with factory() as db:
+        db.add(IdempotencyRecord(key=scope, status="IN_FLIGHT", created_at=datetime.utcnow() - age))
+        await db.commit()
+
+
+def test_live_lock_from_other_worker_blocks(sessions, run):
+    run(_lock(sessions, "pipeline:b", timedelta(seconds=5)))
+    work = Work()
+    work.release.set()
+    with pytest.raises(HTTPException) as rejected:
+        run(idempotency.single_flight("pipeline:b", work))
+    assert rejected.value.status_code == 409
+    assert work.calls == 0
+    assert run(_rows(sessions)) == {"pipeline:b": "IN_FLIGHT"}
+
+
+def test_stale_lock_is_taken_over(sessions, run):
+    timeout = idempotency.settings.IDEMPOTENCY_INFLIGHT_TIMEOUT_SECONDS
+    run(_lock(sessions, "pipeline:c", timedelta(seconds=timeout + 1)))
+    work = Work(result="ran")
+    work.release.set()
+    assert run(idempotency.single_flight("pipeline:c", work)) == "ran"
+    assert work.calls == 1
+    assert run(_rows(sessions)) == {}
+
+
+def test_lock_released_when_work_fails(sessions, coalesced, run):
+    async def scenario():
+        work = Work(error=RuntimeError("boom"))
+        first = asyncio.ensure_future(idempotency.single_flight("pipeline:d", work, "key-2"))
+        second = asyncio.ensure_future(idempotency.single_flight("pipeline:d", work, "key-2"))
+        try:
+            await asyncio.wait_for(coalesced.wait(), 5)
+        finally:
+            work.release.set()
+            await _settle(first, second)
+        return [first.exception(), second.exception()]
+
+    results = run(scenario())
+    assert [str(r) for r in results] == ["boom", "boom"]
+    assert run(_rows(sessions)) == {}
+
+    # Nothing was cached for the key, so a retry runs the work again
+    retry = Work(result="second try")
+    retry.release.set()
+    assert run(idempotency.single_flight("pipeline:d", retry, "key-2")) == "second try"
+    assert retry.calls == 1
@@ -0,0 +1,126 @@
+"""
+Keyset pagination: cursor round-trips, a (timestamp, id) tie on a page boundary, and the
+list endpoints' handling of bad cursors and out-of-range limits.
+"""
+import base64
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, DateTime, Uuid, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import StaticPool
+
+from backend.config import get_settings
+from backend.core.pagination import decode_cursor, encode_cursor, paginate
+from backend.db.database import get_db, get_read_db
+from backend.main import app
+
+settings = get_settings()
+LIST_ENDPOINTS = ["/projects", "/api/tasks", "/api/agent-runs"]
+
+Base = declarative_base()
+
+
+class Row(Base):
+    __tablename__ = "rows"
+
+    id = Column(Uuid, primary_key=True)
+    created_at = Column(DateTime, nullable=False)
+
+
+def _raw_cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("timestamp", [
+    datetime(2026, 10, 19, 8, 30),
+    datetime(2026, 10, 19, 8, 30, 15, 123456),
+    datetime(1999, 12, 31, 23, 59, 59, 999999),
+])
+def test_cursor_round_trip(timestamp):
+    row_id = uuid.uuid4()
+    cursor = encode_cursor(timestamp, row_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (timestamp, row_id)
+
+
+def test_tie_on_page_boundary(run):
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    base = datetime(2026, 10, 1)
+    # Three rows share each timestamp, so pages of two split every group
+    rows = [Row(id=uuid.uuid4(), created_at=base + timedelta(seconds=i // 3)) for i in range(9)]
+
+    async def pages():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as db:
+            db.add_all(rows)
+            await db.commit()
+            seen, cursor = [], None
+            while True:
+                page, cursor = await paginate(db, select(Row), Row.created_at, Row.id, cursor, 2)
+                assert len(page) <= 2
+                seen += [r.id for r in page]
+                if cursor is None:
+                    return seen
+
+    try:
+        seen = run(pages())
+    finally:
+        run(engine.dispose())
+    expected = [r.id for r in sorted(rows, key=lambda r: (r.created_at, r.id), reverse=True)]
+    assert seen == expected
+
+
+class NoDatabase:
+    async def execute(self, *args, **kwargs):
+        raise AssertionError("request should be rejected before querying")
+
+
+@pytest.fixture
+def client():
+    async def no_db():
+        yield NoDatabase()
+
+    app.dependency_overrides[get_db] = no_db
+    app.dependency_overrides[get_read_db] = no_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("path", LIST_ENDPOINTS)
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor!",
+    "a",
+    _raw_cursor(5),
+    _raw_cursor({"a": 1, "b": 2}),
+    _raw_cursor(["2026-10-19T08:30:00", 5]),
+    _raw_cursor(["2026-10-19T08:30:00+02:00", str(uuid.UUID(int=1))]),
+    _raw_cursor(["yesterday", str(uuid.UUID(int=1))]),
+    base64.urlsafe_b64encode(b"\xff\xfe\xfd").decode(),
+])
+def test_malformed_cursor_is_400(client, path, cursor):
+    response = client.get(path, params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.parametrize("path", LIST_ENDPOINTS)
+@pytest.mark.parametrize("limit", [0, settings.PAGE_SIZE_MAX + 1, 10_000])
+def test_limit_outside_range_is_422(client, path, limit):
+    response = client.get(path, params={"limit": limit})
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("path", LIST_ENDPOINTS)
+def test_limit_is_capped_at_page_size_max(path):
+    parameters = app.openapi()["paths"][path]["get"]["parameters"]
+    limit = next(p for p in parameters if p["name"] == "limit")["schema"]
+    assert limit["maximum"] == settings.PAGE_SIZE_MAX
+    assert limit["minimum"] == 1
+    assert limit["default"] == settings.PAGE_SIZE_DEFAULT
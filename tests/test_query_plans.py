@@ -0,0 +1,161 @@
+"""
+Query plans of the hot list endpoints on a seeded database: each must be served by the
+index added for it in 0002 (and rebuilt by 0003 / 0004). The statements are the ones the
+endpoints actually execute, captured at the cursor and re-run under EXPLAIN.
+"""
+import hashlib
+import json
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, List, Set, Tuple
+
+import pytest
+from sqlalchemy import event, text
+
+from backend.api.agent_runs import list_agent_run_steps, list_agent_runs
+from backend.api.approval import list_tasks, sync_tasks
+from backend.db.database import AsyncSessionLocal
+
+TASKS = 3000
+RUNS = 15000
+STEPS_PER_RUN = 2
+
+
+def seeded_id(kind: str, n: int) -> uuid.UUID:
+    """Matches md5('<kind><n>')::uuid in the seed SQL."""
+    return uuid.UUID(hashlib.md5(f"{kind}{n}".encode()).hexdigest())
+
+
+SEED = [
+    f"""
+    INSERT INTO tasks (id, title, status, priority, approved, github_pr_id, created_at, updated_at)
+    SELECT md5('t' || i)::uuid, 'task ' || i,
+           (ARRAY['PENDING', 'APPROVED', 'IN_PROGRESS', 'COMPLETED', 'DONE', 'FAILED'])[i % 6 + 1],
+           'MEDIUM', false, CASE WHEN i % 100 = 0 THEN (i / 100)::text END,
+           now() - i * interval '1 minute', now()
+    FROM generate_series(0, {TASKS - 1}) AS i
+    """,
+    # Spread over the current month only, so every row lands in a monthly partition
+    f"""
+    INSERT INTO agent_runs (id, task_id, agent_name, status, started_at)
+    SELECT md5('r' || i)::uuid, md5('t' || (i % {TASKS}))::uuid,
+           (ARRAY['TicketAgent', 'EmailAgent', 'CodeAgent'])[i % 3 + 1], 'COMPLETED',
+           date_trunc('month', now()) + (i % 25) * interval '1 day' + i * interval '1 second'
+    FROM generate_series(0, {RUNS - 1}) AS i
+    """,
+    f"""
+    INSERT INTO agent_run_steps (
+        id, agent_run_id, step_number, status, prompt_tokens, completion_tokens, cache_hits, created_at
+    )
+    SELECT md5('s' || i)::uuid, md5('r' || (i / {STEPS_PER_RUN}))::uuid, i % {STEPS_PER_RUN} + 1,
+           'COMPLETED', 0, 0, 0, date_trunc('month', now()) + (i % 25) * interval '1 day'
+    FROM generate_series(0, {RUNS * STEPS_PER_RUN - 1}) AS i
+    """,
+    "ANALYZE tasks",
+    "ANALYZE agent_runs",
+    "ANALYZE agent_run_steps",
+]
+
+
+@pytest.fixture(scope="module")
+def seeded(pg_schema, loop):
+    async def seed() -> None:
+        async with pg_schema.begin() as conn:
+            await conn.execute(text("TRUNCATE tasks, agent_runs, agent_run_steps CASCADE"))
+        # ANALYZE can't see uncommitted rows, so the inserts commit first
+        async with pg_schema.connect() as conn:
+            for statement in SEED:
+                await conn.execute(text(statement))
+                await conn.commit()
+
+    loop.run_until_complete(seed())
+    return pg_schema
+
+
+@contextmanager
+def captured_selects(engine) -> Iterator[List[Tuple[str, tuple]]]:
+    statements: List[Tuple[str, tuple]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+
+def _index_names(plan) -> Set[str]:
+    names = set()
+    if isinstance(plan, dict):
+        if "Index Name" in plan:
+            names.add(plan["Index Name"])
+        for value in plan.values():
+            names |= _index_names(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            names |= _index_names(value)
+    return names
+
+
+async def _indexes_used(engine, statements: List[Tuple[str, tuple]]) -> Set[str]:
+    """Indexes in the plans of statements; a partition's index is reported as its parent's."""
+    used = set()
+    async with engine.connect() as conn:
+        for statement, parameters in statements:
+            result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            plan = result.scalar()
+            for name in _index_names(json.loads(plan) if isinstance(plan, str) else plan):
+                parent = (await conn.execute(
+                    text(
+                        "SELECT p.relname FROM pg_inherits i JOIN pg_class p ON p.oid = i.inhparent "
+                        "WHERE i.inhrelid = to_regclass(:name)"
+                    ),
+                    {"name": name},
+                )).scalar()
+                used.add(parent or name)
+    return used
+
+
+async def _plan_indexes(engine, call) -> Set[str]:
+    with captured_selects(engine) as statements:
+        async with AsyncSessionLocal() as db:
+            await call(db)
+    assert statements, "the endpoint ran no SELECT"
+    return await _indexes_used(engine, statements)
+
+
+def _list_runs(**filters):
+    params = dict(
+        task_id=None, agent_name=None, status=None, output=[], input_context=[],
+        tool=None, cursor=None, limit=50,
+    )
+    params.update(filters)
+    return lambda db: list_agent_runs(db=db, **params)
+
+
+def test_list_agent_runs_uses_started_at_index(seeded, run):
+    assert "ix_agent_runs_started_at" in run(_plan_indexes(seeded, _list_runs()))
+
+
+def test_list_agent_runs_for_task_uses_task_index(seeded, run):
+    used = run(_plan_indexes(seeded, _list_runs(task_id=seeded_id("t", 7))))
+    assert "ix_agent_runs_task_id_started_at" in used
+
+
+def test_list_tasks_uses_created_at_index(seeded, run):
+    used = run(_plan_indexes(seeded, lambda db: list_tasks(project_id=None, cursor=None, limit=50, db=db)))
+    assert "ix_tasks_created_at" in used
+
+
+def test_list_agent_run_steps_uses_run_step_index(seeded, run):
+    run_id = seeded_id("r", 11)
+    used = run(_plan_indexes(seeded, lambda db: list_agent_run_steps(run_id, tool=None, tool_input=[], db=db)))
+    assert "ix_agent_run_steps_agent_run_id_step_number" in used
+
+
+def test_sync_tasks_uses_pr_or_status_index(seeded, run):
+    used = run(_plan_indexes(seeded, lambda db: sync_tasks(db=db)))
+    assert used & {"ix_tasks_github_pr_id", "ix_tasks_status"}